@@ -83,6 +83,32 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # File based caches delete a random share of their entries once they
+    # hold MAX_ENTRIES (300 by default), so the limits leave room for a
+    # week of refreshes: every Grand title x date page, the Taj and Prime
+    # pages, and their page and showing group fingerprints.
+    "http": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / ".cache" / "http",
+        "TIMEOUT": 60 * 60 * 24 * 7,
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    },
+    # A payload per showings version and day, and the showings version.
+    "api": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / ".cache" / "api",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -128,12 +154,100 @@ GRAND_BASE_URL = "https://jo.grandcinemasme.com"
 TAJ_BASE_URL = "https://tajcinemas.com"
 PRIME_BASE_URL = "https://www.prime.jo"
 
+# Scraping
+# Fetch the cinema sources in parallel; a refresh then takes as long as the
+# slowest source rather than the sum of all of them.
+SCRAPE_SOURCES_CONCURRENTLY = True
+SCRAPE_MAX_SOURCE_WORKERS = 3
+# Run job refreshes on an asyncio event loop (httpx) instead of threads.
+SCRAPE_ASYNC = False
+# Upper bound on in-flight requests to a single cinema host, for both the
+# threaded and the asyncio refresh.
+GRAND_MAX_CONCURRENT_REQUESTS = 8
+TAJ_MAX_CONCURRENT_REQUESTS = 4
+PRIME_MAX_CONCURRENT_REQUESTS = 4
+
+# HTML parsing backend: "lxml" (compiled XPath) or "bs4" (BeautifulSoup).
+# Both produce identical output.
+PARSER_BACKEND = "lxml"
+# Build only the subtree a parser reads (e.g. the movies list of a titles
+# page) instead of the whole page.
+PARSER_PARTIAL_PARSING = True
+
+# Title matching
+# Resolve source titles already linked to a movie by their source id, and only
+# fuzzy match the new ones, instead of re-matching every title on each refresh.
+TITLE_MATCH_INCREMENTAL = True
+# Match titles through pandas DataFrames (pandas is then required) instead of
+# plain dicts. Both produce identical output; importing pandas is slow.
+TITLE_MATCH_PANDAS = False
+# How fuzzy matching titles are merged: "union_find" clusters the match graph,
+# best matches first; "greedy" merges each title with its matches in turn.
+TITLE_MATCH_CLUSTERING = "union_find"
+
+# Outgoing HTTP
+# Each client keeps a pooled keep-alive session; the pool must be at least as
+# large as the per-host concurrency so fanned-out requests reuse connections.
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = max(
+    GRAND_MAX_CONCURRENT_REQUESTS,
+    TAJ_MAX_CONCURRENT_REQUESTS,
+    PRIME_MAX_CONCURRENT_REQUESTS,
+)
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF_FACTOR = 0.5
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds
+# Cinema pages are cached with their ETag/Last-Modified validators and
+# re-requested conditionally.
+HTTP_CACHE_ALIAS = "http"
+# Fingerprints of fetched pages and saved showings, used to skip parsing and
+# database writes when nothing changed since the last refresh.
+FINGERPRINT_CACHE_ALIAS = HTTP_CACHE_ALIAS
+
+# API responses
+# Payloads built from the saved showings are cached until showings are next
+# saved. The cache is shared with the refresh worker, which invalidates it.
+API_CACHE_ALIAS = "api"
+ACTIVE_SHOWINGS_CACHE_TIMEOUT = 60 * 60 * 24
+# Showing listings are paginated by (date, time, id) keyset cursors.
+SHOWINGS_PAGE_SIZE = 100
+SHOWINGS_MAX_PAGE_SIZE = 500
+# Full showing exports are streamed, fetching and sending this many rows at a
+# time.
+SHOWINGS_STREAM_CHUNK_SIZE = 1000
+
+# Refresh jobs
+# Seconds the refresh worker waits between polls of an empty job queue.
+REFRESH_WORKER_POLL_INTERVAL = 5
+# Only one refresh runs at a time: it holds a database lease, renewed as it
+# makes progress. A refresh whose worker died releases it after this long.
+REFRESH_LEASE_SECONDS = 10 * 60
+
+# Refresh scheduler
+# Each source is refreshed on its own cadence, given as (days ahead, interval
+# in seconds) horizons: the first covers the dates from today until its days
+# ahead, each next one carries on from there, and None covers all later
+# dates. Near-term showtimes change the most, so they are refreshed most often.
+REFRESH_SCHEDULE = {
+    "grand": [(2, 30 * 60), (None, 4 * 60 * 60)],
+    "taj": [(2, 60 * 60), (None, 6 * 60 * 60)],
+    "prime": [(2, 60 * 60), (None, 6 * 60 * 60)],
+}
+# Each interval varies randomly by up to this fraction of it, so the refreshes
+# of different sources drift apart instead of hitting the cinemas together.
+REFRESH_JITTER = 0.1
+
 # Test configuration
 TEST_RUNNER = "showings.tests.test_runner.ShowingsTestRunner"
 
 # API Documentation
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # JSON is rendered with orjson when it is installed.
+    "DEFAULT_RENDERER_CLASSES": [
+        "showings.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 SPECTACULAR_SETTINGS = {
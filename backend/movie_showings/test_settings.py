@@ -15,6 +15,21 @@ DATABASES = {
     }
 }
 
+# Keep caches in memory during tests
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "http": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "http",
+    },
+    "api": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api",
+    },
+}
+
 # Disable debugging in tests
 DEBUG = False
 
@@ -1,13 +1,16 @@
+import inspect
 import logging
 from functools import wraps
 from typing import Any, Callable, Dict
 
-import requests
+import httpx
 from movie_showings.settings import GRAND_BASE_URL, PRIME_BASE_URL, TAJ_BASE_URL
 from requests.exceptions import HTTPError, RequestException
 from rest_framework.exceptions import ValidationError
 
 from .errors import ClientError, HTTPClientError, NetworkError, SerializerError
+from .http_cache import PageContent
+from .http_sessions import AsyncClientSession, ClientSession
 from .serializers import (
     GrandClientShowingDatesSerializer,
     GrandClientShowingTimesSerializer,
@@ -18,50 +21,64 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 
+def _to_client_error(e: Exception, client_name: str) -> ClientError:
+    """Map an exception raised inside a client call to a ClientError."""
+    if isinstance(e, ValidationError):
+        return SerializerError(
+            message=f"Validation error: {e.detail}",
+            source=client_name,
+            cause=e,
+        )
+    if isinstance(e, (HTTPError, httpx.HTTPStatusError)):
+        return HTTPClientError(
+            message=str(e),
+            status_code=e.response.status_code,
+            source=client_name,
+            cause=e,
+        )
+    if isinstance(e, (RequestException, httpx.RequestError)):
+        return NetworkError(
+            message=str(e),
+            source=client_name,
+            cause=e,
+        )
+    return ClientError(
+        message=str(e),
+        source=client_name,
+        cause=e,
+    )
+
+
 def handle_client_errors(client_name: str) -> Callable:
     """
     Decorator to handle common client errors.
 
+    Works for both regular and ``async`` client methods.
+
     Args:
         client_name: Name of the client for logging purposes (e.g., "GrandClient")
     """
 
     def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    error = _to_client_error(e, client_name)
+                    error.log(logger)
+                    raise error
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
                 return func(*args, **kwargs)
-            except ValidationError as e:
-                error = SerializerError(
-                    message=f"Validation error: {e.detail}",
-                    source=client_name,
-                    cause=e,
-                )
-                error.log(logger)
-                raise error
-            except HTTPError as e:
-                error = HTTPClientError(
-                    message=str(e),
-                    status_code=e.response.status_code,
-                    source=client_name,
-                    cause=e,
-                )
-                error.log(logger)
-                raise error
-            except RequestException as e:
-                error = NetworkError(
-                    message=str(e),
-                    source=client_name,
-                    cause=e,
-                )
-                error.log(logger)
-                raise error
             except Exception as e:
-                error = ClientError(
-                    message=str(e),
-                    source=client_name,
-                    cause=e,
-                )
+                error = _to_client_error(e, client_name)
                 error.log(logger)
                 raise error
 
@@ -71,18 +88,18 @@ def handle_client_errors(client_name: str) -> Callable:
 
 
 class GrandClient:
+    session = ClientSession("GrandClient")
+
     @staticmethod
     @handle_client_errors("GrandClient")
-    def get_titles_page() -> bytes:
+    def get_titles_page() -> PageContent:
         url = f"{GRAND_BASE_URL}/handlers/getmovies.ashx"
         body = {"cinemaId": "0000000002"}
-        response = requests.post(url, data=body)
-        response.raise_for_status()
-        return response.content
+        return GrandClient.session.post_page(url, data=body)
 
     @staticmethod
     @handle_client_errors("GrandClient")
-    def get_title_showing_dates(grand_title_id: str) -> bytes:
+    def get_title_showing_dates(grand_title_id: str) -> PageContent:
         serializer = GrandClientShowingDatesSerializer(
             data={"grand_id": grand_title_id}
         )
@@ -93,13 +110,11 @@ class GrandClient:
             "cinemaId": "0000000002",
             "movieId": grand_title_id,
         }
-        response = requests.post(url, data=body)
-        response.raise_for_status()
-        return response.content
+        return GrandClient.session.post_page(url, data=body)
 
     @staticmethod
     @handle_client_errors("GrandClient")
-    def get_title_showing_times_on_date(grand_title_id: str, date: str) -> bytes:
+    def get_title_showing_times_on_date(grand_title_id: str, date: str) -> PageContent:
         serializer = GrandClientShowingTimesSerializer(
             data={"grand_id": grand_title_id, "date": date}
         )
@@ -107,50 +122,124 @@ class GrandClient:
 
         url = f"{GRAND_BASE_URL}/handlers/getsessionTime.ashx"
         body = {"cinemaId": "0000000002", "movieId": grand_title_id, "date": date}
-        response = requests.post(url, data=body)
-        response.raise_for_status()
-        return response.content
+        return GrandClient.session.post_page(url, data=body)
 
 
 class TajClient:
+    session = ClientSession("TajClient")
+
     @staticmethod
     @handle_client_errors("TajClient")
-    def get_titles_page() -> bytes:
+    def get_titles_page() -> PageContent:
         url = TAJ_BASE_URL
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content
+        return TajClient.session.get_page(url)
 
     @staticmethod
     @handle_client_errors("TajClient")
-    def get_title_showings_page(title: Dict[str, str]) -> bytes:
+    def get_title_showings_page(title: Dict[str, str]) -> PageContent:
         serializer = TajClientTitleShowingsSerializer(data=title)
         serializer.is_valid(raise_exception=True)
 
         title_id = serializer.validated_data["taj_id"]
         url = f"{TAJ_BASE_URL}/movies/{title_id}"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content
+        return TajClient.session.get_page(url)
 
 
 class PrimeClient:
+    session = ClientSession("PrimeClient")
+
+    @staticmethod
+    @handle_client_errors("PrimeClient")
+    def get_titles_page() -> PageContent:
+        url = f"{PRIME_BASE_URL}/Browsing/Movies/NowShowing"
+        return PrimeClient.session.get_page(url)
+
+    @staticmethod
+    @handle_client_errors("PrimeClient")
+    def get_title_showings_page(title: Dict[str, str]) -> PageContent:
+        serializer = PrimeClientTitleShowingsSerializer(data=title)
+        serializer.is_valid(raise_exception=True)
+
+        title_id = serializer.validated_data["prime_id"]
+        url = f"{PRIME_BASE_URL}/Browsing/Movies/Details/{title_id}"
+        return PrimeClient.session.get_page(url)
+
+
+class AsyncGrandClient:
+    session = AsyncClientSession("AsyncGrandClient")
+
+    @staticmethod
+    @handle_client_errors("GrandClient")
+    async def get_titles_page() -> PageContent:
+        url = f"{GRAND_BASE_URL}/handlers/getmovies.ashx"
+        body = {"cinemaId": "0000000002"}
+        return await AsyncGrandClient.session.post_page(url, data=body)
+
+    @staticmethod
+    @handle_client_errors("GrandClient")
+    async def get_title_showing_dates(grand_title_id: str) -> PageContent:
+        serializer = GrandClientShowingDatesSerializer(
+            data={"grand_id": grand_title_id}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        url = f"{GRAND_BASE_URL}/handlers/getsessionDate.ashx"
+        body = {
+            "cinemaId": "0000000002",
+            "movieId": grand_title_id,
+        }
+        return await AsyncGrandClient.session.post_page(url, data=body)
+
+    @staticmethod
+    @handle_client_errors("GrandClient")
+    async def get_title_showing_times_on_date(
+        grand_title_id: str, date: str
+    ) -> PageContent:
+        serializer = GrandClientShowingTimesSerializer(
+            data={"grand_id": grand_title_id, "date": date}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        url = f"{GRAND_BASE_URL}/handlers/getsessionTime.ashx"
+        body = {"cinemaId": "0000000002", "movieId": grand_title_id, "date": date}
+        return await AsyncGrandClient.session.post_page(url, data=body)
+
+
+class AsyncTajClient:
+    session = AsyncClientSession("AsyncTajClient")
+
+    @staticmethod
+    @handle_client_errors("TajClient")
+    async def get_titles_page() -> PageContent:
+        url = TAJ_BASE_URL
+        return await AsyncTajClient.session.get_page(url)
+
+    @staticmethod
+    @handle_client_errors("TajClient")
+    async def get_title_showings_page(title: Dict[str, str]) -> PageContent:
+        serializer = TajClientTitleShowingsSerializer(data=title)
+        serializer.is_valid(raise_exception=True)
+
+        title_id = serializer.validated_data["taj_id"]
+        url = f"{TAJ_BASE_URL}/movies/{title_id}"
+        return await AsyncTajClient.session.get_page(url)
+
+
+class AsyncPrimeClient:
+    session = AsyncClientSession("AsyncPrimeClient")
+
     @staticmethod
     @handle_client_errors("PrimeClient")
-    def get_titles_page() -> bytes:
+    async def get_titles_page() -> PageContent:
         url = f"{PRIME_BASE_URL}/Browsing/Movies/NowShowing"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content
+        return await AsyncPrimeClient.session.get_page(url)
 
     @staticmethod
     @handle_client_errors("PrimeClient")
-    def get_title_showings_page(title: Dict[str, str]) -> bytes:
+    async def get_title_showings_page(title: Dict[str, str]) -> PageContent:
         serializer = PrimeClientTitleShowingsSerializer(data=title)
         serializer.is_valid(raise_exception=True)
 
         title_id = serializer.validated_data["prime_id"]
         url = f"{PRIME_BASE_URL}/Browsing/Movies/Details/{title_id}"
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content
+        return await AsyncPrimeClient.session.get_page(url)
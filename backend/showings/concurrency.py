@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def run_concurrently(
+    tasks: Sequence[Callable[[], Any]],
+    max_workers: int,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Run zero-argument callables on a bounded thread pool.
+
+    Args:
+        tasks: Callables to run.
+        max_workers: Upper bound on the number of worker threads. A value of
+            1 (or a single task) runs the tasks inline, in order.
+        return_exceptions: If True, exceptions raised by a task are returned
+            in its slot instead of being raised.
+
+    Returns:
+        The task results, in the same order as ``tasks``.
+
+    Raises:
+        Exception: The first exception (in task order) raised by a task, when
+            ``return_exceptions`` is False.
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [_call(task, return_exceptions) for task in tasks]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = [executor.submit(task) for task in tasks]
+
+    results = []
+    for future in futures:
+        error = future.exception()
+        if error is None:
+            results.append(future.result())
+        elif return_exceptions:
+            results.append(error)
+        else:
+            raise error
+    return results
+
+
+def _call(task: Callable[[], Any], return_exceptions: bool) -> Any:
+    try:
+        return task()
+    except Exception as e:
+        if return_exceptions:
+            return e
+        raise
+
+
+async def gather_concurrently(
+    tasks: Sequence[Callable[[], Awaitable[Any]]],
+    max_concurrency: int,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Await coroutine factories with at most ``max_concurrency`` in flight.
+
+    The ``asyncio`` counterpart of ``run_concurrently``; results are returned
+    in the same order as ``tasks``.
+    """
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def limited(task: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await task()
+
+    return await asyncio.gather(
+        *(limited(task) for task in tasks), return_exceptions=return_exceptions
+    )
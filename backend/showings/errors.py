@@ -12,6 +12,7 @@ class ErrorCode:
     NETWORK_ERROR = "network_error"
     ELEMENT_NOT_FOUND = "element_not_found"
     INVALID_FORMAT = "invalid_format"
+    LEASE_LOST = "lease_lost"
 
 
 class Error(Exception):
@@ -182,3 +183,20 @@ class InvalidFormatError(ParserError):
             cause=cause,
         )
         self.code = ErrorCode.INVALID_FORMAT
+
+
+class LeaseLostError(Error):
+    """Raised when a lease held for some work could not be renewed."""
+
+    def __init__(
+        self,
+        message: str,
+        source: str = None,
+        cause: Exception = None,
+    ):
+        super().__init__(
+            message=message,
+            code=ErrorCode.LEASE_LOST,
+            source=source,
+            cause=cause,
+        )
@@ -0,0 +1,58 @@
+import hashlib
+import json
+from typing import Any, Tuple, Union
+
+from django.core.cache import caches
+from movie_showings.settings import FINGERPRINT_CACHE_ALIAS
+
+
+def fingerprint(content: Union[bytes, str, list, dict]) -> str:
+    """Return a stable SHA-256 fingerprint of page content or parsed data."""
+    if isinstance(content, str):
+        content = content.encode()
+    elif not isinstance(content, bytes):
+        content = json.dumps(content, sort_keys=True, default=str).encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+class FingerprintStore:
+    """Remembers the fingerprint of the last content seen under a key.
+
+    A result derived from the content (e.g. the parsed page) can be stored
+    with it, so identical content can skip the work that produced it.
+
+    Args:
+        namespace: Prefix that keeps independent stores apart, e.g. "page".
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    @property
+    def cache(self):
+        return caches[FINGERPRINT_CACHE_ALIAS]
+
+    def _key(self, key: str) -> str:
+        return f"fingerprint:{self.namespace}:{fingerprint(key)}"
+
+    def get(self, key: str, content: Any) -> Tuple[bool, Any]:
+        """Look up content under a key.
+
+        Returns:
+            A ``(hit, result)`` tuple; ``hit`` is True if the content is
+            identical to the last content recorded under the key.
+        """
+        entry = self.cache.get(self._key(key))
+        if entry and entry["fingerprint"] == fingerprint(content):
+            return True, entry["result"]
+        return False, None
+
+    def set(self, key: str, content: Any, result: Any = None) -> None:
+        """Record the fingerprint of content (and a derived result) under a key."""
+        self.cache.set(
+            self._key(key),
+            {"fingerprint": fingerprint(content), "result": result},
+        )
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(self._key(key))
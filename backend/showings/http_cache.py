@@ -0,0 +1,83 @@
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from django.core.cache import caches
+from movie_showings.settings import HTTP_CACHE_ALIAS
+
+logger = logging.getLogger(__name__)
+
+
+class PageContent(bytes):
+    """Response body annotated with its HTTP cache state.
+
+    Attributes:
+        unchanged: The server answered ``304 Not Modified`` and the body was
+            served from the cache.
+    """
+
+    unchanged: bool
+
+    def __new__(cls, content: bytes, unchanged: bool = False):
+        page = super().__new__(cls, content)
+        page.unchanged = unchanged
+        return page
+
+
+def _cache():
+    return caches[HTTP_CACHE_ALIAS]
+
+
+def _cache_key(prefix: str, name: str) -> str:
+    return f"{prefix}:{hashlib.sha256(name.encode()).hexdigest()}"
+
+
+def conditional_headers(url: str) -> Dict[str, str]:
+    """Build ``If-None-Match``/``If-Modified-Since`` headers for a cached URL."""
+    entry = _cache().get(_cache_key("response", url))
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def resolve_response(url: str, response: Any) -> Optional[PageContent]:
+    """Turn a (possibly conditional) response into page content.
+
+    Stores the body and validators of fresh responses, and serves ``304``
+    responses from the cache.
+
+    Args:
+        url: The requested URL.
+        response: A ``requests`` or ``httpx`` response.
+
+    Returns:
+        The page content, or None if the server answered ``304`` but the
+        cached body is gone and the request must be repeated unconditionally.
+
+    Raises:
+        HTTPError: If the response has an error status.
+    """
+    key = _cache_key("response", url)
+    if response.status_code == 304:
+        entry = _cache().get(key)
+        if entry is None:
+            logger.warning(f"Got 304 for {url} without a cached body")
+            return None
+        return PageContent(entry["body"], unchanged=True)
+
+    response.raise_for_status()
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not (etag or last_modified):
+        return PageContent(response.content)
+
+    _cache().set(
+        key,
+        {"etag": etag, "last_modified": last_modified, "body": response.content},
+    )
+    return PageContent(response.content)
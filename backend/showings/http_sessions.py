@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict
+
+import httpx
+import requests
+from movie_showings.settings import (
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_RETRY_BACKOFF_FACTOR,
+    HTTP_TIMEOUT,
+)
+from requests.adapters import HTTPAdapter
+from showings.http_cache import PageContent, conditional_headers, resolve_response
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+_client_sessions = weakref.WeakSet()
+_async_client_sessions = weakref.WeakSet()
+
+# Responses retried as transient failures of the cinema servers.
+RETRY_STATUSES = (502, 503, 504)
+
+
+def build_session() -> requests.Session:
+    """Build a requests session with a keep-alive connection pool and retries."""
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        # The cinema POST endpoints are read-only lookups, so retrying them
+        # is safe.
+        allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+class ClientSession:
+    """A pooled ``requests.Session`` shared by every call of one client.
+
+    The underlying session is created lazily and reused across threads and
+    across refreshes. It is rebuilt after a fork so worker processes never
+    share sockets with their parent, and it can be closed explicitly with
+    ``close()`` or ``close_all_sessions()``.
+    """
+
+    def __init__(self, name: str, timeout: Any = HTTP_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._session = None
+        self._pid = None
+        _client_sessions.add(self)
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                self._session = build_session()
+                self._pid = os.getpid()
+                logger.debug(f"Opened HTTP session for {self.name}")
+            return self._session
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def get_page(self, url: str) -> PageContent:
+        """GET a page, revalidating a cached copy with a conditional request."""
+        headers = conditional_headers(url)
+        response = self.get(url, headers=headers) if headers else self.get(url)
+        page = resolve_response(url, response)
+        if page is None:
+            page = resolve_response(url, self.get(url))
+        return page
+
+    def post_page(self, url: str, data: Dict[str, str]) -> PageContent:
+        """POST a form and return the response body as page content."""
+        response = self.post(url, data=data)
+        response.raise_for_status()
+        return PageContent(response.content)
+
+    def close(self) -> None:
+        """Close pooled connections; the next request opens a fresh session."""
+        with self._lock:
+            if self._session is not None and self._pid == os.getpid():
+                self._session.close()
+            self._session = None
+            self._pid = None
+
+
+class RetryingAsyncTransport(httpx.AsyncHTTPTransport):
+    """An httpx transport that also retries responses of ``RETRY_STATUSES``.
+
+    httpx only retries failed connections; like the ``Retry`` of
+    ``build_session``, this also retries 502, 503 and 504 responses, up to
+    ``status_retries`` times with an exponential backoff.
+    """
+
+    def __init__(
+        self,
+        status_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_RETRY_BACKOFF_FACTOR,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.status_retries = status_retries
+        self.backoff_factor = backoff_factor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.status_retries + 1):
+            response = await super().handle_async_request(request)
+            if (
+                response.status_code not in RETRY_STATUSES
+                or attempt == self.status_retries
+            ):
+                return response
+            await response.aclose()
+            logger.debug(
+                f"Retrying {request.method} {request.url} after {response.status_code}"
+            )
+            await asyncio.sleep(self.backoff_factor * 2**attempt)
+
+
+def build_async_client() -> httpx.AsyncClient:
+    """Build an httpx client with a keep-alive connection pool and retries."""
+    connect_timeout, read_timeout = HTTP_TIMEOUT
+    transport = RetryingAsyncTransport(
+        retries=HTTP_MAX_RETRIES,
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_MAXSIZE,
+            max_keepalive_connections=HTTP_POOL_MAXSIZE,
+        ),
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        headers={"Connection": "keep-alive"},
+    )
+
+
+class AsyncClientSession:
+    """The ``asyncio`` counterpart of ``ClientSession``.
+
+    An ``httpx.AsyncClient`` is bound to the event loop it was first used on,
+    so one client is kept per running loop and dropped with the loop.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._clients = weakref.WeakKeyDictionary()
+        _async_client_sessions.add(self)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = build_async_client()
+            self._clients[loop] = client
+            logger.debug(f"Opened async HTTP client for {self.name}")
+        return client
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.client.get(url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.client.post(url, **kwargs)
+
+    async def get_page(self, url: str) -> PageContent:
+        """Async variant of ``ClientSession.get_page``."""
+        headers = conditional_headers(url)
+        if headers:
+            response = await self.get(url, headers=headers)
+        else:
+            response = await self.get(url)
+        page = resolve_response(url, response)
+        if page is None:
+            page = resolve_response(url, await self.get(url))
+        return page
+
+    async def post_page(self, url: str, data: Dict[str, str]) -> PageContent:
+        """Async variant of ``ClientSession.post_page``."""
+        response = await self.post(url, data=data)
+        response.raise_for_status()
+        return PageContent(response.content)
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the running loop's client."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+async def aclose_all_sessions() -> None:
+    """Close the running loop's pooled connections of every async session."""
+    for client_session in list(_async_client_sessions):
+        await client_session.aclose()
+
+
+def close_all_sessions() -> None:
+    """Close the pooled connections of every client session."""
+    for client_session in list(_client_sessions):
+        client_session.close()
@@ -0,0 +1,209 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+from movie_showings.settings import (
+    REFRESH_LEASE_SECONDS,
+    REFRESH_WORKER_POLL_INTERVAL,
+    SCRAPE_ASYNC,
+)
+from showings.errors import LeaseLostError
+from showings.http_sessions import aclose_all_sessions
+from showings.leases import LeaseHeartbeat, acquire_lease, lease_owner, release_lease
+from showings.models import RefreshJob
+from showings.services import ShowingService
+from showings.title_matching import SOURCES
+
+logger = logging.getLogger(__name__)
+
+# Held by the job of the refresh in flight, from when it is queued until it
+# finishes, so only one refresh runs at a time.
+REFRESH_LEASE = "refresh"
+
+
+def source_refresh_lease(source: str) -> str:
+    """The lease held while a single source is refreshed by the scheduler."""
+    return f"{REFRESH_LEASE}:{source}"
+
+
+def enqueue_refresh() -> RefreshJob:
+    """Queue a refresh of movies and showings for the refresh worker.
+
+    If a refresh is already queued or running, no other one is queued:
+    its job is returned instead, so callers share its result. A lease held
+    for a job that is gone or finished is released and taken over.
+    """
+    while True:
+        job = RefreshJob.objects.create()
+        if acquire_lease(REFRESH_LEASE, str(job.id), REFRESH_LEASE_SECONDS):
+            return job
+        job.delete()
+        owner = lease_owner(REFRESH_LEASE)
+        if not owner:
+            continue
+        in_flight = RefreshJob.objects.filter(
+            id=owner,
+            status__in=[RefreshJob.Status.QUEUED, RefreshJob.Status.RUNNING],
+        ).first()
+        if in_flight:
+            return in_flight
+        release_lease(REFRESH_LEASE, owner)
+
+
+def fail_abandoned_jobs() -> int:
+    """Mark running jobs that no longer hold the refresh lease as failed.
+
+    A worker renews the lease of its job until the job finishes, so a
+    running job without it was abandoned, e.g. by a worker that died.
+
+    Returns:
+        The number of jobs marked as failed.
+    """
+    abandoned = RefreshJob.objects.filter(status=RefreshJob.Status.RUNNING)
+    owner = lease_owner(REFRESH_LEASE)
+    if owner:
+        abandoned = abandoned.exclude(id=owner)
+    now = timezone.now()
+    return abandoned.update(
+        status=RefreshJob.Status.FAILED,
+        error="The refresh stopped without finishing (its lease expired)",
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def claim_next_job() -> Optional[RefreshJob]:
+    """Mark the oldest queued job as running and return it.
+
+    The claim is a conditional update, so a job is only ever claimed by one
+    worker, even with several polling the same queue. Abandoned running
+    jobs are marked as failed first.
+
+    Returns:
+        The claimed job, or None if no job is queued.
+    """
+    fail_abandoned_jobs()
+    while True:
+        job = (
+            RefreshJob.objects.filter(status=RefreshJob.Status.QUEUED)
+            .order_by("created_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        claimed = RefreshJob.objects.filter(
+            id=job.id, status=RefreshJob.Status.QUEUED
+        ).update(status=RefreshJob.Status.RUNNING, started_at=now, updated_at=now)
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def wait_for_source_refreshes(
+    owner: str, poll_interval: float = REFRESH_WORKER_POLL_INTERVAL
+) -> None:
+    """Wait until no single source refresh is in flight.
+
+    Called while holding the refresh lease, which ``owner`` keeps renewing:
+    scheduled source refreshes do not start while it is held, so this only
+    waits for those already running.
+    """
+    while any(lease_owner(source_refresh_lease(source)) for source in SOURCES):
+        time.sleep(poll_interval)
+        acquire_lease(REFRESH_LEASE, owner, REFRESH_LEASE_SECONDS)
+
+
+class JobProgress:
+    """Records the progress reported by a refresh on its job.
+
+    Used as the ``progress`` callback of ``ShowingService``. Per-source
+    counts are merged, so the counts of each stage add up. Each report also
+    renews the job's refresh lease, and stops the refresh if the lease was
+    lost (see ``LeaseHeartbeat``), as another refresh may have started.
+
+    Raises:
+        LeaseLostError: If the lease was lost.
+    """
+
+    def __init__(self, job: RefreshJob, heartbeat: Optional[LeaseHeartbeat] = None):
+        self.job = job
+        self.heartbeat = heartbeat
+
+    def __call__(
+        self, stage: str, counts: Dict[str, Any], errors: Dict[str, str]
+    ) -> None:
+        if not self._renew_lease():
+            raise LeaseLostError(
+                f"Refresh job {self.job.id} lost the refresh lease",
+                source="JobProgress",
+            )
+        self.job.stage = stage
+        for key, value in counts.items():
+            if isinstance(value, dict):
+                self.job.counts.setdefault(key, {}).update(value)
+            else:
+                self.job.counts[key] = value
+        self.job.errors.update(errors)
+        self.job.save(update_fields=["stage", "counts", "errors", "updated_at"])
+
+    def _renew_lease(self) -> bool:
+        if self.heartbeat:
+            return self.heartbeat.renew()
+        return acquire_lease(REFRESH_LEASE, str(self.job.id), REFRESH_LEASE_SECONDS)
+
+
+async def _arefresh_and_save(service: ShowingService) -> tuple:
+    """Run ``service.arefresh_and_save`` and close the loop's HTTP clients.
+
+    The async clients are bound to the event loop, which ends with the
+    refresh.
+    """
+    try:
+        return await service.arefresh_and_save()
+    finally:
+        await aclose_all_sessions()
+
+
+def run_job(job: RefreshJob) -> RefreshJob:
+    """Run a claimed refresh job and record its outcome.
+
+    The job must hold the refresh lease, or be able to take it (e.g. it
+    expired while the job was queued); otherwise another refresh is in
+    flight and the job fails without running. Source refreshes in flight
+    are waited for before the job runs. The lease is renewed by a
+    heartbeat while the job runs; if it is lost, the refresh stops at its
+    next progress report. With ``SCRAPE_ASYNC``, the refresh runs on an
+    event loop. A failed refresh marks the job as failed with the error; it
+    is not raised, so a worker can go on with the next job.
+    """
+    owner = str(job.id)
+    if not acquire_lease(REFRESH_LEASE, owner, REFRESH_LEASE_SECONDS):
+        job.status = RefreshJob.Status.FAILED
+        job.error = f"Another refresh is in progress (job {lease_owner(REFRESH_LEASE)})"
+        job.finished_at = timezone.now()
+        job.save()
+        return job
+
+    try:
+        with LeaseHeartbeat(REFRESH_LEASE, owner, REFRESH_LEASE_SECONDS) as heartbeat:
+            wait_for_source_refreshes(owner)
+            service = ShowingService(progress=JobProgress(job, heartbeat))
+            if SCRAPE_ASYNC:
+                movies, showings = async_to_sync(_arefresh_and_save)(service)
+            else:
+                movies, showings = service.refresh_and_save()
+    except Exception as e:
+        logger.error(f"Refresh job {job.id} failed: {e}")
+        job.status = RefreshJob.Status.FAILED
+        job.error = str(e)
+    else:
+        job.status = RefreshJob.Status.SUCCEEDED
+        job.counts.update({"movies": len(movies), "showings": len(showings)})
+    finally:
+        release_lease(REFRESH_LEASE, owner)
+    job.finished_at = timezone.now()
+    job.save()
+    return job
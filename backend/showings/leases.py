@@ -0,0 +1,148 @@
+import logging
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from django.db import OperationalError, connections
+from django.db.models import Q
+from django.utils import timezone
+from showings.errors import LeaseLostError
+from showings.models import Lease
+
+logger = logging.getLogger(__name__)
+
+
+def acquire_lease(name: str, owner: str, duration: float) -> bool:
+    """Take or renew the lease ``name`` for ``duration`` seconds.
+
+    The lease is taken if it is free, expired, or already held by
+    ``owner``. Taking it is a single conditional update, so of several
+    owners racing for a lease exactly one gets it.
+
+    Returns:
+        True if ``owner`` now holds the lease.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=duration)
+    Lease.objects.bulk_create(
+        [Lease(name=name, owner=owner, expires_at=expires_at)],
+        ignore_conflicts=True,
+    )
+    taken = (
+        Lease.objects.filter(name=name)
+        .filter(Q(owner=owner) | Q(expires_at__lte=now))
+        .update(owner=owner, expires_at=expires_at)
+    )
+    return bool(taken)
+
+
+def release_lease(name: str, owner: str) -> None:
+    """Release the lease ``name`` if ``owner`` holds it."""
+    Lease.objects.filter(name=name, owner=owner).delete()
+
+
+def lease_owner(name: str) -> Optional[str]:
+    """Return the owner of the lease ``name``, or None if it is free or expired."""
+    return (
+        Lease.objects.filter(name=name, expires_at__gt=timezone.now())
+        .values_list("owner", flat=True)
+        .first()
+    )
+
+
+class LeaseHeartbeat:
+    """Keeps renewing a held lease from a background thread.
+
+    Used as a context manager around the work done under the lease, so the
+    lease does not expire however long the work takes. If a renewal fails,
+    e.g. the lease expired and another owner took it, renewals stop and
+    ``check`` raises, so the work can stop before writing anything else. A
+    renewal that fails with an ``OperationalError`` (e.g. SQLite's
+    "database is locked") is retried on the next tick, as long as the lease
+    has not expired meanwhile.
+
+    Args:
+        name: The name of the lease.
+        owner: The owner holding the lease.
+        duration: Seconds each renewal holds the lease for.
+        interval: Seconds between renewals; defaults to a third of
+            ``duration``.
+    """
+
+    def __init__(
+        self, name: str, owner: str, duration: float, interval: Optional[float] = None
+    ):
+        self.name = name
+        self.owner = owner
+        self.duration = duration
+        self.interval = duration / 3 if interval is None else interval
+        self.lost = threading.Event()
+        # When the lease expires at the latest, if no renewal succeeds.
+        self.expires_at = timezone.now() + timedelta(seconds=duration)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"lease-heartbeat:{name}", daemon=True
+        )
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.wait(self.interval):
+                if not self._renew():
+                    self.lost.set()
+                    return
+        except Exception as e:
+            logger.error(f"Failed to renew lease {self.name} of {self.owner}: {e}")
+            self.lost.set()
+        finally:
+            # The thread's own database connections.
+            connections.close_all()
+
+    def _renew(self) -> bool:
+        """Renew the lease; return False once it is lost."""
+        renewed_at = timezone.now()
+        try:
+            renewed = acquire_lease(self.name, self.owner, self.duration)
+        except OperationalError as e:
+            if renewed_at >= self.expires_at:
+                logger.error(
+                    f"Lease {self.name} of {self.owner} expired while "
+                    f"renewals failed: {e}"
+                )
+                return False
+            logger.warning(f"Failed to renew lease {self.name} of {self.owner}: {e}")
+            return True
+        if not renewed:
+            logger.error(f"Lease {self.name} of {self.owner} was lost")
+            return False
+        self.expires_at = renewed_at + timedelta(seconds=self.duration)
+        return True
+
+    def renew(self) -> bool:
+        """Renew the lease now, e.g. when the work reports progress.
+
+        Returns:
+            False if the lease was lost, now or by an earlier renewal.
+        """
+        if self.lost.is_set() or not self._renew():
+            self.lost.set()
+            return False
+        return True
+
+    def check(self) -> None:
+        """Raise if the lease could not be renewed.
+
+        Raises:
+            LeaseLostError: If a renewal failed.
+        """
+        if self.lost.is_set():
+            raise LeaseLostError(
+                f"Lease {self.name} of {self.owner} was lost", source="LeaseHeartbeat"
+            )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from showings.services import ShowingService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the active showings table from the saved showings."
+
+    def handle(self, *args, **options):
+        count = ShowingService().rebuild_active_showings()
+        self.stdout.write(f"Rebuilt {count} active showings")
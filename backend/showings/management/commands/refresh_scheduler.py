@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from showings.http_sessions import close_all_sessions
+from showings.scheduling import RefreshScheduler
+
+
+class Command(BaseCommand):
+    help = "Refresh each cinema source on its own schedule (REFRESH_SCHEDULE)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run every scheduled refresh once, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            self.run(options["once"])
+        finally:
+            close_all_sessions()
+
+    def run(self, once):
+        scheduler = RefreshScheduler()
+        if once:
+            count = scheduler.run_all()
+            self.stdout.write(f"Ran {count} scheduled refreshes")
+            return
+
+        for refresh in scheduler.refreshes:
+            self.stdout.write(f"Scheduled {refresh}")
+        scheduler.run_forever()
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from movie_showings.settings import REFRESH_WORKER_POLL_INTERVAL
+from showings.http_sessions import close_all_sessions
+from showings.jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued refresh jobs, polling the database for new ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=REFRESH_WORKER_POLL_INTERVAL,
+            help="Seconds to wait between polls of an empty queue.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            self.run(options["once"], options["poll_interval"])
+        finally:
+            close_all_sessions()
+
+    def run(self, once, poll_interval):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f"Running refresh job {job.id}")
+            run_job(job)
+            self.stdout.write(f"Refresh job {job.id} {job.status}")
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("showings", "0002_add_hardcoded_locations"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="movie",
+            constraint=models.UniqueConstraint(
+                fields=("normalized_title",), name="unique_normalized_title"
+            ),
+        ),
+    ]
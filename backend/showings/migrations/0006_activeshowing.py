@@ -0,0 +1,75 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_active_showings(apps, schema_editor):
+    Showing = apps.get_model("showings", "Showing")
+    ActiveShowing = apps.get_model("showings", "ActiveShowing")
+
+    showings = Showing.objects.filter(
+        is_showing=True, date__gte=timezone.now().date()
+    ).select_related("movie", "location")
+    ActiveShowing.objects.bulk_create(
+        [
+            ActiveShowing(
+                id=showing.id,
+                movie_id=showing.movie_id,
+                location_id=showing.location_id,
+                title=showing.movie.title,
+                location_name=showing.location.name,
+                date=showing.date,
+                time=showing.time,
+                url=showing.url,
+            )
+            for showing in showings.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("showings", "0005_lease"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActiveShowing",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=100)),
+                ("location_name", models.CharField(max_length=100)),
+                ("date", models.DateField()),
+                ("time", models.TimeField()),
+                ("url", models.URLField(null=True)),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="showings.location",
+                    ),
+                ),
+                (
+                    "movie",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="showings.movie",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date", "time", "id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="activeshowing",
+            index=models.Index(
+                fields=["date", "time", "id"], name="showings_ac_date_06221e_idx"
+            ),
+        ),
+        migrations.RunPython(fill_active_showings, migrations.RunPython.noop),
+    ]
@@ -65,7 +65,10 @@ class Movie(TimestampMixin):
                 | models.Q(prime_id__isnull=False)
                 | models.Q(taj_id__isnull=False),
                 name="at_least_one_source_id",
-            )
+            ),
+            models.UniqueConstraint(
+                fields=["normalized_title"], name="unique_normalized_title"
+            ),
         ]
 
     def __str__(self):
@@ -110,3 +113,77 @@ class Showing(TimestampMixin):
         super().clean()
         if self.date < timezone.now().date():
             raise ValidationError({"date": "Showing date cannot be in the past"})
+
+
+class ActiveShowing(models.Model):
+    """A showing that is showing, with the fields the API returns.
+
+    A read-only projection of ``Showing``, kept in sync by the showing
+    service when showings are saved, so reads need no joins. Rows of past
+    dates are only removed on the next save, so reads still filter on the
+    date.
+    """
+
+    # The id of the showing.
+    id = models.BigIntegerField(primary_key=True)
+    movie = models.ForeignKey(Movie, related_name="+", on_delete=models.CASCADE)
+    location = models.ForeignKey(Location, related_name="+", on_delete=models.CASCADE)
+    title = models.CharField(max_length=100)
+    location_name = models.CharField(max_length=100)
+    date = models.DateField()
+    time = models.TimeField()
+    url = models.URLField(null=True)
+
+    class Meta:
+        ordering = ["date", "time", "id"]
+        indexes = [
+            models.Index(fields=["date", "time", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.title} at {self.location_name} - {self.date} {self.time}"
+
+
+class RefreshJob(TimestampMixin):
+    """A queued refresh of movies and showings, run by the refresh worker."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    # The last stage reported by the refresh: titles, movies or showings.
+    stage = models.CharField(max_length=20, blank=True, default="")
+    # Counts per source (e.g. {"grand": {"titles": 12, "showings": 240}}) and
+    # totals.
+    counts = models.JSONField(default=dict)
+    # Errors of the sources that failed, by source.
+    errors = models.JSONField(default=dict)
+    # Why the refresh failed, if it did.
+    error = models.TextField(blank=True, default="")
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Refresh job {self.id} ({self.status})"
+
+
+class Lease(models.Model):
+    """A named advisory lock held by one owner until it expires."""
+
+    name = models.CharField(max_length=100, unique=True)
+    owner = models.CharField(max_length=100)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} held by {self.owner} until {self.expires_at}"
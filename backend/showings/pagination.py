@@ -0,0 +1,74 @@
+import base64
+from datetime import date, time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+# The (date, time, id) of a showing: the sort key of showing listings, in the
+# order of the (date, time) index (whose entries are ordered by id on ties).
+Position = Tuple[date, time, int]
+
+SHOWING_ORDERING = ("date", "time", "id")
+
+
+def encode_cursor(position: Position) -> str:
+    """Encode the position of a showing as an opaque cursor."""
+    showing_date, showing_time, showing_id = position
+    raw = f"{showing_date.isoformat()}|{showing_time.isoformat()}|{showing_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Position:
+    """Decode a cursor made by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        showing_date, showing_time, showing_id = raw.split("|")
+        return (
+            date.fromisoformat(showing_date),
+            time.fromisoformat(showing_time),
+            int(showing_id),
+        )
+    except (UnicodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def after_position(position: Position) -> Q:
+    """Build a filter matching the showings sorted after a position."""
+    showing_date, showing_time, showing_id = position
+    return (
+        Q(date__gt=showing_date)
+        | Q(date=showing_date, time__gt=showing_time)
+        | Q(date=showing_date, time=showing_time, id__gt=showing_id)
+    )
+
+
+def keyset_page(
+    showings: QuerySet, after: Optional[Position], limit: int
+) -> Tuple[List[Dict[str, Any]], Optional[Position]]:
+    """Fetch a page of showing rows sorted by (date, time, id).
+
+    The page starts right after the ``after`` position instead of at an
+    offset, so each page is a single bounded range scan however deep it is.
+
+    Args:
+        showings: Showing rows, i.e. a ``values()`` queryset including "date",
+            "time" and "id".
+        after: The position of the last showing of the previous page.
+        limit: The maximum number of showings on the page.
+
+    Returns:
+        A ``(rows, next_position)`` tuple; ``next_position`` is None on the
+        last page.
+    """
+    if after is not None:
+        showings = showings.filter(after_position(after))
+    rows = list(showings.order_by(*SHOWING_ORDERING)[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, (last["date"], last["time"], last["id"])
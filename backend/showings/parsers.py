@@ -1,20 +1,43 @@
 import datetime
 import logging
 from functools import wraps
-from typing import Dict, List
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Union
 
-from bs4 import BeautifulSoup
-from showings.errors import (
-    ElementNotFoundError,
-    InvalidFormatError,
-    ParserError,
-)
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+from lxml import etree
+from movie_showings.settings import PARSER_BACKEND, PARSER_PARTIAL_PARSING
+from showings.errors import ElementNotFoundError, InvalidFormatError, ParserError
 from showings.service_base import handle_errors
 from showings.util import get_current_month, get_current_year
 
 logger = logging.getLogger(__name__)
 
 
+def _class_token(name: str) -> Callable[[Optional[str]], bool]:
+    """Match a class attribute that has ``name`` among its classes.
+
+    Strainers match a class string against the whole attribute value, so a
+    string would miss elements that have other classes too.
+    """
+    return lambda value: bool(value) and name in value.split()
+
+
+# The only subtrees the titles parsers read; with PARSER_PARTIAL_PARSING the
+# rest of the page (scripts, navigation, footers) is never built.
+TAJ_MOVIES_STRAINER = SoupStrainer(
+    "div", class_=_class_token("prs_upcom_slider_slides_wrapper")
+)
+PRIME_MOVIES_STRAINER = SoupStrainer("article", id="movies-list")
+
+
+def _partial_soup(content: bytes, strainer: SoupStrainer) -> BeautifulSoup:
+    """Build a soup, restricted to ``strainer`` when partial parsing is on."""
+    if PARSER_PARTIAL_PARSING:
+        return BeautifulSoup(content, "lxml", parse_only=strainer)
+    return BeautifulSoup(content, "lxml")
+
+
 def handle_parser_errors(source: str):
     """Decorator to handle parser errors consistently.
 
@@ -141,7 +164,7 @@ class TajParser:
             InvalidFormatError: If the HTML format is invalid.
             ParserError: For other parsing errors.
         """
-        soup = BeautifulSoup(titles_page, "lxml")
+        soup = _partial_soup(titles_page, TAJ_MOVIES_STRAINER)
         movies_container = soup.find("div", class_="prs_upcom_slider_slides_wrapper")
         if not movies_container:
             raise ElementNotFoundError(
@@ -177,7 +200,10 @@ class TajParser:
             InvalidFormatError: If the HTML format is invalid.
             ParserError: For other parsing errors.
         """
-        soup = BeautifulSoup(title_page, "lxml")
+        return TajParser._parse_showing_dates(BeautifulSoup(title_page, "lxml"))
+
+    @staticmethod
+    def _parse_showing_dates(soup: BeautifulSoup) -> list:
         calendar_container = soup.find("div", id="booking-dates")
         if not calendar_container:
             raise ElementNotFoundError(
@@ -214,10 +240,43 @@ class TajParser:
             ParserError: For other parsing errors.
         """
         soup = BeautifulSoup(title_page, "lxml")
+        return TajParser._parse_showing_times(soup, showing_dates)
+
+    @staticmethod
+    @handle_errors("TajParser", ParserError)
+    def parse_showings_from_title_page(title_page: bytes) -> tuple:
+        """Parse showing dates and times from Taj Cinema's title page in one pass.
+
+        Builds a single tree and looks up each date's times container in an
+        index of the page's ``div`` ids, instead of parsing the page once per
+        ``parse_showing_*`` call and searching it once per date.
+
+        Args:
+            title_page: The HTML content of the title's page.
+
+        Returns:
+            A ``(showing_dates, showings)`` tuple, as returned by
+            ``parse_showing_dates_from_title_page`` and
+            ``parse_showing_times_from_title_page``.
+
+        Raises:
+            ElementNotFoundError: If required elements are not found.
+            InvalidFormatError: If the HTML format is invalid.
+            ParserError: For other parsing errors.
+        """
+        soup = BeautifulSoup(title_page, "lxml")
+        showing_dates = TajParser._parse_showing_dates(soup)
+        return showing_dates, TajParser._parse_showing_times(soup, showing_dates)
+
+    @staticmethod
+    def _parse_showing_times(soup: BeautifulSoup, showing_dates: list) -> list:
+        times_containers = {}
+        for div in soup.find_all("div", id=True):
+            times_containers.setdefault(div["id"], div)
         showings = []
         for date in showing_dates:
             date_id = date["date_id"]
-            times_container = soup.find("div", id=date_id)
+            times_container = times_containers.get(date_id)
             if not times_container:
                 continue
             times = times_container.find_all("a")
@@ -307,7 +366,7 @@ class PrimeParser:
             InvalidFormatError: If the HTML format is invalid.
             ParserError: For other parsing errors.
         """
-        soup = BeautifulSoup(titles_page, "lxml")
+        soup = _partial_soup(titles_page, PRIME_MOVIES_STRAINER)
         movies_container = soup.find("article", id="movies-list")
         if not movies_container:
             raise ElementNotFoundError(
@@ -371,3 +430,322 @@ class PrimeParser:
                 "No valid showings found in the page", source="PrimeParser"
             )
         return showings
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains ``name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_TEXT = etree.XPath("string()")
+_LABELS = etree.XPath("//label")
+_LINKS = etree.XPath(".//a")
+_FIRST_LINK = etree.XPath("(.//a)[1]")
+_FIRST_H3 = etree.XPath("(.//h3)[1]")
+_FIRST_TIME = etree.XPath("(.//time)[1]")
+_DIVS_WITH_ID = etree.XPath("//div[@id]")
+_TAJ_MOVIES_CONTAINER = etree.XPath(
+    f"(//div[{_has_class('prs_upcom_slider_slides_wrapper')}])[1]"
+)
+_TAJ_MOVIE_BOXES = etree.XPath(f".//div[{_has_class('prs_upcom_movie_content_box')}]")
+_TAJ_BOOKING_DATES = etree.XPath("(//div[@id='booking-dates'])[1]")
+_PRIME_MOVIES_LIST = etree.XPath("(//article[@id='movies-list'])[1]")
+_PRIME_TITLE_WRAPPERS = etree.XPath(f".//div[{_has_class('title-wrapper')}]")
+_PRIME_FILM_ITEMS = etree.XPath(f"//div[{_has_class('film-item')}]")
+_PRIME_FILM_TITLE = etree.XPath(f"(.//h3[{_has_class('film-title')}])[1]")
+
+
+def _decode(content: Union[bytes, str]) -> str:
+    """Decode page content the way BeautifulSoup does."""
+    if isinstance(content, bytes):
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError:
+            return UnicodeDammit(content).unicode_markup
+    return content
+
+
+def _utf8(content: Union[bytes, str]) -> bytes:
+    """Return page content as UTF-8, reusing bytes that already are."""
+    if isinstance(content, bytes):
+        try:
+            content.decode("utf-8")
+            return content
+        except UnicodeDecodeError:
+            content = UnicodeDammit(content).unicode_markup
+    return content.encode("utf-8")
+
+
+def _html_tree(content: bytes) -> Optional[etree._Element]:
+    """Parse HTML into an lxml tree."""
+    return etree.HTML(_decode(content))
+
+
+def _partial_tree(
+    content: bytes,
+    xpath: etree.XPath,
+    tag: str,
+    matches: Callable[[etree._Element], bool],
+) -> Optional[etree._Element]:
+    """Return the first ``tag`` element accepted by ``matches``.
+
+    With partial parsing on, the page is parsed incrementally: ``tag``
+    elements that end before the target starts are discarded, and parsing
+    stops as soon as the target element is complete. Otherwise the whole page
+    is parsed and searched with ``xpath``.
+    """
+    if not PARSER_PARTIAL_PARSING:
+        return _find(xpath, _html_tree(content))
+
+    target = None
+    events = etree.iterparse(
+        BytesIO(_utf8(content)),
+        events=("start", "end"),
+        tag=tag,
+        html=True,
+        encoding="utf-8",
+    )
+    try:
+        for event, element in events:
+            if event == "start":
+                if target is None and matches(element):
+                    target = element
+            elif element is target:
+                return target
+            elif target is None:
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+    except etree.XMLSyntaxError:
+        # Raised for an empty document.
+        pass
+    return target
+
+
+def _has_class_attr(name: str) -> Callable[[etree._Element], bool]:
+    return lambda element: name in (element.get("class") or "").split()
+
+
+def _find(xpath: etree.XPath, node: Optional[etree._Element], **variables):
+    """Return the first match of a compiled XPath, or None."""
+    if node is None:
+        return None
+    matches = xpath(node, **variables)
+    return matches[0] if matches else None
+
+
+def _find_all(xpath: etree.XPath, node: Optional[etree._Element]) -> list:
+    return [] if node is None else xpath(node)
+
+
+def _text(node: etree._Element) -> str:
+    return str(_TEXT(node))
+
+
+class LxmlGrandParser(GrandParser):
+    """``GrandParser`` on compiled lxml XPath expressions instead of bs4."""
+
+    @staticmethod
+    @handle_errors("GrandParser", ParserError)
+    def parse_titles_from_titles_page(titles_page: bytes) -> list:
+        titles = []
+        for label in _find_all(_LABELS, _html_tree(titles_page)):
+            title = _text(label)
+            grand_id = label.get("for")
+            if title and grand_id:
+                titles.append({"title": title, "grand_id": grand_id})
+        if not titles:
+            raise ElementNotFoundError(
+                "No valid movie titles found in the page", source="GrandParser"
+            )
+        return titles
+
+    @staticmethod
+    @handle_errors("GrandParser", ParserError)
+    def parse_showing_dates(showing_dates_page: bytes) -> list:
+        dates = [_text(i) for i in _find_all(_LABELS, _html_tree(showing_dates_page))]
+        if not dates:
+            raise ElementNotFoundError(
+                "No valid dates found in the page", source="GrandParser"
+            )
+        return dates
+
+    @staticmethod
+    @handle_errors("GrandParser", ParserError)
+    def parse_showing_times(showing_times_page: bytes) -> list:
+        times = [_text(i) for i in _find_all(_LABELS, _html_tree(showing_times_page))]
+        if not times:
+            raise ElementNotFoundError(
+                "No valid times found in the page", source="GrandParser"
+            )
+        return times
+
+
+class LxmlTajParser(TajParser):
+    """``TajParser`` on compiled lxml XPath expressions instead of bs4."""
+
+    @staticmethod
+    @handle_errors("TajParser", ParserError)
+    def parse_titles_from_titles_page(titles_page: bytes) -> list:
+        movies_container = _partial_tree(
+            titles_page,
+            _TAJ_MOVIES_CONTAINER,
+            "div",
+            _has_class_attr("prs_upcom_slider_slides_wrapper"),
+        )
+        if movies_container is None:
+            raise ElementNotFoundError(
+                "No movies container found in the page", source="TajParser"
+            )
+        titles = []
+        for container in _TAJ_MOVIE_BOXES(movies_container):
+            link = _find(_FIRST_LINK, container)
+            title = _text(link)
+            taj_id = link.attrib["href"].split("/")[-1]
+            titles.append({"title": title, "taj_id": taj_id})
+        if not titles:
+            raise ElementNotFoundError(
+                "No valid movie titles found in the page", source="TajParser"
+            )
+        return titles
+
+    @staticmethod
+    @handle_errors("TajParser", ParserError)
+    def parse_showing_dates_from_title_page(title_page: bytes) -> list:
+        return LxmlTajParser._parse_showing_dates(_html_tree(title_page))
+
+    @staticmethod
+    def _parse_showing_dates(tree: Optional[etree._Element]) -> list:
+        calendar_container = _find(_TAJ_BOOKING_DATES, tree)
+        if calendar_container is None:
+            raise ElementNotFoundError(
+                "No booking dates container found in the page", source="TajParser"
+            )
+        parsed_showing_dates = [
+            {"date": _text(i), "date_id": i.get("href")}
+            for i in _LINKS(calendar_container)
+        ]
+        showing_dates = TajParser.format_parsed_showing_dates(parsed_showing_dates)
+        if not showing_dates:
+            raise ElementNotFoundError(
+                "No valid showing dates found in the page", source="TajParser"
+            )
+        return showing_dates
+
+    @staticmethod
+    @handle_errors("TajParser", ParserError)
+    def parse_showing_times_from_title_page(
+        title_page: bytes, showing_dates: list
+    ) -> list:
+        return LxmlTajParser._parse_showing_times(_html_tree(title_page), showing_dates)
+
+    @staticmethod
+    @handle_errors("TajParser", ParserError)
+    def parse_showings_from_title_page(title_page: bytes) -> tuple:
+        tree = _html_tree(title_page)
+        showing_dates = LxmlTajParser._parse_showing_dates(tree)
+        return showing_dates, LxmlTajParser._parse_showing_times(tree, showing_dates)
+
+    @staticmethod
+    def _parse_showing_times(
+        tree: Optional[etree._Element], showing_dates: list
+    ) -> list:
+        times_containers = {}
+        for div in _find_all(_DIVS_WITH_ID, tree):
+            times_containers.setdefault(div.get("id"), div)
+        showings = []
+        for date in showing_dates:
+            date_id = date["date_id"]
+            times_container = times_containers.get(date_id)
+            if times_container is None:
+                continue
+            for time in _LINKS(times_container):
+                showings.append(
+                    {
+                        "date_id": date_id,
+                        "date": date["date"],
+                        "time": _text(time).strip(),
+                    }
+                )
+        if not showings:
+            raise ElementNotFoundError(
+                "No valid showing times found in the page", source="TajParser"
+            )
+        return showings
+
+
+class LxmlPrimeParser(PrimeParser):
+    """``PrimeParser`` on compiled lxml XPath expressions instead of bs4."""
+
+    @staticmethod
+    @handle_errors("PrimeParser", ParserError)
+    def parse_titles_from_titles_page(titles_page: bytes) -> list:
+        movies_container = _partial_tree(
+            titles_page,
+            _PRIME_MOVIES_LIST,
+            "article",
+            lambda element: element.get("id") == "movies-list",
+        )
+        if movies_container is None:
+            raise ElementNotFoundError(
+                "No movies container found in the page", source="PrimeParser"
+            )
+        titles = []
+        for container in _PRIME_TITLE_WRAPPERS(movies_container):
+            title = _text(_find(_FIRST_H3, container))
+            prime_id = _find(_FIRST_LINK, container).attrib["href"].split("/")[-1]
+            titles.append({"title": title, "prime_id": prime_id})
+        if not titles:
+            raise ElementNotFoundError(
+                "No valid movie titles found in the page", source="PrimeParser"
+            )
+        return titles
+
+    @staticmethod
+    @handle_errors("PrimeParser", ParserError)
+    def parse_showings_from_title_page(title_page: bytes) -> list:
+        film_items = _find_all(_PRIME_FILM_ITEMS, _html_tree(title_page))
+        if not film_items:
+            raise ElementNotFoundError(
+                "No film items found in the page", source="PrimeParser"
+            )
+        showings = []
+        for item in film_items:
+            try:
+                film_title = _find(_PRIME_FILM_TITLE, item)
+                if film_title is None:
+                    raise AttributeError("film title element is missing")
+                time = _find(_FIRST_TIME, item)
+                if time is None:
+                    # Not a format error, as for PrimeParser.
+                    raise ParserError("time element is missing", source="PrimeParser")
+                datetime_obj = datetime.datetime.strptime(
+                    time.attrib["datetime"], "%Y-%m-%dT%H:%M:%S"
+                )
+                showings.append(
+                    {
+                        "location": _text(film_title),
+                        "date": datetime_obj.strftime("%Y-%m-%d"),
+                        "time": datetime_obj.strftime("%H:%M"),
+                    }
+                )
+            except (ValueError, AttributeError) as e:
+                raise InvalidFormatError(
+                    f"Invalid datetime format: {str(e)}", source="PrimeParser"
+                ) from e
+        if not showings:
+            raise ElementNotFoundError(
+                "No valid showings found in the page", source="PrimeParser"
+            )
+        return showings
+
+
+PARSER_BACKENDS = {
+    "bs4": {"grand": GrandParser, "taj": TajParser, "prime": PrimeParser},
+    "lxml": {"grand": LxmlGrandParser, "taj": LxmlTajParser, "prime": LxmlPrimeParser},
+}
+
+
+def get_parser(source: str, backend: str = PARSER_BACKEND):
+    """Return the parser class for a source ("grand", "taj" or "prime")."""
+    return PARSER_BACKENDS[backend][source]
@@ -0,0 +1,54 @@
+import logging
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer that encodes with orjson when it is installed.
+
+    orjson serializes dates, times and datetimes natively. Its output is
+    identical to ``JSONRenderer``'s for the API's payloads: the same compact
+    separators, UTF-8 text, ``Z`` suffix for UTC datetimes and escaped
+    U+2028/U+2029. Other types go through DRF's encoder.
+
+    Falls back to ``JSONRenderer`` without orjson, for indented output (e.g.
+    the browsable API), and for data orjson rejects, such as integers larger
+    than 64 bits. Unlike ``JSONRenderer``, NaN and infinite floats are
+    rendered as null.
+    """
+
+    options = 0
+    if orjson is not None:
+        options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        # orjson only writes compact, unescaped UTF-8.
+        if (
+            orjson is None
+            or indent is not None
+            or self.ensure_ascii
+            or not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=self.options
+            )
+        except orjson.JSONEncodeError as e:
+            logger.debug(f"Rendering with the stdlib JSON encoder: {e}")
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped as by JSONRenderer, to keep the output a JavaScript subset.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
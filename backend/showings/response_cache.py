@@ -0,0 +1,66 @@
+import calendar
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from django.core.cache import caches
+from django.utils import timezone
+from movie_showings.settings import ACTIVE_SHOWINGS_CACHE_TIMEOUT, API_CACHE_ALIAS
+
+SHOWINGS_VERSION_KEY = "showings:version"
+
+
+def _cache():
+    return caches[API_CACHE_ALIAS]
+
+
+def showings_version() -> int:
+    """Return the version of the saved showings, bumped on every save.
+
+    Versions are the time of the save in nanoseconds. A missing version
+    (e.g. an emptied cache) starts from the current time, so it never goes
+    back to one that payloads were cached under.
+    """
+    _cache().add(SHOWINGS_VERSION_KEY, time.time_ns(), timeout=None)
+    return _cache().get(SHOWINGS_VERSION_KEY)
+
+
+def bump_showings_version() -> None:
+    """Invalidate the cached payloads built from the saved showings."""
+    version = max(time.time_ns(), showings_version() + 1)
+    _cache().set(SHOWINGS_VERSION_KEY, version, timeout=None)
+
+
+def active_showings_validators(version: int) -> Tuple[str, int]:
+    """Return the validators of the active showings payload of a version.
+
+    The payload also changes at midnight, when the showings of the past day
+    become inactive, so both validators cover today's date.
+
+    Returns:
+        A ``(etag, last_modified)`` tuple; ``last_modified`` is a timestamp.
+    """
+    today = timezone.now().date()
+    etag = f'"{version}-{today.isoformat()}"'
+    last_modified = max(version // 10**9, calendar.timegm(today.timetuple()))
+    return etag, last_modified
+
+
+def cached_active_showings(
+    build: Callable[[], Dict[str, Any]], version: int
+) -> Dict[str, Any]:
+    """Return the active showings payload, building it on a cache miss.
+
+    Payloads are cached under the showings version and today's date, since
+    showings become inactive once their date has passed; a hit does not
+    touch the database.
+
+    Args:
+        build: Builds the payload from the database.
+        version: The showings version, from ``showings_version``.
+    """
+    key = f"active_showings:{version}:{timezone.now().date()}"
+    payload = _cache().get(key)
+    if payload is None:
+        payload = build()
+        _cache().set(key, payload, timeout=ACTIVE_SHOWINGS_CACHE_TIMEOUT)
+    return payload
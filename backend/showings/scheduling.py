@@ -0,0 +1,193 @@
+import logging
+import random
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.utils import timezone
+from movie_showings.settings import (
+    REFRESH_JITTER,
+    REFRESH_LEASE_SECONDS,
+    REFRESH_SCHEDULE,
+)
+from showings.errors import LeaseLostError
+from showings.jobs import REFRESH_LEASE, source_refresh_lease
+from showings.leases import LeaseHeartbeat, acquire_lease, lease_owner, release_lease
+from showings.services import ShowingService
+
+logger = logging.getLogger(__name__)
+
+# (days ahead, interval in seconds) horizons per source, as in REFRESH_SCHEDULE.
+Schedule = Dict[str, Sequence[Tuple[Optional[int], float]]]
+
+
+class ScheduledRefresh:
+    """A refresh of one source's showings over a range of days ahead.
+
+    Args:
+        source: The source to refresh: "grand", "taj" or "prime".
+        start_days: The first day of the range, in days from today.
+        end_days: The day the range stops before, in days from today; None
+            leaves the range open.
+        interval: Seconds between two runs of the refresh.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        start_days: int,
+        end_days: Optional[int],
+        interval: float,
+    ):
+        self.source = source
+        self.start_days = start_days
+        self.end_days = end_days
+        self.interval = interval
+        self.next_run = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ScheduledRefresh({self.source!r}, {self.start_days}, "
+            f"{self.end_days}, {self.interval})"
+        )
+
+    def date_range(self, today: date) -> Tuple[date, Optional[date]]:
+        """The first and last dates covered by the refresh, from ``today``."""
+        start = today + timedelta(days=self.start_days)
+        if self.end_days is None:
+            return start, None
+        return start, today + timedelta(days=self.end_days - 1)
+
+
+def scheduled_refreshes(schedule: Schedule) -> List[ScheduledRefresh]:
+    """Expand the horizons of each source into refreshes of consecutive ranges."""
+    refreshes = []
+    for source, horizons in schedule.items():
+        start_days = 0
+        for end_days, interval in horizons:
+            refreshes.append(ScheduledRefresh(source, start_days, end_days, interval))
+            if end_days is None:
+                break
+            start_days = end_days
+    return refreshes
+
+
+class RefreshScheduler:
+    """Refreshes each source on its own cadence.
+
+    Each scheduled refresh runs every ``interval`` seconds, varied by up to
+    ``jitter`` of it either way, and first runs are spread over the first
+    ``jitter`` of each interval, so the refreshes of different sources and
+    horizons do not hit the cinemas together.
+
+    A source refresh holds the source's lease while it runs. It is skipped
+    while a full refresh holds the refresh lease, as that refreshes every
+    source anyway.
+
+    Args:
+        schedule: The horizons of each source; defaults to REFRESH_SCHEDULE.
+        jitter: The fraction by which intervals vary; defaults to
+            REFRESH_JITTER.
+        clock: Returns the current time in seconds, e.g. ``time.monotonic``.
+        rng: The random number generator used for jitter.
+    """
+
+    def __init__(
+        self,
+        schedule: Optional[Schedule] = None,
+        jitter: float = REFRESH_JITTER,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.refreshes = scheduled_refreshes(
+            REFRESH_SCHEDULE if schedule is None else schedule
+        )
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+        now = self.clock()
+        for refresh in self.refreshes:
+            refresh.next_run = now + self.rng.uniform(0, jitter * refresh.interval)
+
+    def next_interval(self, refresh: ScheduledRefresh) -> float:
+        """The seconds until the next run of a refresh, with jitter."""
+        return refresh.interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def seconds_until_next_run(self) -> float:
+        """The seconds until the next refresh is due."""
+        next_run = min(refresh.next_run for refresh in self.refreshes)
+        return max(0.0, next_run - self.clock())
+
+    def run_pending(self) -> int:
+        """Run the refreshes that are due, earliest first, and reschedule them.
+
+        Returns:
+            The number of refreshes that were due.
+        """
+        now = self.clock()
+        due = sorted(
+            (refresh for refresh in self.refreshes if refresh.next_run <= now),
+            key=lambda refresh: refresh.next_run,
+        )
+        for refresh in due:
+            self.run(refresh)
+            refresh.next_run = self.clock() + self.next_interval(refresh)
+        return len(due)
+
+    def run_all(self) -> int:
+        """Run every scheduled refresh now, and reschedule them."""
+        for refresh in self.refreshes:
+            refresh.next_run = self.clock()
+        return self.run_pending()
+
+    def run_forever(self, sleep: Callable[[float], None] = time.sleep) -> None:
+        while True:
+            self.run_pending()
+            sleep(self.seconds_until_next_run())
+
+    def run(self, refresh: ScheduledRefresh) -> bool:
+        """Run a scheduled refresh, unless another refresh of its source is running.
+
+        A failed refresh is logged, not raised, so the scheduler goes on
+        with the next one.
+
+        Returns:
+            True if the refresh ran, False if it was skipped.
+        """
+        lease = source_refresh_lease(refresh.source)
+        owner = uuid.uuid4().hex
+        if not acquire_lease(lease, owner, REFRESH_LEASE_SECONDS):
+            logger.info(f"Skipping {refresh}: the source is being refreshed")
+            return False
+
+        try:
+            # Checked while holding the source lease: a full refresh that
+            # starts meanwhile waits for the lease to be released.
+            if lease_owner(REFRESH_LEASE):
+                logger.info(f"Skipping {refresh}: a full refresh is in progress")
+                return False
+
+            start, end = refresh.date_range(timezone.now().date())
+            # The lease is renewed for as long as the refresh takes, and on
+            # each progress report; if it is lost, the refresh stops at its
+            # next progress report.
+            with LeaseHeartbeat(lease, owner, REFRESH_LEASE_SECONDS) as heartbeat:
+
+                def renew_lease(*_):
+                    if not heartbeat.renew():
+                        raise LeaseLostError(
+                            f"{refresh} lost its lease", source="RefreshScheduler"
+                        )
+
+                service = ShowingService(progress=renew_lease)
+                movies, showings = service.refresh_source(refresh.source, start, end)
+            logger.info(
+                f"Refreshed {refresh}: {len(movies)} movies, {len(showings)} showings"
+            )
+        except Exception as e:
+            logger.error(f"Scheduled refresh {refresh} failed: {e}")
+        finally:
+            release_lease(lease, owner)
+        return True
@@ -1,7 +1,9 @@
 import re
 
+from movie_showings.settings import SHOWINGS_MAX_PAGE_SIZE, SHOWINGS_PAGE_SIZE
 from rest_framework import serializers
-from showings.models import Movie
+from showings.models import Movie, RefreshJob
+from showings.pagination import decode_cursor
 
 
 class BaseIdSerializer(serializers.Serializer):
@@ -154,3 +156,59 @@ class MovieSerializer(serializers.ModelSerializer):
         if not any([data.get("grand_id"), data.get("prime_id"), data.get("taj_id")]):
             raise serializers.ValidationError("At least one cinema ID must be present")
         return data
+
+
+class ShowingFilterQuerySerializer(serializers.Serializer):
+    """Serializer for the query parameters filtering showings."""
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    movie = serializers.IntegerField(required=False, min_value=1)
+    location = serializers.IntegerField(required=False, min_value=1)
+    time_from = serializers.TimeField(required=False)
+    time_to = serializers.TimeField(required=False)
+
+    def validate(self, data):
+        """Validate that ranges do not end before they start."""
+        for start, end in (("date_from", "date_to"), ("time_from", "time_to")):
+            if start in data and end in data and data[start] > data[end]:
+                raise serializers.ValidationError(f"{start} must not be after {end}")
+        return data
+
+
+class ShowingListQuerySerializer(ShowingFilterQuerySerializer):
+    """Serializer for the query parameters of paginated showing listings."""
+
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=SHOWINGS_MAX_PAGE_SIZE,
+        default=SHOWINGS_PAGE_SIZE,
+    )
+
+    def validate_cursor(self, value):
+        """Decode the cursor into the position it points after."""
+        try:
+            return decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor.")
+
+
+class RefreshJobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of a RefreshJob."""
+
+    class Meta:
+        model = RefreshJob
+        fields = [
+            "id",
+            "status",
+            "stage",
+            "counts",
+            "errors",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
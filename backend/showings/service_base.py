@@ -1,14 +1,14 @@
+import inspect
 import logging
+from datetime import date
 from functools import wraps
-from typing import Any, Callable, Protocol, Type
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Type
 
 from rest_framework import serializers
 from showings.clients import ClientError, HTTPClientError, NetworkError
-from showings.errors import (
-    Error,
-    ParserError,
-    ServiceError,
-)
+from showings.errors import Error, LeaseLostError, ParserError, ServiceError
+from showings.fingerprints import FingerprintStore
+from showings.http_cache import PageContent
 
 
 class ClientProtocol(Protocol):
@@ -20,6 +20,17 @@ class ClientProtocol(Protocol):
     def get_title_showings_page(self, title: dict) -> bytes: ...
 
 
+class AsyncClientProtocol(Protocol):
+    """Protocol for async client classes; same calls as ``ClientProtocol``."""
+
+    def get_titles_page(self) -> Awaitable[bytes]: ...
+    def get_title_showing_dates(self, title_id: str) -> Awaitable[bytes]: ...
+    def get_title_showing_times_on_date(
+        self, title_id: str, date: str
+    ) -> Awaitable[bytes]: ...
+    def get_title_showings_page(self, title: dict) -> Awaitable[bytes]: ...
+
+
 class ParserProtocol(Protocol):
     """Protocol for parser classes."""
 
@@ -63,107 +74,172 @@ def handle_errors(source: str, error_type: Type[Error]) -> Callable:
     return decorator
 
 
+page_fingerprints = FingerprintStore("page")
+
+
 class ServiceWrapper:
     """Base class for services that use clients and parsers."""
 
-    def __init__(self, client, parser):
+    def __init__(self, client, parser, async_client=None):
         self.client = client
         self.parser = parser
+        self.async_client = async_client
+
+    def parse_page(self, page: bytes, name: str, parse: Callable[[bytes], Any]) -> Any:
+        """Parse a page, reusing the previous result if its content is unchanged.
+
+        Pages fetched by the clients are fingerprinted together with their
+        parse result, so byte-identical pages (including 304 responses) skip
+        parsing entirely.
+
+        Args:
+            page: The page content returned by the client.
+            name: A stable name for the page and its request parameters,
+                e.g. "taj:title:<taj_id>".
+            parse: The parser call producing the result from the page.
+        """
+        if not isinstance(page, PageContent):
+            return parse(page)
+        hit, parsed = page_fingerprints.get(name, page)
+        if hit:
+            return parsed
+        parsed = parse(page)
+        page_fingerprints.set(name, page, parsed)
+        return parsed
+
+    @staticmethod
+    def in_date_range(
+        showing_date: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> bool:
+        """Whether an ISO formatted showing date falls within ``[start, end]``.
+
+        A missing bound leaves that side of the range open.
+        """
+        return (start is None or showing_date >= start.isoformat()) and (
+            end is None or showing_date <= end.isoformat()
+        )
+
+    @classmethod
+    def showings_in_date_range(
+        cls,
+        titles_showings: List[List[Dict[str, Any]]],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """Flatten the showings of each title, keeping those in ``[start, end]``."""
+        return [
+            showing
+            for showings in titles_showings
+            for showing in showings
+            if cls.in_date_range(showing["date"], start, end)
+        ]
+
+
+def _to_service_error(
+    service: "ServiceWrapper", e: Exception, operation: str, service_name: str
+) -> ServiceError:
+    """Log an exception raised by a service operation and wrap it."""
+    if isinstance(e, HTTPClientError):
+        logger.error(
+            f"HTTP error during {operation}",
+            extra={
+                "client": service.client.__class__.__name__,
+                "error": str(e),
+            },
+            exc_info=True,
+        )
+        error = ServiceError(f"HTTP error: {str(e)}", source=service_name)
+    elif isinstance(e, NetworkError):
+        logger.error(
+            f"Network error during {operation}",
+            extra={
+                "client": service.client.__class__.__name__,
+                "error": str(e),
+            },
+            exc_info=True,
+        )
+        error = ServiceError(f"Network error: {str(e)}", source=service_name)
+    elif isinstance(e, ClientError):
+        logger.error(
+            f"Client error during {operation}",
+            extra={
+                "client": service.client.__class__.__name__,
+                "error": str(e),
+            },
+            exc_info=True,
+        )
+        error = ServiceError(f"Client error: {str(e)}", source=service_name)
+    elif isinstance(e, ParserError):
+        logger.error(
+            f"Parser error during {operation}",
+            extra={
+                "parser": service.parser.__class__.__name__,
+                "error": str(e),
+            },
+            exc_info=True,
+        )
+        error = ServiceError(f"Parser error: {str(e)}", source=service_name)
+    elif isinstance(e, serializers.ValidationError):
+        logger.warning(
+            f"Validation error during {operation}",
+            extra={
+                "errors": e.detail if hasattr(e, "detail") else str(e),
+            },
+        )
+        error = ServiceError(
+            f'Validation error: {e.detail if hasattr(e, "detail") else str(e)}',
+            source=service_name,
+        )
+    else:
+        logger.error(
+            f"Unexpected error during {operation}",
+            extra={
+                "error_type": type(e).__name__,
+                "client": service.client.__class__.__name__,
+                "parser": service.parser.__class__.__name__,
+            },
+            exc_info=True,
+        )
+        error = ServiceError(f"Unexpected error: {str(e)}", source=service_name)
+    return error
 
 
 def handle_service_errors(operation: str, service_name: str) -> Callable:
     """
     Decorator to handle service errors consistently.
 
+    Works for both regular and ``async`` service methods. A
+    ``LeaseLostError`` is raised as is, as it stops the whole refresh.
+
     Args:
         operation: Name of the operation being performed
         service_name: Name of the service for error attribution
     """
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(
+                self: ServiceWrapper, *args: Any, **kwargs: Any
+            ) -> Any:
+                try:
+                    return await func(self, *args, **kwargs)
+                except (ServiceError, LeaseLostError):
+                    raise
+                except Exception as e:
+                    raise _to_service_error(self, e, operation, service_name) from e
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(self: ServiceWrapper, *args: Any, **kwargs: Any) -> Any:
             try:
                 return func(self, *args, **kwargs)
-            except ServiceError:
+            except (ServiceError, LeaseLostError):
                 raise
-            except HTTPClientError as e:
-                logger.error(
-                    f"HTTP error during {operation}",
-                    extra={
-                        "client": self.client.__class__.__name__,
-                        "error": str(e),
-                    },
-                    exc_info=True,
-                )
-                raise ServiceError(
-                    f"HTTP error: {str(e)}",
-                    source=service_name,
-                ) from e
-            except NetworkError as e:
-                logger.error(
-                    f"Network error during {operation}",
-                    extra={
-                        "client": self.client.__class__.__name__,
-                        "error": str(e),
-                    },
-                    exc_info=True,
-                )
-                raise ServiceError(
-                    f"Network error: {str(e)}",
-                    source=service_name,
-                ) from e
-            except ClientError as e:
-                logger.error(
-                    f"Client error during {operation}",
-                    extra={
-                        "client": self.client.__class__.__name__,
-                        "error": str(e),
-                    },
-                    exc_info=True,
-                )
-                raise ServiceError(
-                    f"Client error: {str(e)}",
-                    source=service_name,
-                ) from e
-            except ParserError as e:
-                logger.error(
-                    f"Parser error during {operation}",
-                    extra={
-                        "parser": self.parser.__class__.__name__,
-                        "error": str(e),
-                    },
-                    exc_info=True,
-                )
-                raise ServiceError(
-                    f"Parser error: {str(e)}",
-                    source=service_name,
-                ) from e
-            except serializers.ValidationError as e:
-                logger.warning(
-                    f"Validation error during {operation}",
-                    extra={
-                        "errors": e.detail if hasattr(e, "detail") else str(e),
-                    },
-                )
-                raise ServiceError(
-                    f'Validation error: {e.detail if hasattr(e, "detail") else str(e)}',
-                    source=service_name,
-                ) from e
             except Exception as e:
-                logger.error(
-                    f"Unexpected error during {operation}",
-                    extra={
-                        "error_type": type(e).__name__,
-                        "client": self.client.__class__.__name__,
-                        "parser": self.parser.__class__.__name__,
-                    },
-                    exc_info=True,
-                )
-                raise ServiceError(
-                    f"Unexpected error: {str(e)}",
-                    source=service_name,
-                ) from e
+                raise _to_service_error(self, e, operation, service_name) from e
 
         return wrapper
 
@@ -1,12 +1,34 @@
+import asyncio
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import OuterRef, Q, QuerySet, Subquery
 from django.utils import timezone
-from showings.clients import GrandClient, PrimeClient, TajClient
+from movie_showings.settings import (
+    GRAND_MAX_CONCURRENT_REQUESTS,
+    PRIME_MAX_CONCURRENT_REQUESTS,
+    SCRAPE_MAX_SOURCE_WORKERS,
+    SCRAPE_SOURCES_CONCURRENTLY,
+    TAJ_MAX_CONCURRENT_REQUESTS,
+    TITLE_MATCH_INCREMENTAL,
+)
+from showings.clients import (
+    AsyncGrandClient,
+    AsyncPrimeClient,
+    AsyncTajClient,
+    GrandClient,
+    PrimeClient,
+    TajClient,
+)
+from showings.concurrency import gather_concurrently, run_concurrently
 from showings.errors import ServiceError
-from showings.models import Location, Movie, Showing
-from showings.parsers import GrandParser, PrimeParser, TajParser
+from showings.fingerprints import FingerprintStore
+from showings.models import ActiveShowing, Location, Movie, Showing
+from showings.parsers import get_parser
+from showings.response_cache import bump_showings_version
 from showings.serializers import (
     GrandServiceGetShowingDatesSerializer,
     MovieSerializer,
@@ -14,19 +36,61 @@ from showings.serializers import (
     ShowingServiceTitleSerializer,
 )
 from showings.service_base import ServiceWrapper, handle_service_errors
-from showings.title_matching import TitleMatchService
+from showings.title_matching import SOURCES, TitleMatchService
+from showings.util import get_current_month, get_current_year
 
 logger = logging.getLogger(__name__)
 
+MOVIE_UPSERT_FIELDS = [
+    "title",
+    "grand_id",
+    "prime_id",
+    "taj_id",
+    "grand_title",
+    "prime_title",
+    "taj_title",
+]
+
+saved_showing_fingerprints = FingerprintStore("saved_showings")
+
+# Called with a refresh stage, counts (per source under the source name) and
+# errors by source name.
+ProgressCallback = Callable[[str, Dict[str, Any], Dict[str, str]], None]
+
 
 class ShowingService:
     """Service to coordinate between different cinema services."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        concurrent: bool = SCRAPE_SOURCES_CONCURRENTLY,
+        progress: Optional[ProgressCallback] = None,
+    ):
         self.grand_service = GrandService()
         self.taj_service = TajService()
         self.prime_service = PrimeService()
         self.title_matching_service = TitleMatchService()
+        self.max_source_workers = SCRAPE_MAX_SOURCE_WORKERS if concurrent else 1
+        self.progress = progress
+
+    def _report(
+        self,
+        stage: str,
+        counts: Dict[str, Any],
+        errors: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Report the progress of a refresh to the ``progress`` callback."""
+        if self.progress:
+            self.progress(stage, counts, errors or {})
+
+    async def _areport(
+        self,
+        stage: str,
+        counts: Dict[str, Any],
+        errors: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Async variant of ``_report``; the callback may use the database."""
+        await sync_to_async(self._report)(stage, counts, errors)
 
     @handle_service_errors("refresh_and_save", "ShowingService")
     def refresh_and_save(self) -> tuple[List[Movie], List[Showing]]:
@@ -34,6 +98,7 @@ class ShowingService:
         # Get and save titles
         titles = self._get_and_validate_titles()
         movies = self._save_movies(titles)
+        self._report("movies", {"movies": len(movies)})
 
         # Get and save showings
         all_showings = self._get_all_showings(titles)
@@ -41,28 +106,223 @@ class ShowingService:
 
         return movies, saved_showings
 
+    @handle_service_errors("refresh_source", "ShowingService")
+    def refresh_source(
+        self,
+        source: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> tuple[List[Movie], List[Showing]]:
+        """Refresh one source's showings from ``start`` to ``end`` and save them.
+
+        Only the source's own pages are fetched. Its titles are matched
+        against the saved movies, so the movies keep their other sources'
+        ids, and only the source's showings within the date range can be
+        marked as no longer showing.
+
+        Args:
+            source: The source to refresh: "grand", "taj" or "prime".
+            start: The first date to refresh; defaults to today.
+            end: The last date to refresh; defaults to the last date shown.
+        """
+        service = self._source_service(source)
+        source_titles = service.get_titles()
+        titles_by_source = {s: source_titles if s == source else [] for s in SOURCES}
+        known_titles = self._known_titles(titles_by_source)
+        titles = self.title_matching_service.match_titles_incrementally(
+            titles_by_source["grand"],
+            titles_by_source["prime"],
+            titles_by_source["taj"],
+            known_titles=known_titles,
+        )
+        # Matching only returns this source's titles and ids; keep those of
+        # the other sources, which saving the movies would overwrite.
+        known = {title["normalized_title"]: title for title in known_titles}
+        for title in titles:
+            for key, value in known.get(title["normalized_title"], {}).items():
+                title[key] = title[key] or value
+        self._report(
+            "titles",
+            {source: {"titles": len(source_titles)}, "matched_titles": len(titles)},
+        )
+        title_serializer = ShowingServiceTitleSerializer(data=titles, many=True)
+        title_serializer.is_valid(raise_exception=True)
+
+        movies = self._save_movies(titles)
+        self._report("movies", {"movies": len(movies)})
+
+        showings = service.get_showings(
+            self._filter_titles(titles, f"{source}_id"), start=start, end=end
+        )
+        self._report("showings", {source: {"showings": len(showings)}})
+        showing_serializer = ShowingServiceShowingSerializer(data=showings, many=True)
+        showing_serializer.is_valid(raise_exception=True)
+
+        scope = self._source_showings_filter(source)
+        if start:
+            scope &= Q(date__gte=start)
+        if end:
+            scope &= Q(date__lte=end)
+        saved_showings = self._save_showings(showings, movies, scope=scope)
+
+        return movies, saved_showings
+
+    def _source_service(self, source: str) -> ServiceWrapper:
+        if source not in SOURCES:
+            raise ServiceError(f"Unknown source: {source}", source="ShowingService")
+        return getattr(self, f"{source}_service")
+
+    @staticmethod
+    def _source_showings_filter(source: str) -> Q:
+        """Build a filter matching the saved showings of a source."""
+        if source == "prime":
+            # Prime's cinemas are named on its pages, so its showings are
+            # those at none of the other sources' locations.
+            return ~Q(location__name__in=[GrandService.location, TajService.location])
+        return Q(
+            location__name={"grand": GrandService, "taj": TajService}[source].location
+        )
+
     def _get_and_validate_titles(self) -> List[Dict]:
         """Get titles from all services and validate them."""
-        grand_titles = self.grand_service.get_titles()
-        taj_titles = self.taj_service.get_titles()
-        prime_titles = self.prime_service.get_titles()
-
-        titles = self.title_matching_service.match_titles(
-            grand_titles, taj_titles, prime_titles
+        grand_titles, taj_titles, prime_titles = run_concurrently(
+            [
+                self.grand_service.get_titles,
+                self.taj_service.get_titles,
+                self.prime_service.get_titles,
+            ],
+            max_workers=self.max_source_workers,
         )
 
+        titles = self._match_titles(grand_titles, taj_titles, prime_titles)
+        self._report_titles(grand_titles, taj_titles, prime_titles, titles)
+
         # Validate titles
         title_serializer = ShowingServiceTitleSerializer(data=titles, many=True)
         title_serializer.is_valid(raise_exception=True)
 
         return titles
 
+    def _report_titles(
+        self,
+        grand_titles: List[Dict],
+        taj_titles: List[Dict],
+        prime_titles: List[Dict],
+        titles: List[Dict],
+    ) -> None:
+        self._report(
+            "titles",
+            {
+                "grand": {"titles": len(grand_titles)},
+                "taj": {"titles": len(taj_titles)},
+                "prime": {"titles": len(prime_titles)},
+                "matched_titles": len(titles),
+            },
+        )
+
+    def _match_titles(
+        self, grand_titles: List[Dict], taj_titles: List[Dict], prime_titles: List[Dict]
+    ) -> List[Dict]:
+        """Match the titles of all services.
+
+        With ``TITLE_MATCH_INCREMENTAL``, titles are matched against the
+        saved movies: those whose source id is linked to a movie resolve to
+        it, and only new titles are fuzzy matched.
+        """
+        if not TITLE_MATCH_INCREMENTAL:
+            return self.title_matching_service.match_titles(
+                grand_titles, taj_titles, prime_titles
+            )
+        return self.title_matching_service.match_titles_incrementally(
+            grand_titles,
+            prime_titles,
+            taj_titles,
+            known_titles=self._known_titles(
+                {"grand": grand_titles, "prime": prime_titles, "taj": taj_titles}
+            ),
+        )
+
+    def _known_titles(self, titles: Dict[str, List[Dict]]) -> List[Dict]:
+        """Load the saved movies that source titles can match, as matched titles.
+
+        The movies linked to a source id are looked up through the id
+        indexes. For titles of a source that are not linked, the movies with
+        the same normalized title are loaded, and the movies with active
+        showings but no id from that source, as fuzzy match candidates. So
+        the candidates grow with the movies showing, not with all the movies
+        ever saved.
+        """
+        ids = {
+            source: {title.get(f"{source}_id") for title in titles[source] or []}
+            for source in SOURCES
+        }
+        linked = Q()
+        for source in SOURCES:
+            if ids[source]:
+                linked |= Q(**{f"{source}_id__in": ids[source]})
+        if not linked:
+            return []
+        movies = list(Movie.objects.filter(linked).values())
+
+        linked_ids = {
+            source: {movie[f"{source}_id"] for movie in movies} for source in SOURCES
+        }
+        unlinked_names = set()
+        without_source_id = Q()
+        for source in SOURCES:
+            unlinked_titles = [
+                title
+                for title in titles[source] or []
+                if title.get(f"{source}_id") not in linked_ids[source]
+            ]
+            if unlinked_titles:
+                unlinked_names.update(
+                    self.title_matching_service.normalize_title(title["title"])
+                    for title in unlinked_titles
+                )
+                without_source_id |= Q(**{f"{source}_id__isnull": True}) | Q(
+                    **{f"{source}_id": ""}
+                )
+        if unlinked_names:
+            showing = Showing.objects.filter(
+                is_showing=True, date__gte=timezone.now().date()
+            )
+            candidates = Q(normalized_title__in=unlinked_names) | (
+                without_source_id & Q(id__in=showing.values("movie_id"))
+            )
+            movies += (
+                Movie.objects.filter(candidates)
+                .exclude(id__in=[movie["id"] for movie in movies])
+                .values()
+            )
+
+        return [
+            {
+                "title_grand": movie["grand_title"] or "",
+                "grand_id": movie["grand_id"] or "",
+                "normalized_title": movie["normalized_title"] or "",
+                "title_prime": movie["prime_title"] or "",
+                "prime_id": movie["prime_id"] or "",
+                "title_taj": movie["taj_title"] or "",
+                "taj_id": movie["taj_id"] or "",
+                "title": movie["title"],
+            }
+            for movie in movies
+        ]
+
     def _save_movies(self, titles: List[Dict]) -> List[Movie]:
-        """Save or update movies from titles data."""
-        movies = []
-        for title_data in titles:
-            serializer = MovieSerializer(
-                data={
+        """Save or update movies from titles data.
+
+        All titles are validated together and written with a single upsert
+        keyed on ``normalized_title``; the persisted movies are then loaded
+        back in one query.
+        """
+        if not titles:
+            return []
+
+        serializer = MovieSerializer(
+            data=[
+                {
                     "title": title_data["title"],
                     "grand_id": title_data.get("grand_id"),
                     "prime_id": title_data.get("prime_id"),
@@ -71,47 +331,71 @@ class ShowingService:
                     "prime_title": title_data.get("title_prime"),
                     "taj_title": title_data.get("title_taj"),
                     "normalized_title": title_data["normalized_title"],
-                },
-                partial=True,
+                }
+                for title_data in titles
+            ],
+            many=True,
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+
+        # The last title wins, as with one update_or_create per title.
+        movies_data = {
+            data["normalized_title"]: data for data in serializer.validated_data
+        }
+        with transaction.atomic():
+            Movie.objects.bulk_create(
+                [Movie(**data) for data in movies_data.values()],
+                update_conflicts=True,
+                unique_fields=["normalized_title"],
+                update_fields=[*MOVIE_UPSERT_FIELDS, "updated_at"],
             )
-            serializer.is_valid(raise_exception=True)
-            movie, _ = Movie.objects.update_or_create(
-                normalized_title=title_data["normalized_title"],
-                defaults=serializer.validated_data,
+            movies_dict = Movie.objects.in_bulk(
+                movies_data.keys(), field_name="normalized_title"
             )
-            movies.append(movie)
-        return movies
+            self._rename_active_showings(movies_dict.values())
+            transaction.on_commit(bump_showings_version)
+        return [movies_dict[title_data["normalized_title"]] for title_data in titles]
+
+    @staticmethod
+    def _rename_active_showings(movies: Iterable[Movie]) -> None:
+        """Update the titles of active showings of movies that were renamed."""
+        title = Subquery(Movie.objects.filter(id=OuterRef("movie_id")).values("title"))
+        ActiveShowing.objects.filter(movie__in=list(movies)).exclude(
+            title=title
+        ).update(title=title)
 
     def _get_all_showings(self, titles: List[Dict]) -> List[Dict]:
         """Get showings from all services."""
         all_showings = []
+        sources = [
+            ("Grand Cinema", self.grand_service, "grand_id"),
+            ("Taj Mall", self.taj_service, "taj_id"),
+            ("Prime Mall", self.prime_service, "prime_id"),
+        ]
 
-        # Grand Cinema showings
-        try:
-            grand_showings = self.grand_service.get_showings(
-                self._filter_titles(titles, "grand_id")
-            )
-            all_showings.extend(grand_showings)
-        except Exception as e:
-            logger.error(f"Failed to get Grand Cinema showings: {e}")
-
-        # Taj Mall showings
-        try:
-            taj_showings = self.taj_service.get_showings(
-                self._filter_titles(titles, "taj_id")
-            )
-            all_showings.extend(taj_showings)
-        except Exception as e:
-            logger.error(f"Failed to get Taj Mall showings: {e}")
-
-        # Prime Mall showings
-        try:
-            prime_showings = self.prime_service.get_showings(
-                self._filter_titles(titles, "prime_id")
-            )
-            all_showings.extend(prime_showings)
-        except Exception as e:
-            logger.error(f"Failed to get Prime Mall showings: {e}")
+        # Each source runs in isolation: a failing cinema is logged and
+        # skipped without affecting the others.
+        results = run_concurrently(
+            [
+                lambda service=service, id_name=id_name: service.get_showings(
+                    self._filter_titles(titles, id_name)
+                )
+                for _, service, id_name in sources
+            ],
+            max_workers=self.max_source_workers,
+            return_exceptions=True,
+        )
+        counts, errors = {}, {}
+        for (name, _, id_name), result in zip(sources, results):
+            source = id_name.removesuffix("_id")
+            if isinstance(result, Exception):
+                logger.error(f"Failed to get {name} showings: {result}")
+                errors[source] = str(result)
+            else:
+                all_showings.extend(result)
+                counts[source] = {"showings": len(result)}
+        self._report("showings", counts, errors)
 
         # Validate showings
         showing_serializer = ShowingServiceShowingSerializer(
@@ -121,93 +405,376 @@ class ShowingService:
 
         return all_showings
 
+    @handle_service_errors("refresh_and_save", "ShowingService")
+    async def arefresh_and_save(self) -> tuple[List[Movie], List[Showing]]:
+        """Async variant of ``refresh_and_save``.
+
+        Requests run on the event loop; parsing and database writes run in a
+        thread.
+        """
+        titles = await self._aget_and_validate_titles()
+        movies = await sync_to_async(self._save_movies)(titles)
+        await self._areport("movies", {"movies": len(movies)})
+
+        all_showings = await self._aget_all_showings(titles)
+        saved_showings = await sync_to_async(
+            lambda: list(self._save_showings(all_showings, movies))
+        )()
+
+        return movies, saved_showings
+
+    async def _aget_and_validate_titles(self) -> List[Dict]:
+        """Async variant of ``_get_and_validate_titles``."""
+        grand_titles, taj_titles, prime_titles = await asyncio.gather(
+            self.grand_service.aget_titles(),
+            self.taj_service.aget_titles(),
+            self.prime_service.aget_titles(),
+        )
+
+        titles = await sync_to_async(self._match_titles)(
+            grand_titles, taj_titles, prime_titles
+        )
+        await sync_to_async(self._report_titles)(
+            grand_titles, taj_titles, prime_titles, titles
+        )
+
+        title_serializer = ShowingServiceTitleSerializer(data=titles, many=True)
+        title_serializer.is_valid(raise_exception=True)
+
+        return titles
+
+    async def _aget_all_showings(self, titles: List[Dict]) -> List[Dict]:
+        """Async variant of ``_get_all_showings``."""
+        all_showings = []
+        sources = [
+            ("Grand Cinema", self.grand_service, "grand_id"),
+            ("Taj Mall", self.taj_service, "taj_id"),
+            ("Prime Mall", self.prime_service, "prime_id"),
+        ]
+
+        async def get_showings(service, id_name):
+            return await service.aget_showings(self._filter_titles(titles, id_name))
+
+        results = await asyncio.gather(
+            *(get_showings(service, id_name) for _, service, id_name in sources),
+            return_exceptions=True,
+        )
+        counts, errors = {}, {}
+        for (name, _, id_name), result in zip(sources, results):
+            source = id_name.removesuffix("_id")
+            if isinstance(result, Exception):
+                logger.error(f"Failed to get {name} showings: {result}")
+                errors[source] = str(result)
+            else:
+                all_showings.extend(result)
+                counts[source] = {"showings": len(result)}
+        await self._areport("showings", counts, errors)
+
+        showing_serializer = ShowingServiceShowingSerializer(
+            data=all_showings, many=True
+        )
+        showing_serializer.is_valid(raise_exception=True)
+
+        return all_showings
+
     def _save_showings(
-        self, showings: List[Dict], movies: List[Movie]
+        self, showings: List[Dict], movies: List[Movie], scope: Optional[Q] = None
     ) -> List[Showing]:
-        """Save or update showings."""
-        current_showings = set()
-        showings_to_create = []
-        showings_to_update = []
+        """Save or update showings.
+
+        Showings are grouped per (location, title). A group identical to the
+        one saved by the previous refresh is already in the database, so it
+        is neither rewritten nor swept.
 
+        Args:
+            showings: The showings to save.
+            movies: The saved movies of the showings' titles.
+            scope: Restricts which saved showings the refresh covers, e.g.
+                one source's showings over a date range; only those can be
+                marked as no longer showing. Group fingerprints cover all
+                of a group's showings, so a scoped save does not use them,
+                and invalidates those of the groups it changes.
+        """
         # Get all movies in one query
         movies_dict = {m.normalized_title: m for m in movies}
 
-        for showing_data in showings:
-            try:
-                showing = self._process_showing(showing_data, movies_dict)
-                if showing:
-                    if hasattr(showing, "id"):
-                        showings_to_update.append(showing)
+        groups = self._group_showings(showings)
+        unchanged_groups = [
+            key
+            for key, group in groups.items()
+            if scope is None
+            and saved_showing_fingerprints.get(self._group_key(key), group)[0]
+        ]
+        changed_groups = {
+            key: group for key, group in groups.items() if key not in unchanged_groups
+        }
+        # Groups with showings that were not saved, e.g. of movies not found.
+        incomplete_groups = set()
+
+        # Get or create all locations in two queries
+        locations_dict = self._get_or_create_locations(
+            {s["location"] for group in changed_groups.values() for s in group}
+        )
+
+        incoming = {}
+        for key, group in changed_groups.items():
+            for showing_data in group:
+                try:
+                    showing = self._process_showing(
+                        showing_data, movies_dict, locations_dict
+                    )
+                    if showing:
+                        incoming[self._showing_key(showing)] = showing
                     else:
-                        showings_to_create.append(showing)
-                    current_showings.add(showing.id if hasattr(showing, "id") else None)
-            except Exception as e:
-                logger.error(f"Error processing showing: {showing_data}, error: {e}")
-                continue
+                        incomplete_groups.add(key)
+                except Exception as e:
+                    logger.error(
+                        f"Error processing showing: {showing_data}, error: {e}"
+                    )
+                    incomplete_groups.add(key)
+                    continue
 
-        # Perform bulk operations
-        if showings_to_create:
-            created_showings = Showing.objects.bulk_create(showings_to_create)
-            current_showings.update(s.id for s in created_showings)
+        # Active showings are patched in the same transaction, so they never
+        # differ from the saved showings.
+        with transaction.atomic():
+            current_showings, written_showings = self._upsert_showings(incoming)
 
-        if showings_to_update:
-            Showing.objects.bulk_update(
-                showings_to_update, fields=["is_showing", "url"]
+            # Mark all showings not in the current batch as not showing
+            unchanged = self._showing_groups_filter(unchanged_groups, movies_dict)
+            stale_showings = Showing.objects.filter(
+                date__gte=timezone.now().date(), is_showing=True
+            ).exclude(id__in=current_showings)
+            if unchanged:
+                stale_showings = stale_showings.exclude(unchanged)
+            if scope is not None:
+                stale_showings = stale_showings.filter(scope)
+            stale = list(
+                stale_showings.values_list(
+                    "id", "location__name", "movie__normalized_title"
+                )
             )
+            stale_showings.update(is_showing=False)
 
-        # Mark all showings not in the current batch as not showing
-        Showing.objects.filter(
-            date__gte=timezone.now().date(), is_showing=True
-        ).exclude(id__in=current_showings).update(is_showing=False)
+            self._patch_active_showings(
+                written_showings, [showing_id for showing_id, _, _ in stale]
+            )
+            transaction.on_commit(bump_showings_version)
+
+        if scope is not None:
+            written_groups = {
+                (showing.location.name, showing.movie.normalized_title)
+                for showing in written_showings
+            }
+            swept_groups = {(location, title) for _, location, title in stale}
+            for key in written_groups | swept_groups:
+                saved_showing_fingerprints.delete(self._group_key(key))
+        else:
+            for key, group in changed_groups.items():
+                if key in incomplete_groups:
+                    saved_showing_fingerprints.delete(self._group_key(key))
+                else:
+                    saved_showing_fingerprints.set(self._group_key(key), group)
 
         # Return all current showings
-        return Showing.objects.filter(id__in=current_showings)
+        current = Q(id__in=current_showings)
+        if unchanged:
+            current |= unchanged & Q(is_showing=True)
+        return Showing.objects.filter(current)
+
+    @staticmethod
+    def _group_showings(showings: List[Dict]) -> Dict[Tuple[str, str], List[Dict]]:
+        """Group showings by (location, title), in a stable order."""
+        groups = {}
+        for showing_data in showings:
+            key = (showing_data["location"], showing_data["title"])
+            groups.setdefault(key, []).append(showing_data)
+        return {
+            key: sorted(group, key=lambda s: (s["date"], s["time"], s.get("url") or ""))
+            for key, group in groups.items()
+        }
+
+    @staticmethod
+    def _group_key(key: Tuple[str, str]) -> str:
+        location, title = key
+        return f"{location}:{title}"
+
+    @staticmethod
+    def _showing_groups_filter(
+        groups: List[Tuple[str, str]], movies_dict: Dict[str, Movie]
+    ) -> Optional[Q]:
+        """Build a filter matching the showings of the given groups."""
+        condition = None
+        for location, title in groups:
+            movie = movies_dict.get(title)
+            if not movie:
+                continue
+            group_condition = Q(movie=movie, location__name=location)
+            condition = (
+                group_condition if condition is None else condition | group_condition
+            )
+        return condition
+
+    @staticmethod
+    def _get_or_create_locations(names: Set[str]) -> Dict[str, Location]:
+        """Load locations by name, creating the missing ones in bulk."""
+        locations_dict = {}
+        for location in Location.objects.filter(name__in=names):
+            locations_dict.setdefault(location.name, location)
+        missing = names - locations_dict.keys()
+        if missing:
+            Location.objects.bulk_create(
+                [
+                    Location(name=name, city="Amman", address="Default Address")
+                    for name in missing
+                ],
+                ignore_conflicts=True,
+            )
+            for location in Location.objects.filter(name__in=missing):
+                locations_dict.setdefault(location.name, location)
+        return locations_dict
+
+    @staticmethod
+    def _showing_key(showing: Showing) -> Tuple:
+        """The ``unique_showing`` key of a showing."""
+        return (showing.movie_id, showing.location_id, showing.date, showing.time)
+
+    def _upsert_showings(
+        self, incoming: Dict[Tuple, Showing]
+    ) -> Tuple[Set[int], List[Showing]]:
+        """Insert or update showings in bulk, keyed on ``unique_showing``.
+
+        Existing rows are prefetched in one query, so rows that would not
+        change are not written. The rest are written with a single
+        ``INSERT ... ON CONFLICT DO UPDATE``.
+
+        Returns:
+            A ``(ids, written)`` tuple: the ids of all incoming showings,
+            and the showings that were written.
+        """
+        if not incoming:
+            return set(), []
+
+        existing = self._fetch_showings(incoming.keys())
+        current_showings = set()
+        showings_to_write = []
+        for key, showing in incoming.items():
+            saved = existing.get(key)
+            if saved and saved.is_showing and saved.url == showing.url:
+                current_showings.add(saved.id)
+            else:
+                showings_to_write.append(showing)
+
+        if showings_to_write:
+            Showing.objects.bulk_create(
+                showings_to_write,
+                update_conflicts=True,
+                unique_fields=["movie", "location", "date", "time"],
+                update_fields=["is_showing", "url", "updated_at"],
+            )
+            if any(s.id is None for s in showings_to_write):
+                # The backend does not return the ids of upserted rows.
+                written = self._fetch_showings(
+                    self._showing_key(s) for s in showings_to_write
+                )
+                for showing in showings_to_write:
+                    showing.id = written[self._showing_key(showing)].id
+            current_showings.update(s.id for s in showings_to_write)
+        return current_showings, showings_to_write
+
+    @staticmethod
+    def _active_showing(showing: Showing) -> ActiveShowing:
+        return ActiveShowing(
+            id=showing.id,
+            movie_id=showing.movie_id,
+            location_id=showing.location_id,
+            title=showing.movie.title,
+            location_name=showing.location.name,
+            date=showing.date,
+            time=showing.time,
+            url=showing.url,
+        )
+
+    def _patch_active_showings(
+        self, written: List[Showing], removed_ids: Iterable[int]
+    ) -> None:
+        """Apply saved showings to the active showings.
+
+        Args:
+            written: The showings that were written, all of them showing.
+            removed_ids: The ids of the showings no longer showing.
+        """
+        ActiveShowing.objects.filter(
+            Q(id__in=removed_ids) | Q(date__lt=timezone.now().date())
+        ).delete()
+        ActiveShowing.objects.bulk_create(
+            [self._active_showing(showing) for showing in written],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["title", "location_name", "url"],
+        )
+
+    def rebuild_active_showings(self) -> int:
+        """Rebuild the active showings from the saved showings.
+
+        Saves keep the active showings in sync; this repairs them after
+        showings are written by other means.
+
+        Returns:
+            The number of active showings.
+        """
+        showings = self.get_active_showings()
+        with transaction.atomic():
+            ActiveShowing.objects.all().delete()
+            active_showings = ActiveShowing.objects.bulk_create(
+                self._active_showing(showing) for showing in showings.iterator()
+            )
+            transaction.on_commit(bump_showings_version)
+        return len(active_showings)
+
+    def _fetch_showings(self, keys: Iterable[Tuple]) -> Dict[Tuple, Showing]:
+        """Load the showings with the given ``unique_showing`` keys in one query."""
+        keys = set(keys)
+        showings = Showing.objects.filter(
+            movie_id__in={key[0] for key in keys},
+            location_id__in={key[1] for key in keys},
+            date__in={key[2] for key in keys},
+        ).only("id", "movie_id", "location_id", "date", "time", "is_showing", "url")
+        return {
+            self._showing_key(showing): showing
+            for showing in showings
+            if self._showing_key(showing) in keys
+        }
 
     def _process_showing(
-        self, showing_data: Dict, movies_dict: Dict[str, Movie]
+        self,
+        showing_data: Dict,
+        movies_dict: Dict[str, Movie],
+        locations_dict: Dict[str, Location],
     ) -> Optional[Showing]:
-        """Process a single showing and return a Showing instance."""
+        """Process a single showing and return an unsaved Showing instance."""
         movie = movies_dict.get(showing_data["title"])
         if not movie:
             logger.warning(f"Movie not found for showing: {showing_data}")
             return None
 
-        location, _ = Location.objects.get_or_create(
-            name=showing_data["location"],
-            defaults={"city": "Amman", "address": "Default Address"},
-        )
+        location = locations_dict[showing_data["location"]]
 
         # Parse date and time
-        date = datetime.strptime(showing_data["date"], "%Y-%m-%d").date()
-        time = datetime.strptime(showing_data["time"], "%H:%M").time()
+        showing_date = datetime.strptime(showing_data["date"], "%Y-%m-%d").date()
+        showing_time = datetime.strptime(showing_data["time"], "%H:%M").time()
 
         # Only process future dates
-        if date < timezone.now().date():
+        if showing_date < timezone.now().date():
             return None
 
-        showing_data = {
-            "movie": movie,
-            "location": location,
-            "date": date,
-            "time": time,
-            "is_showing": True,
-            "url": showing_data.get("url"),
-        }
-
-        try:
-            showing = Showing.objects.get(
-                movie=movie,
-                location=location,
-                date=date,
-                time=time,
-            )
-            # Update existing showing
-            for key, value in showing_data.items():
-                setattr(showing, key, value)
-            return showing
-        except Showing.DoesNotExist:
-            # Create new showing
-            return Showing(**showing_data)
+        return Showing(
+            movie=movie,
+            location=location,
+            date=showing_date,
+            time=showing_time,
+            is_showing=True,
+            url=showing_data.get("url"),
+        )
 
     @staticmethod
     def _filter_titles(titles: List[Dict], id_name: str) -> List[Dict]:
@@ -220,6 +787,41 @@ class ShowingService:
             is_showing=True, date__gte=timezone.now().date()
         ).select_related("movie", "location")
 
+    def filter_active_showings(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        movie_id: Optional[int] = None,
+        location_id: Optional[int] = None,
+        time_from: Optional[time] = None,
+        time_to: Optional[time] = None,
+    ) -> QuerySet:
+        """Get the active showings matching the given filters.
+
+        Reads the active showings table, so the showings' movie titles and
+        location names need no joins.
+
+        Args:
+            start: The first date; dates before today are never active.
+            end: The last date.
+            movie_id: Only the showings of this movie.
+            location_id: Only the showings at this location.
+            time_from: The earliest time of day.
+            time_to: The latest time of day.
+        """
+        today = timezone.now().date()
+        filters = {
+            "date__gte": max(start, today) if start else today,
+            "date__lte": end,
+            "movie_id": movie_id,
+            "location_id": location_id,
+            "time__gte": time_from,
+            "time__lte": time_to,
+        }
+        return ActiveShowing.objects.filter(
+            **{key: value for key, value in filters.items() if value is not None}
+        )
+
     def get_showings_by_date(self, date: datetime.date) -> List[Showing]:
         """Get all showings for a specific date."""
         return Showing.objects.filter(date=date, is_showing=True).select_related(
@@ -249,117 +851,329 @@ class ShowingService:
 
 class GrandService(ServiceWrapper):
     client = GrandClient
-    parser = GrandParser
+    async_client = AsyncGrandClient
+    parser = get_parser("grand")
+    location = "Grand Cinema City Mall"
 
-    def __init__(self):
-        super().__init__(self.client, self.parser)
+    def __init__(self, max_concurrent_requests: int = GRAND_MAX_CONCURRENT_REQUESTS):
+        super().__init__(self.client, self.parser, self.async_client)
+        self.max_concurrent_requests = max_concurrent_requests
 
     @handle_service_errors("get_showings", "GrandService")
-    def get_showings(self, titles: Optional[list] = None) -> list:
-        showings = []
+    def get_showings(
+        self,
+        titles: Optional[list] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> list:
+        """Get the showings of titles, on the dates from ``start`` to ``end``.
+
+        Times are only requested for the dates within the range.
+        """
         if titles is None:
             titles = self.get_titles()
-        for title in titles:
-            showing_dates = self.get_showing_dates(title)
-            for date in showing_dates:
-                showing_times = self.get_showing_times(title, date)
-                for time in showing_times:
-                    showings.append(
-                        {
-                            "title": title.get("title"),
-                            "date": date,
-                            "time": time,
-                            "location": "Grand Cinema City Mall",
-                        }
-                    )
-        return showings
+
+        # Fan out one dates request per title, then one times request per
+        # (title, date), keeping results in title/date order.
+        titles_dates = run_concurrently(
+            [lambda title=title: self.get_showing_dates(title) for title in titles],
+            max_workers=self.max_concurrent_requests,
+        )
+        title_dates = self._title_dates(titles, titles_dates, start, end)
+        title_dates_times = run_concurrently(
+            [
+                lambda title=title, date=date: self.get_showing_times(title, date)
+                for title, date in title_dates
+            ],
+            max_workers=self.max_concurrent_requests,
+        )
+        return self._showings(title_dates, title_dates_times)
 
     @handle_service_errors("get_titles", "GrandService")
     def get_titles(self) -> list:
-        titles_page = self.client.get_titles_page()
-        titles = self.parser.parse_titles_from_titles_page(titles_page)
-        return titles
+        return self._parse_titles(self.client.get_titles_page())
 
     @handle_service_errors("get_showing_dates", "GrandService")
     def get_showing_dates(self, title: Dict[str, Any]) -> list:
-        title_id = title.get("grand_id")
-        serializer = GrandServiceGetShowingDatesSerializer(data={"grand_id": title_id})
-        serializer.is_valid(raise_exception=True)
+        title_id = self._title_id(title)
         showing_dates_page = self.client.get_title_showing_dates(title_id)
-        showing_dates = self.parser.parse_showing_dates(showing_dates_page)
-        return showing_dates
+        return self._parse_showing_dates(title_id, showing_dates_page)
 
     @handle_service_errors("get_showing_times", "GrandService")
     def get_showing_times(self, title: Dict[str, Any], date: str) -> list:
         title_id = title.get("grand_id")
         showing_times_page = self.client.get_title_showing_times_on_date(title_id, date)
-        showing_times = self.parser.parse_showing_times(showing_times_page)
-        return showing_times
+        return self._parse_showing_times(title_id, date, showing_times_page)
+
+    @handle_service_errors("get_showings", "GrandService")
+    async def aget_showings(
+        self,
+        titles: Optional[list] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> list:
+        """Async variant of ``get_showings``."""
+        if titles is None:
+            titles = await self.aget_titles()
+
+        titles_dates = await gather_concurrently(
+            [lambda title=title: self.aget_showing_dates(title) for title in titles],
+            max_concurrency=self.max_concurrent_requests,
+        )
+        title_dates = self._title_dates(titles, titles_dates, start, end)
+        title_dates_times = await gather_concurrently(
+            [
+                lambda title=title, date=date: self.aget_showing_times(title, date)
+                for title, date in title_dates
+            ],
+            max_concurrency=self.max_concurrent_requests,
+        )
+        return self._showings(title_dates, title_dates_times)
+
+    @handle_service_errors("get_titles", "GrandService")
+    async def aget_titles(self) -> list:
+        titles_page = await self.async_client.get_titles_page()
+        return await sync_to_async(self._parse_titles)(titles_page)
+
+    @handle_service_errors("get_showing_dates", "GrandService")
+    async def aget_showing_dates(self, title: Dict[str, Any]) -> list:
+        title_id = self._title_id(title)
+        showing_dates_page = await self.async_client.get_title_showing_dates(title_id)
+        return await sync_to_async(self._parse_showing_dates)(
+            title_id, showing_dates_page
+        )
+
+    @handle_service_errors("get_showing_times", "GrandService")
+    async def aget_showing_times(self, title: Dict[str, Any], date: str) -> list:
+        title_id = title.get("grand_id")
+        showing_times_page = await self.async_client.get_title_showing_times_on_date(
+            title_id, date
+        )
+        return await sync_to_async(self._parse_showing_times)(
+            title_id, date, showing_times_page
+        )
+
+    @staticmethod
+    def _title_id(title: Dict[str, Any]) -> str:
+        title_id = title.get("grand_id")
+        serializer = GrandServiceGetShowingDatesSerializer(data={"grand_id": title_id})
+        serializer.is_valid(raise_exception=True)
+        return title_id
+
+    def _parse_titles(self, titles_page: bytes) -> list:
+        return self.parse_page(
+            titles_page, "grand:titles", self.parser.parse_titles_from_titles_page
+        )
+
+    def _parse_showing_dates(self, title_id: str, showing_dates_page: bytes) -> list:
+        return self.parse_page(
+            showing_dates_page,
+            f"grand:dates:{title_id}",
+            self.parser.parse_showing_dates,
+        )
+
+    def _parse_showing_times(
+        self, title_id: str, date: str, showing_times_page: bytes
+    ) -> list:
+        return self.parse_page(
+            showing_times_page,
+            f"grand:times:{title_id}:{date}",
+            self.parser.parse_showing_times,
+        )
+
+    def _title_dates(
+        self,
+        titles: list,
+        titles_dates: List[list],
+        start: Optional[date],
+        end: Optional[date],
+    ) -> List[Tuple[Dict[str, Any], str]]:
+        """Pair each title with its showing dates within ``[start, end]``."""
+        return [
+            (title, date)
+            for title, dates in zip(titles, titles_dates)
+            for date in dates
+            if self.in_date_range(date, start, end)
+        ]
+
+    def _showings(
+        self,
+        title_dates: List[Tuple[Dict[str, Any], str]],
+        title_dates_times: List[list],
+    ) -> list:
+        showings = []
+        for (title, date), showing_times in zip(title_dates, title_dates_times):
+            for time in showing_times:
+                showings.append(
+                    {
+                        "title": title.get("title"),
+                        "date": date,
+                        "time": time,
+                        "location": self.location,
+                    }
+                )
+        return showings
 
 
 class TajService(ServiceWrapper):
     client = TajClient
-    parser = TajParser
+    async_client = AsyncTajClient
+    parser = get_parser("taj")
+    location = "Taj Mall"
 
-    def __init__(self):
-        super().__init__(self.client, self.parser)
+    def __init__(self, max_concurrent_requests: int = TAJ_MAX_CONCURRENT_REQUESTS):
+        super().__init__(self.client, self.parser, self.async_client)
+        self.max_concurrent_requests = max_concurrent_requests
 
     @handle_service_errors("get_showings", "TajService")
-    def get_showings(self, titles: Optional[list] = None) -> list:
-        showings = []
+    def get_showings(
+        self,
+        titles: Optional[list] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> list:
         titles = self.get_titles()
-        for t in titles:
-            showings += self.get_title_showings(t)
-        return showings
+        titles_showings = run_concurrently(
+            [lambda title=title: self.get_title_showings(title) for title in titles],
+            max_workers=self.max_concurrent_requests,
+        )
+        return self.showings_in_date_range(titles_showings, start, end)
 
     @handle_service_errors("get_titles", "TajService")
     def get_titles(self) -> list:
-        titles_page = self.client.get_titles_page()
-        titles = self.parser.parse_titles_from_titles_page(titles_page)
-        return titles
+        return self._parse_titles(self.client.get_titles_page())
 
     @handle_service_errors("get_title_showings", "TajService")
     def get_title_showings(self, title: Dict[str, Any]) -> list:
-        title_showings = []
         title_page = self.client.get_title_showings_page(title)
-        parsed_dates = self.parser.parse_showing_dates_from_title_page(title_page)
-        parsed_times = self.parser.parse_showing_times_from_title_page(
-            title_page, parsed_dates
+        return self._title_showings(title, title_page)
+
+    @handle_service_errors("get_showings", "TajService")
+    async def aget_showings(
+        self,
+        titles: Optional[list] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> list:
+        """Async variant of ``get_showings``."""
+        titles = await self.aget_titles()
+        titles_showings = await gather_concurrently(
+            [lambda title=title: self.aget_title_showings(title) for title in titles],
+            max_concurrency=self.max_concurrent_requests,
+        )
+        return self.showings_in_date_range(titles_showings, start, end)
+
+    @handle_service_errors("get_titles", "TajService")
+    async def aget_titles(self) -> list:
+        titles_page = await self.async_client.get_titles_page()
+        return await sync_to_async(self._parse_titles)(titles_page)
+
+    @handle_service_errors("get_title_showings", "TajService")
+    async def aget_title_showings(self, title: Dict[str, Any]) -> list:
+        title_page = await self.async_client.get_title_showings_page(title)
+        return await sync_to_async(self._title_showings)(title, title_page)
+
+    def _parse_titles(self, titles_page: bytes) -> list:
+        return self.parse_page(
+            titles_page, "taj:titles", self.parser.parse_titles_from_titles_page
+        )
+
+    def _title_showings(self, title: Dict[str, Any], title_page: bytes) -> list:
+        title_showings = []
+        parsed_times = self.parse_page(
+            title_page, self._title_page_name(title), self._parse_title_page
         )
         for t in parsed_times:
             t["title"] = title["title"]
-            t["location"] = "Taj Mall"
+            t["location"] = self.location
             del t["date_id"]
             title_showings.append(t)
         return title_showings
 
+    @staticmethod
+    def _title_page_name(title: Dict[str, Any]) -> str:
+        # Title pages only show the day of the month; the parser takes the
+        # year and month from today, so a parse is only reusable within them.
+        month = f"{get_current_year()}-{get_current_month()}"
+        return f"taj:title:{title['taj_id']}:{month}"
+
+    def _parse_title_page(self, title_page: bytes) -> list:
+        _, parsed_times = self.parser.parse_showings_from_title_page(title_page)
+        return parsed_times
+
 
 class PrimeService(ServiceWrapper):
     client = PrimeClient
-    parser = PrimeParser
+    async_client = AsyncPrimeClient
+    parser = get_parser("prime")
 
-    def __init__(self):
-        super().__init__(self.client, self.parser)
+    def __init__(self, max_concurrent_requests: int = PRIME_MAX_CONCURRENT_REQUESTS):
+        super().__init__(self.client, self.parser, self.async_client)
+        self.max_concurrent_requests = max_concurrent_requests
 
     @handle_service_errors("get_showings", "PrimeService")
-    def get_showings(self, titles: Optional[list] = None) -> list:
-        showings = []
+    def get_showings(
+        self,
+        titles: Optional[list] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> list:
         if titles is None:
             titles = self.get_titles()
-        for title in titles:
-            showings += self.get_title_showings(title)
-        return showings
+        titles_showings = run_concurrently(
+            [lambda title=title: self.get_title_showings(title) for title in titles],
+            max_workers=self.max_concurrent_requests,
+        )
+        return self.showings_in_date_range(titles_showings, start, end)
 
     @handle_service_errors("get_titles", "PrimeService")
     def get_titles(self) -> list:
-        titles_page = self.client.get_titles_page()
-        titles = self.parser.parse_titles_from_titles_page(titles_page)
-        return titles
+        return self._parse_titles(self.client.get_titles_page())
 
     @handle_service_errors("get_title_showings", "PrimeService")
     def get_title_showings(self, title: Dict[str, Any]) -> list:
         title_showings_page = self.client.get_title_showings_page(title)
-        showings = self.parser.parse_showings_from_title_page(title_showings_page)
+        return self._title_showings(title, title_showings_page)
+
+    @handle_service_errors("get_showings", "PrimeService")
+    async def aget_showings(
+        self,
+        titles: Optional[list] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> list:
+        """Async variant of ``get_showings``."""
+        if titles is None:
+            titles = await self.aget_titles()
+        titles_showings = await gather_concurrently(
+            [lambda title=title: self.aget_title_showings(title) for title in titles],
+            max_concurrency=self.max_concurrent_requests,
+        )
+        return self.showings_in_date_range(titles_showings, start, end)
+
+    @handle_service_errors("get_titles", "PrimeService")
+    async def aget_titles(self) -> list:
+        titles_page = await self.async_client.get_titles_page()
+        return await sync_to_async(self._parse_titles)(titles_page)
+
+    @handle_service_errors("get_title_showings", "PrimeService")
+    async def aget_title_showings(self, title: Dict[str, Any]) -> list:
+        title_showings_page = await self.async_client.get_title_showings_page(title)
+        return await sync_to_async(self._title_showings)(title, title_showings_page)
+
+    def _parse_titles(self, titles_page: bytes) -> list:
+        return self.parse_page(
+            titles_page, "prime:titles", self.parser.parse_titles_from_titles_page
+        )
+
+    def _title_showings(
+        self, title: Dict[str, Any], title_showings_page: bytes
+    ) -> list:
+        showings = self.parse_page(
+            title_showings_page,
+            f"prime:title:{title['prime_id']}",
+            self.parser.parse_showings_from_title_page,
+        )
         showings = [
             {
                 "title": title["prime_id"],
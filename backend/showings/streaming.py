@@ -0,0 +1,51 @@
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+from showings.renderers import FastJSONRenderer
+
+
+class IncrementalJSONEncoder:
+    """Encodes JSON piece by piece, as a JSON renderer renders it whole.
+
+    Values are encoded by the renderer (``FastJSONRenderer`` by default),
+    so streamed documents are byte-identical to rendered ones.
+    """
+
+    def __init__(self, renderer: Optional[JSONRenderer] = None):
+        self.renderer = renderer or FastJSONRenderer()
+        separators = SHORT_SEPARATORS if self.renderer.compact else LONG_SEPARATORS
+        self.item_separator, self.key_separator = (s.encode() for s in separators)
+
+    def encode(self, value: Any) -> bytes:
+        # Renderers render None as an empty body rather than null.
+        return b"null" if value is None else self.renderer.render(value)
+
+    def iter_object(
+        self, fields: Dict[str, Any], key: str, items: Iterable[Any], chunk_size: int
+    ) -> Iterator[bytes]:
+        """Encode an object whose ``key`` holds a list, streaming the list.
+
+        The object is ``fields``, then ``key`` with the encoded ``items``, then
+        a "count" of the items, which is only known once they are all
+        encoded. Items are yielded ``chunk_size`` at a time.
+        """
+        head = [
+            self.encode(name) + self.key_separator + self.encode(value)
+            for name, value in fields.items()
+        ]
+        head.append(self.encode(key) + self.key_separator + b"[")
+        yield b"{" + self.item_separator.join(head)
+
+        count, chunk, separator = 0, [], b""
+        for item in items:
+            chunk.append(self.encode(item))
+            count += 1
+            if len(chunk) == chunk_size:
+                yield separator + self.item_separator.join(chunk)
+                chunk, separator = [], self.item_separator
+        if chunk:
+            yield separator + self.item_separator.join(chunk)
+
+        count_field = self.encode("count") + self.key_separator + self.encode(count)
+        yield b"]" + self.item_separator + count_field + b"}"
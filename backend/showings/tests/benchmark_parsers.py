@@ -0,0 +1,135 @@
+"""Compare the bs4 and lxml parser backends on the recorded cinema pages.
+
+Also compares full and partial parsing (PARSER_PARTIAL_PARSING) of the
+titles pages by time and by peak memory. Peak memory is measured with
+tracemalloc, which only sees the Python heap: it covers the whole bs4 tree
+but not the C-level tree lxml builds.
+
+Run from the backend directory:
+
+    python -m showings.tests.benchmark_parsers [repeat]
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+from unittest.mock import patch
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "movie_showings.settings")
+django.setup()
+
+from showings.parsers import TajParser, get_parser  # noqa: E402
+from showings.tests.test_parsers import load_test_data  # noqa: E402
+
+
+def build_cases():
+    """Return (source, method, args) for every fixture page."""
+    taj_title_page = load_test_data("taj_title_showings_page.html")
+    taj_dates = TajParser.parse_showing_dates_from_title_page(taj_title_page)
+    return [
+        (
+            "grand",
+            "parse_titles_from_titles_page",
+            (load_test_data("grand_titles_page.html"),),
+        ),
+        (
+            "grand",
+            "parse_showing_dates",
+            (load_test_data("grand_title_showing_dates_page.html"),),
+        ),
+        (
+            "grand",
+            "parse_showing_times",
+            (load_test_data("grand_title_showing_times_page.html"),),
+        ),
+        (
+            "taj",
+            "parse_titles_from_titles_page",
+            (load_test_data("taj_titles_page.html"),),
+        ),
+        ("taj", "parse_showing_dates_from_title_page", (taj_title_page,)),
+        ("taj", "parse_showing_times_from_title_page", (taj_title_page, taj_dates)),
+        ("taj", "parse_showings_from_title_page", (taj_title_page,)),
+        (
+            "prime",
+            "parse_titles_from_titles_page",
+            (load_test_data("prime_titles_page.html"),),
+        ),
+        (
+            "prime",
+            "parse_showings_from_title_page",
+            (load_test_data("prime_title_showings_page.html"),),
+        ),
+    ]
+
+
+def time_call(func, repeat: int) -> float:
+    """Return the best per-call time of ``func`` in milliseconds."""
+    runs = timeit.repeat(func, number=repeat, repeat=5)
+    return min(runs) / repeat * 1000
+
+
+def peak_memory(func) -> float:
+    """Return the peak Python heap allocated by one call, in KiB."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def compare_backends(repeat: int):
+    print(f"{'page':<50} {'bs4 ms':>8} {'lxml ms':>8} {'speedup':>8}")
+    totals = {"bs4": 0.0, "lxml": 0.0}
+    for source, method, args in build_cases():
+        timings = {}
+        for backend in totals:
+            parse = getattr(get_parser(source, backend), method)
+            timings[backend] = time_call(lambda: parse(*args), repeat)
+            totals[backend] += timings[backend]
+        print(
+            f"{source + '.' + method:<50} "
+            f"{timings['bs4']:>8.3f} "
+            f"{timings['lxml']:>8.3f} "
+            f"{timings['bs4'] / timings['lxml']:>7.1f}x"
+        )
+    print(f"{'total':<50} {'':>8} {'':>8} {totals['bs4'] / totals['lxml']:>7.1f}x")
+
+
+def compare_partial_parsing(repeat: int):
+    print(
+        f"{'titles page':<20} {'full ms':>9} {'part. ms':>9} "
+        f"{'full KiB':>9} {'part. KiB':>9}"
+    )
+    for source in ("taj", "prime"):
+        titles_page = load_test_data(f"{source}_titles_page.html")
+        for backend in ("bs4", "lxml"):
+            parse = get_parser(source, backend).parse_titles_from_titles_page
+            results = []
+            for partial in (False, True):
+                with patch("showings.parsers.PARSER_PARTIAL_PARSING", partial):
+                    results.append(
+                        (
+                            time_call(lambda: parse(titles_page), repeat),
+                            peak_memory(lambda: parse(titles_page)),
+                        )
+                    )
+            (full_ms, full_kib), (partial_ms, partial_kib) = results
+            print(
+                f"{source + ' ' + backend:<20} {full_ms:>9.3f} {partial_ms:>9.3f} "
+                f"{full_kib:>9.1f} {partial_kib:>9.1f}"
+            )
+
+
+def main(repeat: int = 200):
+    compare_backends(repeat)
+    print()
+    compare_partial_parsing(repeat)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
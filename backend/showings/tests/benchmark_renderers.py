@@ -0,0 +1,81 @@
+"""Compare DRF's JSONRenderer with FastJSONRenderer on showings payloads.
+
+The payloads have the shape of GET /showings/active/: rows of movie title,
+location name, date, time and url, as returned by ``values()``. Both
+renderers must produce identical bytes.
+
+Run from the backend directory:
+
+    python -m showings.tests.benchmark_renderers [repeat]
+"""
+
+import os
+import random
+import sys
+import timeit
+from datetime import date, time, timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "movie_showings.settings")
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from showings.renderers import FastJSONRenderer, orjson  # noqa: E402
+
+LOCATIONS = [
+    "Grand Cinema City Mall",
+    "Taj Mall",
+    "Prime Cinemas Abdali",
+    "Prime Cinemas Irbid",
+]
+
+
+def build_payload(showings: int, seed: int = 0) -> dict:
+    """Build an active showings payload with ``showings`` rows."""
+    rng = random.Random(seed)
+    titles = [f"Movie Title {i}: Part {i % 3 + 1}" for i in range(60)]
+    today = date(2024, 3, 20)
+    rows = [
+        {
+            "movie__title": rng.choice(titles),
+            "location__name": rng.choice(LOCATIONS),
+            "date": today + timedelta(days=rng.randrange(14)),
+            "time": time(rng.randrange(10, 24), rng.choice((0, 15, 30, 45))),
+            "url": rng.choice(
+                (None, f"https://tajcinemas.com/movie/{rng.randrange(1000)}")
+            ),
+        }
+        for _ in range(showings)
+    ]
+    return {"status": "success", "count": len(rows), "showings": rows}
+
+
+def time_call(func, repeat: int) -> float:
+    """Return the best per-call time of ``func`` in milliseconds."""
+    runs = timeit.repeat(func, number=repeat, repeat=5)
+    return min(runs) / repeat * 1000
+
+
+def main(repeat: int = 20):
+    if orjson is None:
+        print("orjson is not installed: FastJSONRenderer uses JSONRenderer")
+    renderers = {"json": JSONRenderer(), "fast": FastJSONRenderer()}
+    print(f"{'showings':>9} {'KiB':>8} {'json ms':>9} {'fast ms':>9} {'speedup':>8}")
+    for showings in (100, 1000, 10000):
+        payload = build_payload(showings)
+        rendered = {name: r.render(payload) for name, r in renderers.items()}
+        assert rendered["json"] == rendered["fast"], "renderers differ"
+        timings = {
+            name: time_call(lambda r=r: r.render(payload), repeat)
+            for name, r in renderers.items()
+        }
+        print(
+            f"{showings:>9} {len(rendered['json']) / 1024:>8.1f} "
+            f"{timings['json']:>9.3f} {timings['fast']:>9.3f} "
+            f"{timings['json'] / timings['fast']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
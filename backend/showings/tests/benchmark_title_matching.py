@@ -0,0 +1,109 @@
+"""Benchmark fuzzy title matching as the catalog grows.
+
+Compares ``TitleMatchService.find_fuzzy_matches`` with the per-title
+``fuzzywuzzy.process.extract`` loop it replaced, on synthetic catalogs, with
+all pairs scored and with n-gram blocking. Recall is the share of the
+all-pairs matches that blocking keeps. The loop is quadratic in Python, so
+it is only timed up to ``--max-loop`` titles.
+
+Run from the backend directory:
+
+    python -m showings.tests.benchmark_title_matching [sizes...]
+"""
+
+import argparse
+import random
+import string
+import time
+import warnings
+
+warnings.filterwarnings("ignore", module="fuzzywuzzy")
+
+from fuzzywuzzy import fuzz, process  # noqa: E402
+from showings.title_matching import TitleMatchService  # noqa: E402
+
+STOPWORDS = ["the", "of", "and", "part", "two", "a", "in", "man", "king", "night"]
+SUFFIXES = ["", "", "", " imax", " 3d", " (arabic)", " vip", " 4dx"]
+
+
+def make_titles(count: int, seed: int = 0) -> list:
+    """Build a catalog of ``count`` distinct titles.
+
+    Like a merged multi-cinema catalog: each film is listed by a few cinemas,
+    with different case, punctuation and screen suffixes.
+    """
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(3000)
+    ]
+    titles = set()
+    while len(titles) < count:
+        film = " ".join(
+            rng.choice(STOPWORDS) if rng.random() < 0.3 else rng.choice(vocabulary)
+            for _ in range(rng.randint(1, 4))
+        )
+        for _ in range(rng.randint(1, 3)):
+            variant = film + rng.choice(SUFFIXES)
+            if rng.random() < 0.3:
+                variant = variant.replace(" ", ": ", 1)
+            titles.add(variant.title() if rng.random() < 0.5 else variant.upper())
+    return sorted(titles)[:count]
+
+
+def extract_loop(titles: list) -> list:
+    """The replaced implementation: one ``process.extract`` per title."""
+    matches = []
+    for i, title in enumerate(titles):
+        others = {j: other for j, other in enumerate(titles) if j != i}
+        found = process.extract(title, others, scorer=fuzz.ratio, limit=None)
+        matches.append([j for _, score, j in found if score > 70])
+    return matches
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def recall(expected: list, found: list) -> float:
+    pairs = {(i, j) for i, matches in enumerate(expected) for j in matches}
+    kept = {(i, j) for i, matches in enumerate(found) for j in matches}
+    return len(pairs & kept) / len(pairs) if pairs else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "sizes",
+        nargs="*",
+        type=int,
+        default=[100, 250, 500, 1000, 2500, 5000, 10000, 20000],
+    )
+    parser.add_argument("--max-loop", type=int, default=500)
+    args = parser.parse_args()
+
+    print(
+        f"{'titles':>7} {'extract loop s':>15} {'all pairs s':>12} "
+        f"{'blocked s':>10} {'recall':>7}"
+    )
+    for size in args.sizes:
+        titles = make_titles(size)
+        all_pairs, matches = timed(TitleMatchService.find_fuzzy_matches, titles, False)
+        blocked, blocked_matches = timed(
+            TitleMatchService.find_fuzzy_matches, titles, True
+        )
+        loop = "-"
+        if size <= args.max_loop:
+            seconds, expected = timed(extract_loop, titles)
+            assert matches == expected, "engines disagree"
+            loop = f"{seconds:.3f}"
+        print(
+            f"{size:>7} {loop:>15} {all_pairs:>12.3f} {blocked:>10.3f} "
+            f"{recall(matches, blocked_matches):>7.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,24 @@
-from unittest.mock import Mock, patch
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import requests
 from django.test import TestCase
-from movie_showings.settings import GRAND_BASE_URL, PRIME_BASE_URL, TAJ_BASE_URL
+from movie_showings.settings import (
+    GRAND_BASE_URL,
+    HTTP_TIMEOUT,
+    PRIME_BASE_URL,
+    TAJ_BASE_URL,
+)
 from requests.status_codes import codes
-from showings.clients import GrandClient, PrimeClient, TajClient
+from showings.clients import (
+    AsyncGrandClient,
+    AsyncPrimeClient,
+    AsyncTajClient,
+    GrandClient,
+    PrimeClient,
+    TajClient,
+)
 from showings.errors import ClientError, HTTPClientError, NetworkError, SerializerError
 
 
@@ -14,11 +28,13 @@ class BaseClientTestCase(TestCase):
         self.mock_response.content = b"mock content"
         self.mock_response.raise_for_status = Mock()
         self.mock_response.status_code = codes["ok"]
+        self.mock_response.headers = {}
 
     def create_error_response(self, status_code, error_message):
         mock_response = Mock()
         mock_response.status_code = status_code
         mock_response.content = b"error content"
+        mock_response.headers = {}
         mock_response.raise_for_status = Mock(
             side_effect=requests.exceptions.HTTPError(
                 error_message, response=mock_response
@@ -35,16 +51,18 @@ class TestGrandClient(BaseClientTestCase):
         super().setUp()
         self.client = GrandClient()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_titles_page_success(self, mock_post):
         mock_post.return_value = self.mock_response
         result = self.client.get_titles_page()
         mock_post.assert_called_once_with(
-            f"{GRAND_BASE_URL}/handlers/getmovies.ashx", data={"cinemaId": "0000000002"}
+            f"{GRAND_BASE_URL}/handlers/getmovies.ashx",
+            data={"cinemaId": "0000000002"},
+            timeout=HTTP_TIMEOUT,
         )
         self.assert_successful_response(result)
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_titles_page_http_error(self, mock_post):
         mock_response = self.create_error_response(codes["not_found"], "404 Not Found")
         mock_post.return_value = mock_response
@@ -55,7 +73,7 @@ class TestGrandClient(BaseClientTestCase):
             "[GrandClient] http_error: HTTP 404 - 404 Not Found",
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_titles_page_network_error(self, mock_post):
         mock_post.side_effect = requests.exceptions.RequestException(
             "Connection refused"
@@ -67,17 +85,18 @@ class TestGrandClient(BaseClientTestCase):
             "[GrandClient] network_error: Network error - Connection refused",
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_dates_success(self, mock_post):
         mock_post.return_value = self.mock_response
         result = self.client.get_title_showing_dates("grand_id")
         mock_post.assert_called_once_with(
             f"{GRAND_BASE_URL}/handlers/getsessionDate.ashx",
             data={"cinemaId": "0000000002", "movieId": "grand_id"},
+            timeout=HTTP_TIMEOUT,
         )
         self.assert_successful_response(result)
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_dates_http_error(self, mock_post):
         mock_response = self.create_error_response(codes["not_found"], "404 Not Found")
         mock_post.return_value = mock_response
@@ -88,7 +107,7 @@ class TestGrandClient(BaseClientTestCase):
             "[GrandClient] http_error: HTTP 404 - 404 Not Found",
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_dates_network_error(self, mock_post):
         mock_post.side_effect = requests.exceptions.RequestException(
             "Connection refused"
@@ -100,7 +119,7 @@ class TestGrandClient(BaseClientTestCase):
             "[GrandClient] network_error: Network error - Connection refused",
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_dates_validation_error(self, mock_post):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showing_dates("")
@@ -110,17 +129,18 @@ class TestGrandClient(BaseClientTestCase):
         )
         mock_post.assert_not_called()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_times_on_date_success(self, mock_post):
         mock_post.return_value = self.mock_response
         result = self.client.get_title_showing_times_on_date("123", "2024-03-20")
         mock_post.assert_called_once_with(
             f"{GRAND_BASE_URL}/handlers/getsessionTime.ashx",
             data={"cinemaId": "0000000002", "movieId": "123", "date": "2024-03-20"},
+            timeout=HTTP_TIMEOUT,
         )
         self.assert_successful_response(result)
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_times_on_date_http_error(self, mock_post):
         mock_response = self.create_error_response(codes["not_found"], "404 Not Found")
         mock_post.return_value = mock_response
@@ -131,7 +151,7 @@ class TestGrandClient(BaseClientTestCase):
             "[GrandClient] http_error: HTTP 404 - 404 Not Found",
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_times_on_date_network_error(self, mock_post):
         mock_post.side_effect = requests.exceptions.RequestException(
             "Connection refused"
@@ -143,7 +163,7 @@ class TestGrandClient(BaseClientTestCase):
             "[GrandClient] network_error: Network error - Connection refused",
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_times_on_date_validation_error(self, mock_post):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showing_times_on_date("", "2024-03-20")
@@ -153,7 +173,7 @@ class TestGrandClient(BaseClientTestCase):
         )
         mock_post.assert_not_called()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_dates_serializer_error(self, mock_post):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showing_dates(None)  # None is invalid for grand_id
@@ -163,7 +183,7 @@ class TestGrandClient(BaseClientTestCase):
         )
         mock_post.assert_not_called()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_get_title_showing_times_on_date_serializer_error(self, mock_post):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showing_times_on_date(
@@ -181,14 +201,14 @@ class TestTajClient(BaseClientTestCase):
         super().setUp()
         self.client = TajClient()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_titles_page_success(self, mock_get):
         mock_get.return_value = self.mock_response
         result = self.client.get_titles_page()
-        mock_get.assert_called_once_with(TAJ_BASE_URL)
+        mock_get.assert_called_once_with(TAJ_BASE_URL, timeout=HTTP_TIMEOUT)
         self.assert_successful_response(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_titles_page_http_error(self, mock_get):
         mock_response = self.create_error_response(404, "404 Not Found")
         mock_get.return_value = mock_response
@@ -199,14 +219,16 @@ class TestTajClient(BaseClientTestCase):
             "[TajClient] http_error: HTTP 404 - 404 Not Found",
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_success(self, mock_get):
         mock_get.return_value = self.mock_response
         result = self.client.get_title_showings_page({"taj_id": "456"})
-        mock_get.assert_called_once_with(f"{TAJ_BASE_URL}/movies/456")
+        mock_get.assert_called_once_with(
+            f"{TAJ_BASE_URL}/movies/456", timeout=HTTP_TIMEOUT
+        )
         self.assert_successful_response(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_http_error(self, mock_get):
         mock_response = self.create_error_response(404, "404 Not Found")
         mock_get.return_value = mock_response
@@ -217,7 +239,7 @@ class TestTajClient(BaseClientTestCase):
             "[TajClient] http_error: HTTP 404 - 404 Not Found",
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_network_error(self, mock_get):
         mock_get.side_effect = requests.exceptions.RequestException(
             "Connection refused"
@@ -229,7 +251,7 @@ class TestTajClient(BaseClientTestCase):
             "[TajClient] network_error: Network error - Connection refused",
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_validation_error(self, mock_get):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showings_page({})
@@ -239,7 +261,7 @@ class TestTajClient(BaseClientTestCase):
         )
         mock_get.assert_not_called()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_serializer_error(self, mock_get):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showings_page(
@@ -257,14 +279,16 @@ class TestPrimeClient(BaseClientTestCase):
         super().setUp()
         self.client = PrimeClient()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_titles_page_success(self, mock_get):
         mock_get.return_value = self.mock_response
         result = self.client.get_titles_page()
-        mock_get.assert_called_once_with(f"{PRIME_BASE_URL}/Browsing/Movies/NowShowing")
+        mock_get.assert_called_once_with(
+            f"{PRIME_BASE_URL}/Browsing/Movies/NowShowing", timeout=HTTP_TIMEOUT
+        )
         self.assert_successful_response(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_titles_page_http_error(self, mock_get):
         mock_response = self.create_error_response(404, "404 Not Found")
         mock_get.return_value = mock_response
@@ -275,16 +299,16 @@ class TestPrimeClient(BaseClientTestCase):
             "[PrimeClient] http_error: HTTP 404 - 404 Not Found",
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_success(self, mock_get):
         mock_get.return_value = self.mock_response
         result = self.client.get_title_showings_page({"prime_id": "789"})
         mock_get.assert_called_once_with(
-            f"{PRIME_BASE_URL}/Browsing/Movies/Details/789"
+            f"{PRIME_BASE_URL}/Browsing/Movies/Details/789", timeout=HTTP_TIMEOUT
         )
         self.assert_successful_response(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_http_error(self, mock_get):
         mock_response = self.create_error_response(404, "404 Not Found")
         mock_get.return_value = mock_response
@@ -295,7 +319,7 @@ class TestPrimeClient(BaseClientTestCase):
             "[PrimeClient] http_error: HTTP 404 - 404 Not Found",
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_network_error(self, mock_get):
         mock_get.side_effect = requests.exceptions.RequestException(
             "Connection refused"
@@ -307,7 +331,7 @@ class TestPrimeClient(BaseClientTestCase):
             "[PrimeClient] network_error: Network error - Connection refused",
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_validation_error(self, mock_get):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showings_page({})
@@ -317,7 +341,7 @@ class TestPrimeClient(BaseClientTestCase):
         )
         mock_get.assert_not_called()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_title_showings_page_serializer_error(self, mock_get):
         with self.assertRaises(SerializerError) as exc_info:
             self.client.get_title_showings_page(
@@ -328,3 +352,94 @@ class TestPrimeClient(BaseClientTestCase):
             "[PrimeClient] validation_error: Validation error: {'prime_id': [ErrorDetail(string='This field cannot be null.', code='null')]}",
         )
         mock_get.assert_not_called()
+
+
+class AsyncClientTestCase(IsolatedAsyncioTestCase):
+    def response(self, method, url, status_code=codes["ok"], content=b"mock content"):
+        return httpx.Response(
+            status_code, content=content, request=httpx.Request(method, url)
+        )
+
+
+class TestAsyncGrandClient(AsyncClientTestCase):
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_get_titles_page_success(self, mock_post):
+        url = f"{GRAND_BASE_URL}/handlers/getmovies.ashx"
+        mock_post.return_value = self.response("POST", url)
+        result = await AsyncGrandClient.get_titles_page()
+        mock_post.assert_awaited_once_with(url, data={"cinemaId": "0000000002"})
+        self.assertEqual(result, b"mock content")
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_get_title_showing_times_on_date_success(self, mock_post):
+        url = f"{GRAND_BASE_URL}/handlers/getsessionTime.ashx"
+        mock_post.return_value = self.response("POST", url)
+        result = await AsyncGrandClient.get_title_showing_times_on_date(
+            "123", "2024-03-20"
+        )
+        mock_post.assert_awaited_once_with(
+            url,
+            data={"cinemaId": "0000000002", "movieId": "123", "date": "2024-03-20"},
+        )
+        self.assertEqual(result, b"mock content")
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_get_title_showing_dates_http_error(self, mock_post):
+        url = f"{GRAND_BASE_URL}/handlers/getsessionDate.ashx"
+        mock_post.return_value = self.response("POST", url, codes["not_found"])
+        with self.assertRaises(HTTPClientError) as exc_info:
+            await AsyncGrandClient.get_title_showing_dates("grand_id")
+        self.assertEqual(exc_info.exception.source, "GrandClient")
+        self.assertEqual(exc_info.exception.details["status_code"], 404)
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_get_titles_page_network_error(self, mock_post):
+        mock_post.side_effect = httpx.ConnectError("Connection refused")
+        with self.assertRaises(NetworkError) as exc_info:
+            await AsyncGrandClient.get_titles_page()
+        self.assertEqual(
+            str(exc_info.exception),
+            "[GrandClient] network_error: Network error - Connection refused",
+        )
+
+    @patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+    async def test_get_title_showing_dates_validation_error(self, mock_post):
+        with self.assertRaises(SerializerError) as exc_info:
+            await AsyncGrandClient.get_title_showing_dates("")
+        self.assertEqual(
+            str(exc_info.exception),
+            "[GrandClient] validation_error: Validation error: {'grand_id': [ErrorDetail(string='This field cannot be empty.', code='blank')]}",
+        )
+        mock_post.assert_not_called()
+
+
+class TestAsyncTajClient(AsyncClientTestCase):
+    @patch("httpx.AsyncClient.get", new_callable=AsyncMock)
+    async def test_get_title_showings_page_success(self, mock_get):
+        url = f"{TAJ_BASE_URL}/movies/456"
+        mock_get.return_value = self.response("GET", url)
+        result = await AsyncTajClient.get_title_showings_page({"taj_id": "456"})
+        mock_get.assert_awaited_once_with(url)
+        self.assertEqual(result, b"mock content")
+
+    @patch("httpx.AsyncClient.get", new_callable=AsyncMock)
+    async def test_get_titles_page_http_error(self, mock_get):
+        mock_get.return_value = self.response("GET", TAJ_BASE_URL, 500)
+        with self.assertRaises(HTTPClientError):
+            await AsyncTajClient.get_titles_page()
+
+
+class TestAsyncPrimeClient(AsyncClientTestCase):
+    @patch("httpx.AsyncClient.get", new_callable=AsyncMock)
+    async def test_get_titles_page_success(self, mock_get):
+        url = f"{PRIME_BASE_URL}/Browsing/Movies/NowShowing"
+        mock_get.return_value = self.response("GET", url)
+        result = await AsyncPrimeClient.get_titles_page()
+        mock_get.assert_awaited_once_with(url)
+        self.assertEqual(result, b"mock content")
+
+    @patch("httpx.AsyncClient.get", new_callable=AsyncMock)
+    async def test_get_title_showings_page_validation_error(self, mock_get):
+        with self.assertRaises(SerializerError):
+            await AsyncPrimeClient.get_title_showings_page({})
+        mock_get.assert_not_called()
@@ -0,0 +1,42 @@
+import threading
+import unittest
+
+from showings.concurrency import run_concurrently
+
+
+class TestRunConcurrently(unittest.TestCase):
+    def test_results_keep_task_order(self):
+        tasks = [lambda i=i: i * 2 for i in range(10)]
+        self.assertEqual(run_concurrently(tasks, max_workers=4), list(range(0, 20, 2)))
+
+    def test_runs_tasks_in_parallel(self):
+        barrier = threading.Barrier(3, timeout=5)
+        tasks = [barrier.wait for _ in range(3)]
+        self.assertEqual(len(run_concurrently(tasks, max_workers=3)), 3)
+
+    def test_raises_first_error(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            run_concurrently([lambda: 1, fail], max_workers=2)
+
+    def test_return_exceptions(self):
+        error = ValueError("boom")
+
+        def fail():
+            raise error
+
+        results = run_concurrently(
+            [lambda: 1, fail, lambda: 3], max_workers=3, return_exceptions=True
+        )
+        self.assertEqual(results, [1, error, 3])
+
+    def test_single_worker_runs_inline(self):
+        thread_ids = run_concurrently(
+            [threading.get_ident, threading.get_ident], max_workers=1
+        )
+        self.assertEqual(thread_ids, [threading.get_ident()] * 2)
+
+    def test_empty_tasks(self):
+        self.assertEqual(run_concurrently([], max_workers=3), [])
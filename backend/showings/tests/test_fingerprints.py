@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.test import TestCase
+from django.utils import timezone
+from movie_showings.settings import FINGERPRINT_CACHE_ALIAS
+from showings.fingerprints import FingerprintStore, fingerprint
+from showings.http_cache import PageContent
+from showings.models import Location, Movie, Showing
+from showings.services import ShowingService, TajService
+from showings.tests.test_parsers import load_test_data
+
+
+class FingerprintTestCase(TestCase):
+    def setUp(self):
+        caches[FINGERPRINT_CACHE_ALIAS].clear()
+
+
+class TestFingerprintStore(FingerprintTestCase):
+    def test_fingerprint_is_stable_for_data(self):
+        self.assertEqual(
+            fingerprint([{"b": 1, "a": 2}]), fingerprint([{"a": 2, "b": 1}])
+        )
+        self.assertEqual(fingerprint("page"), fingerprint(b"page"))
+
+    def test_hit_only_for_identical_content(self):
+        store = FingerprintStore("test")
+        store.set("taj:titles", b"page", ["parsed"])
+        self.assertEqual(store.get("taj:titles", b"page"), (True, ["parsed"]))
+        self.assertEqual(store.get("taj:titles", b"other"), (False, None))
+        self.assertEqual(store.get("prime:titles", b"page"), (False, None))
+
+    def test_namespaces_are_independent(self):
+        FingerprintStore("a").set("key", b"page", 1)
+        self.assertEqual(FingerprintStore("b").get("key", b"page"), (False, None))
+
+    def test_delete(self):
+        store = FingerprintStore("test")
+        store.set("key", b"page")
+        store.delete("key")
+        self.assertEqual(store.get("key", b"page"), (False, None))
+
+
+class TestServiceParsePage(FingerprintTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = TajService()
+        self.titles = [{"title": "Dune", "taj_id": "1"}]
+
+    def test_identical_page_skips_parsing(self):
+        parse = Mock(return_value=self.titles)
+        self.service.parse_page(PageContent(b"page"), "taj:titles", parse)
+        result = self.service.parse_page(PageContent(b"page"), "taj:titles", parse)
+        self.assertEqual(result, self.titles)
+        parse.assert_called_once()
+
+    def test_changed_page_is_parsed(self):
+        parse = Mock(return_value=self.titles)
+        self.service.parse_page(PageContent(b"page"), "taj:titles", parse)
+        self.service.parse_page(PageContent(b"new page"), "taj:titles", parse)
+        self.assertEqual(parse.call_count, 2)
+
+    def test_not_modified_page_skips_parsing(self):
+        parse = Mock(return_value=self.titles)
+        self.service.parse_page(PageContent(b"page"), "taj:titles", parse)
+        self.service.parse_page(
+            PageContent(b"page", unchanged=True), "taj:titles", parse
+        )
+        parse.assert_called_once()
+
+    def test_taj_title_page_is_parsed_again_in_a_new_month(self):
+        # The page only shows days of the month, dated in the current month.
+        page = PageContent(load_test_data("taj_title_showings_page.html"))
+        self.service.client = Mock(get_title_showings_page=Mock(return_value=page))
+        title = {"title": "Dune", "taj_id": "1"}
+
+        with patch("showings.util.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 1, 31)
+            january = self.service.get_title_showings(title)
+            mock_datetime.now.return_value = datetime(2025, 2, 1)
+            february = self.service.get_title_showings(title)
+
+        self.assertTrue(all(s["date"].startswith("2025-01-") for s in january))
+        self.assertTrue(all(s["date"].startswith("2025-02-") for s in february))
+        self.assertEqual(len(january), len(february))
+
+    def test_plain_bytes_are_always_parsed(self):
+        parse = Mock(return_value=self.titles)
+        self.service.parse_page(b"page", "taj:titles", parse)
+        self.service.parse_page(b"page", "taj:titles", parse)
+        self.assertEqual(parse.call_count, 2)
+
+
+class TestSaveShowingsSkipsUnchangedGroups(FingerprintTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = ShowingService()
+        self.location = Location.objects.create(
+            name="Taj Mall", city="Amman", address="Default Address"
+        )
+        self.movie = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="1"
+        )
+        self.date = (timezone.now().date() + timedelta(days=1)).strftime("%Y-%m-%d")
+        self.showing = Showing.objects.create(
+            movie=self.movie,
+            location=self.location,
+            date=self.date,
+            time="14:00",
+            is_showing=True,
+        )
+        self.showings = [
+            {
+                "title": "dune",
+                "date": self.date,
+                "time": "14:00",
+                "location": "Taj Mall",
+            }
+        ]
+
+    def test_unchanged_group_is_not_rewritten_or_swept(self):
+        self.service._save_showings(self.showings, [self.movie])
+        updated_at = Showing.objects.get(id=self.showing.id).updated_at
+
+        saved = self.service._save_showings(self.showings, [self.movie])
+
+        showing = Showing.objects.get(id=self.showing.id)
+        self.assertTrue(showing.is_showing)
+        self.assertEqual(showing.updated_at, updated_at)
+        self.assertEqual(list(saved), [showing])
+
+    def test_group_fingerprint_is_order_independent(self):
+        showings = self.showings + [
+            {
+                "title": "dune",
+                "date": self.date,
+                "time": "18:00",
+                "location": "Taj Mall",
+            }
+        ]
+        groups = self.service._group_showings(showings)
+        reversed_groups = self.service._group_showings(list(reversed(showings)))
+        self.assertEqual(groups, reversed_groups)
+
+    def test_group_with_unsaved_showings_is_saved_again(self):
+        showings = [{**self.showings[0], "title": "wonka", "time": "18:00"}]
+        # Wonka's movie is not saved yet, so its showing is dropped.
+        self.service._save_showings(showings, [self.movie])
+        wonka = Movie.objects.create(
+            title="Wonka", normalized_title="wonka", taj_id="2"
+        )
+
+        self.service._save_showings(showings, [self.movie, wonka])
+
+        self.assertTrue(Showing.objects.filter(movie=wonka, is_showing=True).exists())
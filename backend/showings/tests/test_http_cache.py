@@ -0,0 +1,105 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.test import TestCase
+from movie_showings.settings import HTTP_CACHE_ALIAS, TAJ_BASE_URL
+from requests.exceptions import HTTPError
+from showings.clients import TajClient
+from showings.http_cache import PageContent, conditional_headers, resolve_response
+
+
+def make_response(status_code=200, content=b"page", headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status = Mock(
+            side_effect=HTTPError(f"{status_code} Error", response=response)
+        )
+    return response
+
+
+class HTTPCacheTestCase(TestCase):
+    url = "https://example.com/movies/1"
+
+    def setUp(self):
+        caches[HTTP_CACHE_ALIAS].clear()
+
+
+class TestResolveResponse(HTTPCacheTestCase):
+    def test_response_without_validators_is_not_cached(self):
+        page = resolve_response(self.url, make_response())
+        self.assertEqual(page, b"page")
+        self.assertFalse(page.unchanged)
+        self.assertEqual(conditional_headers(self.url), {})
+
+    def test_response_with_validators_is_cached(self):
+        headers = {"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        page = resolve_response(self.url, make_response(headers=headers))
+        self.assertFalse(page.unchanged)
+        self.assertEqual(
+            conditional_headers(self.url),
+            {
+                "If-None-Match": '"v1"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            },
+        )
+
+    def test_not_modified_is_served_from_cache(self):
+        resolve_response(
+            self.url, make_response(content=b"cached", headers={"ETag": '"v1"'})
+        )
+        page = resolve_response(self.url, make_response(304, content=b""))
+        self.assertEqual(page, b"cached")
+        self.assertTrue(page.unchanged)
+
+    def test_not_modified_without_cached_body(self):
+        self.assertIsNone(resolve_response(self.url, make_response(304)))
+
+    def test_error_status_raises(self):
+        with self.assertRaises(HTTPError):
+            resolve_response(self.url, make_response(500))
+
+
+class TestPageContent(HTTPCacheTestCase):
+    def test_behaves_like_bytes(self):
+        page = PageContent(b"<html></html>", unchanged=True)
+        self.assertIsInstance(page, bytes)
+        self.assertEqual(page, b"<html></html>")
+        self.assertTrue(page.unchanged)
+
+
+class TestConditionalClientRequests(HTTPCacheTestCase):
+    @patch("requests.Session.get")
+    def test_second_request_is_conditional(self, mock_get):
+        mock_get.side_effect = [
+            make_response(content=b"titles", headers={"ETag": '"v1"'}),
+            make_response(304, content=b""),
+        ]
+
+        first = TajClient.get_titles_page()
+        second = TajClient.get_titles_page()
+
+        self.assertFalse(first.unchanged)
+        self.assertTrue(second.unchanged)
+        self.assertEqual(second, b"titles")
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'}
+        )
+        self.assertEqual(mock_get.call_args.args, (TAJ_BASE_URL,))
+
+    @patch("requests.Session.get")
+    def test_not_modified_without_cached_body_refetches(self, mock_get):
+        with patch(
+            "showings.http_sessions.conditional_headers",
+            return_value={"If-None-Match": '"v1"'},
+        ):
+            mock_get.side_effect = [
+                make_response(304, content=b""),
+                make_response(content=b"fresh"),
+            ]
+            page = TajClient.get_titles_page()
+
+        self.assertEqual(page, b"fresh")
+        self.assertEqual(mock_get.call_count, 2)
@@ -0,0 +1,131 @@
+import threading
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from movie_showings.settings import HTTP_MAX_RETRIES, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT
+from showings.clients import GrandClient, PrimeClient, TajClient
+from showings.http_sessions import (
+    ClientSession,
+    RetryingAsyncTransport,
+    build_async_client,
+    build_session,
+    close_all_sessions,
+)
+
+
+class TestBuildSession(unittest.TestCase):
+    def test_mounts_pooled_adapter_with_retries(self):
+        session = build_session()
+        adapter = session.get_adapter("https://example.com")
+        self.assertEqual(adapter._pool_maxsize, HTTP_POOL_MAXSIZE)
+        self.assertEqual(adapter.max_retries.total, HTTP_MAX_RETRIES)
+        self.assertIn("POST", adapter.max_retries.allowed_methods)
+        self.assertEqual(session.headers["Connection"], "keep-alive")
+
+
+@patch("showings.http_sessions.asyncio.sleep", new_callable=AsyncMock)
+class TestRetryingAsyncTransport(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.request = httpx.Request("GET", "https://example.com")
+
+    async def test_retries_unavailable_responses(self, mock_sleep):
+        transport = RetryingAsyncTransport(status_retries=3, backoff_factor=0.5)
+        with patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            AsyncMock(side_effect=[httpx.Response(503), httpx.Response(200)]),
+        ) as mock_request:
+            response = await transport.handle_async_request(self.request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 2)
+        mock_sleep.assert_awaited_once_with(0.5)
+
+    async def test_returns_last_response_when_retries_run_out(self, mock_sleep):
+        transport = RetryingAsyncTransport(status_retries=2, backoff_factor=0.5)
+        with patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            AsyncMock(side_effect=lambda request: httpx.Response(502)),
+        ) as mock_request:
+            response = await transport.handle_async_request(self.request)
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual([c.args for c in mock_sleep.await_args_list], [(0.5,), (1.0,)])
+
+    async def test_does_not_retry_client_errors(self, mock_sleep):
+        transport = RetryingAsyncTransport(status_retries=3)
+        with patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            AsyncMock(return_value=httpx.Response(404)),
+        ) as mock_request:
+            response = await transport.handle_async_request(self.request)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(mock_request.call_count, 1)
+        mock_sleep.assert_not_awaited()
+
+    async def test_async_client_retries_statuses(self, mock_sleep):
+        client = build_async_client()
+        self.assertIsInstance(client._transport, RetryingAsyncTransport)
+        self.assertEqual(client._transport.status_retries, HTTP_MAX_RETRIES)
+        await client.aclose()
+
+
+class TestClientSession(unittest.TestCase):
+    def setUp(self):
+        self.client_session = ClientSession("TestClient")
+
+    def tearDown(self):
+        self.client_session.close()
+
+    def test_session_is_reused(self):
+        self.assertIs(self.client_session.session, self.client_session.session)
+
+    def test_session_is_shared_across_threads(self):
+        sessions = []
+        threads = [
+            threading.Thread(
+                target=lambda: sessions.append(self.client_session.session)
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(s) for s in sessions}), 1)
+
+    def test_close_opens_new_session_on_next_use(self):
+        first = self.client_session.session
+        self.client_session.close()
+        self.assertIsNot(self.client_session.session, first)
+
+    def test_session_is_rebuilt_after_fork(self):
+        first = self.client_session.session
+        with patch("showings.http_sessions.os.getpid", return_value=-1):
+            self.assertIsNot(self.client_session.session, first)
+
+    def test_close_all_sessions(self):
+        first = self.client_session.session
+        close_all_sessions()
+        self.assertIsNot(self.client_session.session, first)
+
+    @patch("requests.Session.get")
+    def test_get_applies_default_timeout(self, mock_get):
+        self.client_session.get("https://example.com")
+        mock_get.assert_called_once_with("https://example.com", timeout=HTTP_TIMEOUT)
+
+    @patch("requests.Session.post")
+    def test_post_keeps_explicit_timeout(self, mock_post):
+        self.client_session.post("https://example.com", data={}, timeout=1)
+        mock_post.assert_called_once_with("https://example.com", data={}, timeout=1)
+
+
+class TestClientsShareSessions(unittest.TestCase):
+    def test_each_client_has_its_own_session(self):
+        sessions = {GrandClient.session, TajClient.session, PrimeClient.session}
+        self.assertEqual(len(sessions), 3)
@@ -0,0 +1,379 @@
+from io import StringIO
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import OperationalError
+from django.db.models import QuerySet
+from django.test import TestCase
+from showings.clients import AsyncGrandClient, AsyncPrimeClient, AsyncTajClient
+from showings.errors import LeaseLostError, ServiceError
+from showings.jobs import (
+    REFRESH_LEASE,
+    JobProgress,
+    claim_next_job,
+    enqueue_refresh,
+    run_job,
+    source_refresh_lease,
+)
+from showings.leases import acquire_lease, lease_owner, release_lease
+from showings.models import Movie, RefreshJob
+from showings.services import ShowingService
+from showings.tests.test_parsers import load_test_data
+
+
+class TestJobs(TestCase):
+    def test_claim_next_job__oldest_first(self):
+        first = RefreshJob.objects.create()
+        second = RefreshJob.objects.create()
+
+        job = claim_next_job()
+
+        self.assertEqual(job.id, first.id)
+        self.assertEqual(job.status, RefreshJob.Status.RUNNING)
+        self.assertIsNotNone(job.started_at)
+        self.assertEqual(claim_next_job().id, second.id)
+        self.assertIsNone(claim_next_job())
+
+    def test_claim_next_job__skips_jobs_claimed_meanwhile(self):
+        first = RefreshJob.objects.create()
+        second = RefreshJob.objects.create()
+        queryset_first = QuerySet.first
+
+        # Another worker claims the first job between our read and update.
+        def claimed_meanwhile(queryset):
+            job = queryset_first(queryset)
+            if job and job.id == first.id:
+                RefreshJob.objects.filter(id=job.id).update(
+                    status=RefreshJob.Status.RUNNING
+                )
+            return job
+
+        with patch.object(
+            QuerySet, "first", autospec=True, side_effect=claimed_meanwhile
+        ):
+            job = claim_next_job()
+
+        self.assertEqual(job.id, second.id)
+
+    def test_claim_next_job__fails_abandoned_jobs(self):
+        enqueue_refresh()
+        abandoned = claim_next_job()
+        # The worker died: its lease runs out without the job finishing.
+        acquire_lease(REFRESH_LEASE, str(abandoned.id), -1)
+
+        self.assertIsNone(claim_next_job())
+
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.status, RefreshJob.Status.FAILED)
+        self.assertIn("lease expired", abandoned.error)
+        self.assertIsNotNone(abandoned.finished_at)
+        response = self.client.get(f"/showings/refresh/{abandoned.id}/")
+        self.assertEqual(response.data["job"]["status"], "failed")
+
+    def test_claim_next_job__keeps_job_holding_the_lease_running(self):
+        enqueue_refresh()
+        running = claim_next_job()
+
+        self.assertIsNone(claim_next_job())
+
+        running.refresh_from_db()
+        self.assertEqual(running.status, RefreshJob.Status.RUNNING)
+
+    def test_job_progress(self):
+        job = enqueue_refresh()
+        progress = JobProgress(job)
+
+        progress("titles", {"grand": {"titles": 3}, "matched_titles": 3}, {})
+        progress("showings", {"grand": {"showings": 12}}, {"taj": "Taj is down"})
+
+        job.refresh_from_db()
+        self.assertEqual(job.stage, "showings")
+        self.assertEqual(
+            job.counts,
+            {"grand": {"titles": 3, "showings": 12}, "matched_titles": 3},
+        )
+        self.assertEqual(job.errors, {"taj": "Taj is down"})
+
+    @patch("showings.jobs.ShowingService")
+    def test_run_job(self, mock_service):
+        mock_service.return_value.refresh_and_save.return_value = ([1, 2], [1, 2, 3])
+        enqueue_refresh()
+        job = claim_next_job()
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.SUCCEEDED)
+        self.assertEqual(job.counts, {"movies": 2, "showings": 3})
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsInstance(mock_service.call_args.kwargs["progress"], JobProgress)
+
+    @patch("showings.jobs.ShowingService")
+    def test_run_job__failed(self, mock_service):
+        mock_service.return_value.refresh_and_save.side_effect = ServiceError(
+            "Grand is down"
+        )
+        enqueue_refresh()
+        job = claim_next_job()
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.FAILED)
+        self.assertIn("Grand is down", job.error)
+        self.assertIsNotNone(job.finished_at)
+
+    @patch("showings.jobs.ShowingService")
+    def test_refresh_worker_once(self, mock_service):
+        mock_service.return_value.refresh_and_save.return_value = ([], [])
+        jobs = [RefreshJob.objects.create(), RefreshJob.objects.create()]
+        out = StringIO()
+
+        call_command("refresh_worker", "--once", stdout=out)
+
+        self.assertEqual(mock_service.return_value.refresh_and_save.call_count, 2)
+        for job in jobs:
+            job.refresh_from_db()
+            self.assertEqual(job.status, RefreshJob.Status.SUCCEEDED)
+        self.assertIn(f"Refresh job {jobs[1].id} succeeded", out.getvalue())
+
+    @patch("showings.management.commands.refresh_worker.close_all_sessions")
+    def test_refresh_worker_closes_sessions(self, mock_close_all_sessions):
+        call_command("refresh_worker", "--once", stdout=StringIO())
+
+        mock_close_all_sessions.assert_called_once_with()
+
+
+@patch("showings.jobs.SCRAPE_ASYNC", True)
+class TestAsyncRefreshJob(TestCase):
+    def setUp(self):
+        pages = {
+            (AsyncGrandClient, "get_titles_page"): "grand_titles_page.html",
+            (
+                AsyncGrandClient,
+                "get_title_showing_dates",
+            ): "grand_title_showing_dates_page.html",
+            (
+                AsyncGrandClient,
+                "get_title_showing_times_on_date",
+            ): "grand_title_showing_times_page.html",
+            (AsyncTajClient, "get_titles_page"): "taj_titles_page.html",
+            (AsyncTajClient, "get_title_showings_page"): "taj_title_showings_page.html",
+            (AsyncPrimeClient, "get_titles_page"): "prime_titles_page.html",
+            (
+                AsyncPrimeClient,
+                "get_title_showings_page",
+            ): "prime_title_showings_page.html",
+        }
+        patchers = [
+            patch.object(
+                client, method, AsyncMock(return_value=load_test_data(filename))
+            )
+            for (client, method), filename in pages.items()
+        ]
+        # Title matching itself is covered by its own tests.
+        patchers.append(
+            patch.object(
+                ShowingService,
+                "_match_titles",
+                return_value=[
+                    {
+                        "title": "Dune",
+                        "normalized_title": "dune",
+                        "grand_id": "g1",
+                        "title_grand": "Dune",
+                        "taj_id": "t1",
+                        "title_taj": "Dune",
+                    },
+                    {
+                        "title": "Alarum",
+                        "normalized_title": "alarum",
+                        "prime_id": "p1",
+                        "title_prime": "Alarum",
+                    },
+                ],
+            )
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch("showings.jobs.aclose_all_sessions")
+    def test_run_job(self, mock_aclose_all_sessions):
+        enqueue_refresh()
+        job = claim_next_job()
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.SUCCEEDED, job.error)
+        # Progress was recorded on the job, through the database.
+        self.assertEqual(job.stage, "showings")
+        self.assertGreater(job.counts["grand"]["titles"], 0)
+        self.assertEqual(job.counts["matched_titles"], 2)
+        self.assertEqual(job.counts["movies"], 2)
+        self.assertGreater(job.counts["grand"]["showings"], 0)
+        self.assertEqual(job.errors, {})
+        self.assertEqual(Movie.objects.count(), 2)
+        mock_aclose_all_sessions.assert_awaited_once_with()
+
+    def test_run_job__lost_lease(self):
+        @sync_to_async
+        def take_lease():
+            acquire_lease(REFRESH_LEASE, str(job.id), -1)
+            acquire_lease(REFRESH_LEASE, "other", 60)
+
+        async def get_titles_page():
+            await take_lease()
+            return load_test_data("prime_titles_page.html")
+
+        enqueue_refresh()
+        job = claim_next_job()
+
+        with patch.object(
+            AsyncPrimeClient, "get_titles_page", AsyncMock(side_effect=get_titles_page)
+        ):
+            run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.FAILED)
+        self.assertIn("lost the refresh lease", job.error)
+
+
+class TestSingleFlightRefresh(TestCase):
+    def test_enqueue_refresh__attaches_to_refresh_in_flight(self):
+        job = enqueue_refresh()
+
+        self.assertEqual(enqueue_refresh().id, job.id)
+        self.assertEqual(RefreshJob.objects.count(), 1)
+        self.assertEqual(lease_owner(REFRESH_LEASE), str(job.id))
+
+    @patch("showings.jobs.ShowingService")
+    def test_enqueue_refresh__after_refresh_finished(self, mock_service):
+        mock_service.return_value.refresh_and_save.return_value = ([], [])
+        job = enqueue_refresh()
+        run_job(claim_next_job())
+
+        self.assertIsNone(lease_owner(REFRESH_LEASE))
+        self.assertNotEqual(enqueue_refresh().id, job.id)
+
+    @patch("showings.jobs.REFRESH_LEASE_SECONDS", -1)
+    def test_enqueue_refresh__after_lease_expired(self):
+        job = enqueue_refresh()
+
+        self.assertNotEqual(enqueue_refresh().id, job.id)
+
+    @patch("showings.jobs.ShowingService")
+    def test_run_job__another_refresh_in_flight(self, mock_service):
+        in_flight = enqueue_refresh()
+        job = RefreshJob.objects.create(status=RefreshJob.Status.RUNNING)
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.FAILED)
+        self.assertIn(f"job {in_flight.id}", job.error)
+        mock_service.assert_not_called()
+        self.assertEqual(lease_owner(REFRESH_LEASE), str(in_flight.id))
+
+    @patch("showings.jobs.ShowingService")
+    def test_run_job__releases_lease_on_failure(self, mock_service):
+        mock_service.return_value.refresh_and_save.side_effect = ServiceError("down")
+        enqueue_refresh()
+
+        run_job(claim_next_job())
+
+        self.assertIsNone(lease_owner(REFRESH_LEASE))
+
+    @patch("showings.jobs.time.sleep")
+    @patch("showings.jobs.ShowingService")
+    def test_run_job__waits_for_source_refresh(self, mock_service, mock_sleep):
+        mock_service.return_value.refresh_and_save.return_value = ([], [])
+        acquire_lease(source_refresh_lease("taj"), "scheduler", 60)
+        mock_sleep.side_effect = lambda _: release_lease(
+            source_refresh_lease("taj"), "scheduler"
+        )
+        enqueue_refresh()
+
+        job = run_job(claim_next_job())
+
+        self.assertEqual(job.status, RefreshJob.Status.SUCCEEDED)
+        mock_sleep.assert_called_once()
+
+    def test_job_progress_renews_lease(self):
+        job = enqueue_refresh()
+        # Let the lease run out, as in a long refresh.
+        acquire_lease(REFRESH_LEASE, str(job.id), -1)
+        self.assertIsNone(lease_owner(REFRESH_LEASE))
+
+        JobProgress(job)("titles", {}, {})
+
+        self.assertEqual(lease_owner(REFRESH_LEASE), str(job.id))
+
+    def test_job_progress_stops_refresh_when_lease_was_taken(self):
+        job = enqueue_refresh()
+        acquire_lease(REFRESH_LEASE, str(job.id), -1)
+        acquire_lease(REFRESH_LEASE, "other", 60)
+
+        with self.assertRaises(LeaseLostError):
+            JobProgress(job)("titles", {}, {})
+
+    @patch("showings.jobs.ShowingService")
+    def test_run_job__survives_locked_database(self, mock_service):
+        def refresh_and_save():
+            progress = mock_service.call_args.kwargs["progress"]
+            with patch(
+                "showings.leases.acquire_lease",
+                side_effect=OperationalError("database is locked"),
+            ):
+                progress("titles", {}, {})
+            progress("showings", {}, {})
+            return [], []
+
+        mock_service.return_value.refresh_and_save.side_effect = refresh_and_save
+        enqueue_refresh()
+        job = claim_next_job()
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.SUCCEEDED, job.error)
+        self.assertEqual(job.stage, "showings")
+
+    @patch("showings.jobs.ShowingService")
+    def test_run_job__stops_when_lease_is_lost(self, mock_service):
+        def refresh_and_save():
+            # Another refresh takes the lease after it expired.
+            acquire_lease(REFRESH_LEASE, str(job.id), -1)
+            acquire_lease(REFRESH_LEASE, "other", 60)
+            mock_service.call_args.kwargs["progress"]("showings", {}, {})
+            return [], []
+
+        mock_service.return_value.refresh_and_save.side_effect = refresh_and_save
+        enqueue_refresh()
+        job = claim_next_job()
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.FAILED)
+        self.assertIn("lost the refresh lease", job.error)
+        self.assertEqual(lease_owner(REFRESH_LEASE), "other")
+
+    def test_enqueue_refresh__takes_over_lease_of_missing_job(self):
+        acquire_lease(REFRESH_LEASE, "12345", 60)
+
+        job = enqueue_refresh()
+
+        self.assertEqual(lease_owner(REFRESH_LEASE), str(job.id))
+        self.assertEqual(RefreshJob.objects.count(), 1)
+
+    def test_enqueue_refresh__takes_over_lease_of_finished_job(self):
+        finished = RefreshJob.objects.create(status=RefreshJob.Status.SUCCEEDED)
+        acquire_lease(REFRESH_LEASE, str(finished.id), 60)
+
+        job = enqueue_refresh()
+
+        self.assertNotEqual(job.id, finished.id)
+        self.assertEqual(lease_owner(REFRESH_LEASE), str(job.id))
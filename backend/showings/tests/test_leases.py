@@ -0,0 +1,112 @@
+import time
+from unittest.mock import patch
+
+from django.db import DatabaseError, OperationalError
+from django.test import TestCase
+from showings.errors import LeaseLostError
+from showings.leases import LeaseHeartbeat, acquire_lease, lease_owner, release_lease
+from showings.models import Lease
+
+
+class TestLeases(TestCase):
+    def test_acquire_lease(self):
+        self.assertTrue(acquire_lease("refresh", "a", 60))
+        self.assertEqual(lease_owner("refresh"), "a")
+
+    def test_acquire_lease__held_by_another_owner(self):
+        acquire_lease("refresh", "a", 60)
+
+        self.assertFalse(acquire_lease("refresh", "b", 60))
+        self.assertEqual(lease_owner("refresh"), "a")
+
+    def test_acquire_lease__renews_own_lease(self):
+        acquire_lease("refresh", "a", 60)
+        expires_at = Lease.objects.get(name="refresh").expires_at
+
+        self.assertTrue(acquire_lease("refresh", "a", 120))
+        self.assertGreater(Lease.objects.get(name="refresh").expires_at, expires_at)
+
+    def test_acquire_lease__expired(self):
+        acquire_lease("refresh", "a", -1)
+
+        self.assertIsNone(lease_owner("refresh"))
+        self.assertTrue(acquire_lease("refresh", "b", 60))
+        self.assertEqual(lease_owner("refresh"), "b")
+
+    def test_leases_are_independent(self):
+        acquire_lease("refresh", "a", 60)
+
+        self.assertTrue(acquire_lease("refresh:grand", "b", 60))
+
+    def test_release_lease(self):
+        acquire_lease("refresh", "a", 60)
+
+        release_lease("refresh", "b")
+        self.assertEqual(lease_owner("refresh"), "a")
+        release_lease("refresh", "a")
+        self.assertIsNone(lease_owner("refresh"))
+        self.assertTrue(acquire_lease("refresh", "b", 60))
+
+
+class TestLeaseHeartbeat(TestCase):
+    @patch("showings.leases.acquire_lease", return_value=True)
+    def test_renews_lease(self, mock_acquire_lease):
+        with LeaseHeartbeat("refresh", "a", 60, interval=0.01) as heartbeat:
+            time.sleep(0.1)
+
+        mock_acquire_lease.assert_called_with("refresh", "a", 60)
+        self.assertGreater(mock_acquire_lease.call_count, 1)
+        heartbeat.check()
+
+    @patch("showings.leases.acquire_lease", side_effect=[True, False])
+    def test_lost_lease(self, mock_acquire_lease):
+        with LeaseHeartbeat("refresh", "a", 60, interval=0.01) as heartbeat:
+            self.assertTrue(heartbeat.lost.wait(5))
+
+        self.assertEqual(mock_acquire_lease.call_count, 2)
+        with self.assertRaises(LeaseLostError):
+            heartbeat.check()
+
+    @patch("showings.leases.acquire_lease", side_effect=DatabaseError("locked"))
+    def test_failed_renewal_loses_lease(self, mock_acquire_lease):
+        with LeaseHeartbeat("refresh", "a", 60, interval=0.01) as heartbeat:
+            self.assertTrue(heartbeat.lost.wait(5))
+
+        with self.assertRaises(LeaseLostError):
+            heartbeat.check()
+
+    @patch(
+        "showings.leases.acquire_lease",
+        side_effect=[OperationalError("database is locked"), True, True],
+    )
+    def test_locked_database_is_retried(self, mock_acquire_lease):
+        with LeaseHeartbeat("refresh", "a", 60, interval=0.01) as heartbeat:
+            while mock_acquire_lease.call_count < 3:
+                self.assertFalse(heartbeat.lost.wait(0.01))
+
+        self.assertFalse(heartbeat.lost.is_set())
+        heartbeat.check()
+
+    @patch(
+        "showings.leases.acquire_lease",
+        side_effect=OperationalError("database is locked"),
+    )
+    def test_locked_database_until_lease_expired(self, mock_acquire_lease):
+        with LeaseHeartbeat("refresh", "a", 0.05, interval=0.01) as heartbeat:
+            self.assertTrue(heartbeat.lost.wait(5))
+
+        self.assertGreater(mock_acquire_lease.call_count, 1)
+        with self.assertRaises(LeaseLostError):
+            heartbeat.check()
+
+    @patch(
+        "showings.leases.acquire_lease",
+        side_effect=[OperationalError("database is locked"), False],
+    )
+    def test_renew(self, mock_acquire_lease):
+        heartbeat = LeaseHeartbeat("refresh", "a", 60)
+
+        self.assertTrue(heartbeat.renew())
+        self.assertFalse(heartbeat.renew())
+        self.assertFalse(heartbeat.renew())
+        self.assertEqual(mock_acquire_lease.call_count, 2)
@@ -0,0 +1,67 @@
+from datetime import date, time
+
+from django.test import TestCase
+from django.utils import timezone
+from showings.models import Location, Movie, Showing
+from showings.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+class TestCursor(TestCase):
+    def test_round_trip(self):
+        position = (date(2024, 3, 20), time(14, 30), 42)
+        self.assertEqual(decode_cursor(encode_cursor(position)), position)
+
+    def test_invalid_cursor(self):
+        for cursor in ("", "not a cursor", "MjAyNHwxNHw="):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+class TestKeysetPage(TestCase):
+    def setUp(self):
+        location = Location.objects.create(
+            name="Taj Mall", city="Amman", address="Default Address"
+        )
+        movies = [
+            Movie.objects.create(title=title, normalized_title=title, taj_id=title)
+            for title in ("dune", "wonka", "barbie")
+        ]
+        today = timezone.now().date()
+        # Several showings share a (date, time), so pages must break ties by id.
+        for movie in movies:
+            for showing_time in ("14:00", "18:00"):
+                Showing.objects.create(
+                    movie=movie,
+                    location=location,
+                    date=today,
+                    time=showing_time,
+                    is_showing=True,
+                )
+        self.showings = Showing.objects.values("id", "date", "time")
+
+    def test_pages_cover_all_rows_in_order(self):
+        ids, after, pages = [], None, 0
+        while True:
+            rows, after = keyset_page(self.showings, after, limit=4)
+            ids += [row["id"] for row in rows]
+            pages += 1
+            if after is None:
+                break
+
+        expected = list(
+            self.showings.order_by("date", "time", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 2)
+
+    def test_exact_last_page_has_no_next(self):
+        rows, after = keyset_page(self.showings, None, limit=6)
+        self.assertEqual(len(rows), 6)
+        self.assertIsNone(after)
+
+    def test_one_query_per_page(self):
+        first, after = keyset_page(self.showings, None, limit=2)
+        with self.assertNumQueries(1):
+            rows, _ = keyset_page(self.showings, after, limit=2)
+        self.assertEqual(len(rows), 2)
+        self.assertGreater(rows[0]["id"], first[-1]["id"])
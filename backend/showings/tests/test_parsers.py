@@ -1,13 +1,22 @@
 import os
 import unittest
 from enum import Enum
-
-from showings.errors import (
-    ElementNotFoundError,
-    InvalidFormatError,
-    ParserError,
+from unittest.mock import patch
+
+from showings.errors import ElementNotFoundError, InvalidFormatError, ParserError
+from showings.parsers import (
+    PRIME_MOVIES_STRAINER,
+    TAJ_MOVIES_STRAINER,
+    GrandParser,
+    LxmlGrandParser,
+    LxmlPrimeParser,
+    LxmlTajParser,
+    PrimeParser,
+    TajParser,
+    _partial_soup,
+    _partial_tree,
+    get_parser,
 )
-from showings.parsers import GrandParser, PrimeParser, TajParser
 
 
 def load_test_data(filename: str) -> bytes:
@@ -198,6 +207,31 @@ class TestTajParser(unittest.TestCase):
             "[TajParser] element_not_found: No valid showing times found in the page",
         )
 
+    def test_parse_showings_from_title_page_success(self):
+        showing_dates = self.parser.parse_showing_dates_from_title_page(self.dates_html)
+        showings = self.parser.parse_showing_times_from_title_page(
+            self.dates_html, showing_dates
+        )
+        result = self.parser.parse_showings_from_title_page(self.dates_html)
+        self.assertEqual(result, (showing_dates, showings))
+
+    def test_parse_showings_from_title_page_no_dates(self):
+        with self.assertRaises(ParserError) as cm:
+            self.parser.parse_showings_from_title_page(b"invalid html")
+        self.assertEqual(
+            str(cm.exception),
+            "[TajParser] element_not_found: No booking dates container found in the page",
+        )
+
+    def test_parse_showings_from_title_page_no_times(self):
+        html = b"<html><body><div id='booking-dates'><a href='#d1'>Mon 1</a></div></body></html>"
+        with self.assertRaises(ParserError) as cm:
+            self.parser.parse_showings_from_title_page(html)
+        self.assertEqual(
+            str(cm.exception),
+            "[TajParser] element_not_found: No valid showing times found in the page",
+        )
+
     def test_format_parsed_showing_dates_success(self):
         parsed_dates = [
             {"date": "Sun  23", "date_id": "#date-319"},
@@ -321,6 +355,196 @@ class TestPrimeParser(unittest.TestCase):
             "[PrimeParser] parser_error: 'datetime'",
         )
 
+    def test_parse_showings_from_title_page_missing_time(self):
+        # The message of an unexpected error comes from the backend itself.
+        html = "<html><body><div class='film-item'><h3 class='film-title'>Theater</h3></div></body></html>"
+        with self.assertRaisesRegex(ParserError, r"^\[PrimeParser\] parser_error: "):
+            self.parser.parse_showings_from_title_page(html)
+
+
+class TestLxmlGrandParser(TestGrandParser):
+    def setUp(self):
+        super().setUp()
+        self.parser = LxmlGrandParser()
+
+
+class TestLxmlTajParser(TestTajParser):
+    def setUp(self):
+        super().setUp()
+        self.parser = LxmlTajParser()
+
+    def test_parse_titles_from_titles_page_missing_link(self):
+        # The message of an unexpected error comes from the backend itself.
+        html = b"<html><body><div class='prs_upcom_slider_slides_wrapper'><div class='prs_upcom_movie_content_box'></div></div></body></html>"
+        with self.assertRaisesRegex(ParserError, r"^\[TajParser\] parser_error: "):
+            self.parser.parse_titles_from_titles_page(html)
+
+
+class TestLxmlPrimeParser(TestPrimeParser):
+    def setUp(self):
+        super().setUp()
+        self.parser = LxmlPrimeParser()
+
+    def test_parse_titles_from_titles_page_missing_href(self):
+        html = b"<html><body><article id='movies-list'><div class='title-wrapper'><h3>Title</h3></div></article></body></html>"
+        with self.assertRaisesRegex(ParserError, r"^\[PrimeParser\] parser_error: "):
+            self.parser.parse_titles_from_titles_page(html)
+
+
+class TestParserBackendParity(unittest.TestCase):
+    """The lxml backend must return exactly what the bs4 backend returns."""
+
+    def assert_same_result(self, source, method, *args):
+        expected = getattr(get_parser(source, "bs4"), method)(*args)
+        self.assertEqual(getattr(get_parser(source, "lxml"), method)(*args), expected)
+
+    def assert_same_error(self, source, method, *args):
+        with self.assertRaises(ParserError) as expected:
+            getattr(get_parser(source, "bs4"), method)(*args)
+        with self.assertRaises(ParserError) as cm:
+            getattr(get_parser(source, "lxml"), method)(*args)
+        self.assertIs(type(cm.exception), type(expected.exception))
+        self.assertEqual(cm.exception.code, expected.exception.code)
+
+    def test_grand_pages(self):
+        self.assert_same_result(
+            "grand",
+            "parse_titles_from_titles_page",
+            load_test_data("grand_titles_page.html"),
+        )
+        self.assert_same_result(
+            "grand",
+            "parse_showing_dates",
+            load_test_data("grand_title_showing_dates_page.html"),
+        )
+        self.assert_same_result(
+            "grand",
+            "parse_showing_times",
+            load_test_data("grand_title_showing_times_page.html"),
+        )
+
+    def test_taj_pages(self):
+        title_page = load_test_data("taj_title_showings_page.html")
+        self.assert_same_result(
+            "taj",
+            "parse_titles_from_titles_page",
+            load_test_data("taj_titles_page.html"),
+        )
+        self.assert_same_result(
+            "taj", "parse_showing_dates_from_title_page", title_page
+        )
+        showing_dates = TajParser.parse_showing_dates_from_title_page(title_page)
+        self.assert_same_result(
+            "taj", "parse_showing_times_from_title_page", title_page, showing_dates
+        )
+        self.assert_same_result("taj", "parse_showings_from_title_page", title_page)
+
+    def test_prime_pages(self):
+        self.assert_same_result(
+            "prime",
+            "parse_titles_from_titles_page",
+            load_test_data("prime_titles_page.html"),
+        )
+        self.assert_same_result(
+            "prime",
+            "parse_showings_from_title_page",
+            load_test_data("prime_title_showings_page.html"),
+        )
+
+    def test_prime_showings_errors(self):
+        for html in (
+            b"<html><body><div class='film-item'><h3 class='film-title'>Theater</h3></div></body></html>",
+            b"<html><body><div class='film-item'><h3 class='film-title'>Theater</h3><time></time></div></body></html>",
+            b"<html><body><div class='film-item'><h3 class='film-title'>Theater</h3><time datetime='invalid'></time></div></body></html>",
+            b"<html><body><div class='film-item'><time datetime='2024-03-20T18:30:00'></time></div></body></html>",
+        ):
+            with self.subTest(html=html):
+                self.assert_same_error("prime", "parse_showings_from_title_page", html)
+
+    def test_get_parser(self):
+        self.assertIs(get_parser("grand", "bs4"), GrandParser)
+        self.assertIs(get_parser("prime", "lxml"), LxmlPrimeParser)
+
+
+class TestPartialParsing(unittest.TestCase):
+    """Partial parsing must not change what the titles parsers return."""
+
+    page = (
+        b"<html><head><script>var a = 1;</script></head><body>"
+        b"<nav><a href='/'>Home</a></nav>"
+        b"<article id='movies-list'><div class='title-wrapper'>"
+        b"<a href='/movie/1abc'><h3>The Matrix</h3></a></div></article>"
+        b"<footer><a href='/about'>About</a></footer></body></html>"
+    )
+
+    def assert_same_titles(self, source, filename):
+        titles_page = load_test_data(filename)
+        for backend in ("bs4", "lxml"):
+            parse = get_parser(source, backend).parse_titles_from_titles_page
+            with patch("showings.parsers.PARSER_PARTIAL_PARSING", False):
+                expected = parse(titles_page)
+            with patch("showings.parsers.PARSER_PARTIAL_PARSING", True):
+                self.assertEqual(parse(titles_page), expected)
+
+    def test_taj_titles_page(self):
+        self.assert_same_titles("taj", "taj_titles_page.html")
+
+    def test_prime_titles_page(self):
+        self.assert_same_titles("prime", "prime_titles_page.html")
+
+    @patch("showings.parsers.PARSER_PARTIAL_PARSING", True)
+    def test_taj_strainer_matches_class_tokens(self):
+        soup = _partial_soup(
+            load_test_data("taj_titles_page.html"), TAJ_MOVIES_STRAINER
+        )
+        self.assertEqual(
+            [div["class"] for div in soup.find_all("div", recursive=False)],
+            [
+                ["prs_upcom_slider_slides_wrapper"],
+                ["prs_upcom_slider_slides_wrapper", "myowl"],
+            ],
+        )
+
+    def test_taj_titles_container_with_several_classes(self):
+        titles_page = load_test_data("taj_titles_page.html").replace(
+            b'class="prs_upcom_slider_slides_wrapper">',
+            b'class="prs_upcom_slider_slides_wrapper featured">',
+        )
+        for partial in (False, True):
+            with self.subTest(partial=partial), patch(
+                "showings.parsers.PARSER_PARTIAL_PARSING", partial
+            ):
+                self.assertEqual(
+                    TajParser.parse_titles_from_titles_page(titles_page),
+                    TajParser.parse_titles_from_titles_page(
+                        load_test_data("taj_titles_page.html")
+                    ),
+                )
+
+    @patch("showings.parsers.PARSER_PARTIAL_PARSING", True)
+    def test_soup_only_contains_target(self):
+        soup = _partial_soup(self.page, PRIME_MOVIES_STRAINER)
+        self.assertIsNotNone(soup.find("article", id="movies-list"))
+        self.assertIsNone(soup.find("script"))
+        self.assertIsNone(soup.find("footer"))
+
+    @patch("showings.parsers.PARSER_PARTIAL_PARSING", True)
+    def test_tree_stops_after_target(self):
+        # The page is read in chunks, so stopping only shows on large pages.
+        footer = b"<footer>" + b"<p>About</p>" * 20000 + b"</footer></body></html>"
+        article = _partial_tree(
+            self.page.replace(b"</body></html>", footer),
+            None,
+            "article",
+            lambda element: element.get("id") == "movies-list",
+        )
+        self.assertEqual(article.xpath("string()"), "The Matrix")
+        self.assertLess(len(article.getroottree().xpath("//footer/p")), 20000)
+
+    @patch("showings.parsers.PARSER_PARTIAL_PARSING", True)
+    def test_tree_empty_page(self):
+        self.assertIsNone(_partial_tree(b"", None, "article", lambda element: True))
+
 
 class ErrorCode(Enum):
     SERVICE_ERROR = "service_error"
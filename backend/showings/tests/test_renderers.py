@@ -0,0 +1,66 @@
+import decimal
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from showings.renderers import FastJSONRenderer
+
+
+class TestFastJSONRenderer(SimpleTestCase):
+    def assertRendersIdentically(self, data, *args):
+        self.assertEqual(
+            FastJSONRenderer().render(data, *args), JSONRenderer().render(data, *args)
+        )
+
+    def test_showings_payload(self):
+        self.assertRendersIdentically(
+            {
+                "status": "success",
+                "count": 2,
+                "showings": [
+                    {
+                        "movie__title": "Amélie",
+                        "location__name": "Taj Mall",
+                        "date": date(2024, 3, 20),
+                        "time": time(14, 30),
+                        "url": "https://tajcinemas.com/movie/1",
+                    },
+                    {
+                        "movie__title": "Dune \u2028 Part\u2029Two",
+                        "location__name": "Grand Cinema City Mall",
+                        "date": date(2024, 3, 21),
+                        "time": time(9, 5, 30, 120),
+                        "url": None,
+                    },
+                ],
+            }
+        )
+
+    def test_other_types(self):
+        for value in (
+            datetime(2024, 3, 20, 14, 30, 15, 250, tzinfo=timezone.utc),
+            datetime(2024, 3, 20, 14, 30, tzinfo=timezone(timedelta(hours=3))),
+            datetime(2024, 3, 20, 14, 30),
+            timedelta(hours=1, seconds=3),
+            decimal.Decimal("1.25"),
+            uuid.UUID(int=1),
+            gettext_lazy("Refresh queued"),
+            {1: "one", "two": [True, False, None, 2.5]},
+            (1, 2),
+            2**70,
+        ):
+            with self.subTest(value=value):
+                self.assertRendersIdentically({"value": value})
+
+    def test_none(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_indented(self):
+        self.assertRendersIdentically({"a": [1, 2]}, "application/json; indent=4", {})
+
+    def test_without_orjson(self):
+        with patch("showings.renderers.orjson", None):
+            self.assertRendersIdentically({"date": date(2024, 3, 20)})
@@ -0,0 +1,182 @@
+import random
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase
+from django.utils import timezone
+from showings.errors import ServiceError
+from showings.jobs import REFRESH_LEASE, source_refresh_lease
+from showings.leases import acquire_lease, lease_owner
+from showings.scheduling import RefreshScheduler, scheduled_refreshes
+from showings.services import ShowingService
+
+SCHEDULE = {
+    "grand": [(2, 100), (None, 1000)],
+    "taj": [(None, 500)],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestScheduledRefreshes(TestCase):
+    def test_horizons_cover_consecutive_dates(self):
+        refreshes = scheduled_refreshes({"grand": [(2, 100), (7, 500), (None, 1000)]})
+        today = date(2024, 3, 20)
+
+        self.assertEqual(
+            [refresh.date_range(today) for refresh in refreshes],
+            [
+                (date(2024, 3, 20), date(2024, 3, 21)),
+                (date(2024, 3, 22), date(2024, 3, 26)),
+                (date(2024, 3, 27), None),
+            ],
+        )
+        self.assertEqual([refresh.interval for refresh in refreshes], [100, 500, 1000])
+
+
+@patch.object(ShowingService, "refresh_source", return_value=([], []))
+class TestRefreshScheduler(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = RefreshScheduler(
+            SCHEDULE, jitter=0.1, clock=self.clock, rng=random.Random(0)
+        )
+
+    def ran(self, mock_refresh_source):
+        runs = [call.args for call in mock_refresh_source.call_args_list]
+        mock_refresh_source.reset_mock()
+        return runs
+
+    def test_first_runs_are_staggered_within_jitter(self, mock_refresh_source):
+        next_runs = [refresh.next_run for refresh in self.scheduler.refreshes]
+
+        self.assertEqual(len(set(next_runs)), len(next_runs))
+        for refresh in self.scheduler.refreshes:
+            self.assertLessEqual(refresh.next_run, 0.1 * refresh.interval)
+
+    def test_sources_and_horizons_run_on_their_own_cadence(self, mock_refresh_source):
+        today = timezone.now().date()
+        runs = []
+        for self.clock.now in range(0, 2001, 10):
+            self.scheduler.run_pending()
+            runs += self.ran(mock_refresh_source)
+
+        near = ("grand", today, today + timedelta(days=1))
+        far = ("grand", today + timedelta(days=2), None)
+        taj = ("taj", today, None)
+        self.assertEqual(set(runs), {near, far, taj})
+        self.assertTrue(18 <= runs.count(near) <= 23)
+        self.assertIn(runs.count(far), (2, 3))
+        self.assertTrue(4 <= runs.count(taj) <= 5)
+
+    def test_intervals_are_jittered(self, mock_refresh_source):
+        refresh = self.scheduler.refreshes[0]
+        intervals = {self.scheduler.next_interval(refresh) for _ in range(20)}
+
+        self.assertGreater(len(intervals), 1)
+        self.assertTrue(all(90 <= interval <= 110 for interval in intervals))
+
+    def test_run_all(self, mock_refresh_source):
+        self.assertEqual(self.scheduler.run_all(), 3)
+        self.assertEqual(len(self.ran(mock_refresh_source)), 3)
+        self.assertGreater(self.scheduler.seconds_until_next_run(), 0)
+
+    def test_skipped_during_full_refresh(self, mock_refresh_source):
+        acquire_lease(REFRESH_LEASE, "1", 60)
+
+        self.assertFalse(self.scheduler.run(self.scheduler.refreshes[0]))
+        mock_refresh_source.assert_not_called()
+        self.assertIsNone(lease_owner(source_refresh_lease("grand")))
+
+    def test_skipped_while_source_is_refreshed(self, mock_refresh_source):
+        acquire_lease(source_refresh_lease("grand"), "other", 60)
+
+        self.assertFalse(self.scheduler.run(self.scheduler.refreshes[0]))
+        self.assertTrue(self.scheduler.run(self.scheduler.refreshes[2]))
+        self.assertEqual([run[0] for run in self.ran(mock_refresh_source)], ["taj"])
+
+    def test_holds_source_lease_while_running(self, mock_refresh_source):
+        owners = []
+        mock_refresh_source.side_effect = lambda *args: owners.append(
+            lease_owner(source_refresh_lease("grand"))
+        ) or ([], [])
+
+        self.scheduler.run(self.scheduler.refreshes[0])
+
+        self.assertIsNotNone(owners[0])
+        self.assertIsNone(lease_owner(source_refresh_lease("grand")))
+
+    @patch("showings.scheduling.ShowingService")
+    def test_lost_source_lease_stops_refresh(self, mock_service, mock_refresh_source):
+        def refresh_source(source, start, end):
+            # Another refresh takes the lease after it expired.
+            owner = lease_owner(source_refresh_lease(source))
+            acquire_lease(source_refresh_lease(source), owner, -1)
+            acquire_lease(source_refresh_lease(source), "other", 60)
+            mock_service.call_args.kwargs["progress"]("showings", {}, {})
+            return [], []
+
+        mock_service.return_value.refresh_source.side_effect = refresh_source
+
+        with self.assertLogs("showings.scheduling", "ERROR") as logs:
+            self.assertTrue(self.scheduler.run(self.scheduler.refreshes[0]))
+
+        self.assertIn("lost its lease", logs.output[0])
+        self.assertEqual(lease_owner(source_refresh_lease("grand")), "other")
+
+    @patch("showings.scheduling.ShowingService")
+    def test_source_refresh_survives_locked_database(
+        self, mock_service, mock_refresh_source
+    ):
+        def refresh_source(source, start, end):
+            progress = mock_service.call_args.kwargs["progress"]
+            with patch(
+                "showings.leases.acquire_lease",
+                side_effect=OperationalError("database is locked"),
+            ):
+                progress("showings", {}, {})
+            return [], []
+
+        mock_service.return_value.refresh_source.side_effect = refresh_source
+
+        with self.assertLogs("showings.scheduling", "INFO") as logs:
+            self.assertTrue(self.scheduler.run(self.scheduler.refreshes[0]))
+
+        self.assertIn("Refreshed", logs.output[-1])
+        self.assertIsNone(lease_owner(source_refresh_lease("grand")))
+
+    def test_failed_refresh_is_rescheduled(self, mock_refresh_source):
+        mock_refresh_source.side_effect = ServiceError("Grand is down")
+        self.clock.now = 1000
+
+        self.assertEqual(self.scheduler.run_pending(), 3)
+        self.assertTrue(
+            all(refresh.next_run > 1000 for refresh in self.scheduler.refreshes)
+        )
+        self.assertIsNone(lease_owner(source_refresh_lease("grand")))
+
+    @patch("showings.scheduling.REFRESH_SCHEDULE", SCHEDULE)
+    def test_command_once(self, mock_refresh_source):
+        out = StringIO()
+        call_command("refresh_scheduler", "--once", stdout=out)
+
+        self.assertEqual(mock_refresh_source.call_count, 3)
+        self.assertIn("Ran 3 scheduled refreshes", out.getvalue())
+
+    @patch("showings.scheduling.REFRESH_SCHEDULE", SCHEDULE)
+    @patch("showings.management.commands.refresh_scheduler.close_all_sessions")
+    def test_command_closes_sessions(
+        self, mock_close_all_sessions, mock_refresh_source
+    ):
+        call_command("refresh_scheduler", "--once", stdout=StringIO())
+
+        mock_close_all_sessions.assert_called_once_with()
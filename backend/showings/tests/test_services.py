@@ -1,9 +1,30 @@
+import asyncio
+import datetime
+import threading
+import time
 import unittest
+from datetime import date, timedelta
 from pprint import pprint
-from unittest.mock import patch
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
 
-from showings.errors import ServiceError
-from showings.services import GrandService, PrimeService, ShowingService, TajService
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from movie_showings.settings import FINGERPRINT_CACHE_ALIAS
+from rest_framework.exceptions import ValidationError
+from showings.errors import NetworkError, ServiceError
+from showings.models import ActiveShowing, Location, Movie, Showing
+from showings.services import (
+    GrandService,
+    PrimeService,
+    ShowingService,
+    TajService,
+    saved_showing_fingerprints,
+)
 
 
 class TestShowingService(unittest.TestCase):
@@ -172,6 +193,60 @@ class TestShowingService(unittest.TestCase):
         showings = self.service._get_all_showings(titles)
         self.assertEqual(showings, [])
 
+    @patch.object(GrandService, "get_showings")
+    @patch.object(TajService, "get_showings")
+    @patch.object(PrimeService, "get_showings")
+    def test__get_all_showings_source_failure_is_isolated(
+        self, mock_prime_showings, mock_taj_showings, mock_grand_showings
+    ):
+        mock_grand_showings.return_value = self.grand_showings
+        mock_taj_showings.side_effect = ServiceError("Taj is down")
+        mock_prime_showings.return_value = self.prime_showings
+
+        showings = self.service._get_all_showings(self.mixed_titles)
+
+        self.assertEqual(showings, [*self.grand_showings, *self.prime_showings])
+
+    @patch.object(GrandService, "get_titles")
+    @patch.object(TajService, "get_titles")
+    @patch.object(PrimeService, "get_titles")
+    def test__get_and_validate_titles_fetches_sources_concurrently(
+        self, mock_prime_titles, mock_taj_titles, mock_grand_titles
+    ):
+        # Every source waits for the other two; this only completes if all
+        # three are in flight at the same time.
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait_then_return(titles):
+            def get_titles():
+                barrier.wait()
+                return titles
+
+            return get_titles
+
+        mock_grand_titles.side_effect = wait_then_return(self.grand_titles)
+        mock_taj_titles.side_effect = wait_then_return(self.taj_titles)
+        mock_prime_titles.side_effect = wait_then_return(self.prime_titles)
+
+        titles = self.service._get_and_validate_titles()
+        self.assertEqual(len(titles), 3)
+
+    @patch.object(GrandService, "get_showings")
+    @patch.object(TajService, "get_showings")
+    @patch.object(PrimeService, "get_showings")
+    def test__get_all_showings_sequential(
+        self, mock_prime_showings, mock_taj_showings, mock_grand_showings
+    ):
+        service = ShowingService(concurrent=False)
+        mock_grand_showings.return_value = self.grand_showings
+        mock_taj_showings.return_value = self.taj_showings
+        mock_prime_showings.return_value = self.prime_showings
+
+        showings = service._get_all_showings(self.mixed_titles)
+
+        self.assertEqual(service.max_source_workers, 1)
+        self.assertEqual(showings, self.mixed_showings)
+
     def test_filter_titles_grand_id(self):
         titles = self.mixed_titles
         titles += self.common_titles
@@ -346,6 +421,76 @@ class TestGrandService(unittest.TestCase):
             ]
             self.assertEqual(showings, expected_showings)
 
+    def test_get_showings_within_dates(self):
+        with patch.object(
+            self.service, "get_showing_dates", return_value=self.mock_dates
+        ), patch.object(
+            self.service, "get_showing_times", return_value=["14:00"]
+        ) as mock_get_showing_times:
+            showings = self.service.get_showings(
+                self.mock_titles, start=date(2024, 3, 21)
+            )
+
+        self.assertEqual(
+            [(s["title"], s["date"]) for s in showings],
+            [("The Matrix", "2024-03-21"), ("Inception", "2024-03-21")],
+        )
+        self.assertEqual(
+            [call.args[1] for call in mock_get_showing_times.call_args_list],
+            ["2024-03-21", "2024-03-21"],
+        )
+
+    def test_get_showings_respects_concurrency_cap(self):
+        service = GrandService(max_concurrent_requests=2)
+        lock = threading.Lock()
+        in_flight = {"current": 0, "peak": 0}
+
+        def track(result):
+            def call(*args):
+                with lock:
+                    in_flight["current"] += 1
+                    in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+                time.sleep(0.01)
+                with lock:
+                    in_flight["current"] -= 1
+                return result
+
+            return call
+
+        titles = [{"title": f"Movie {i}", "grand_id": str(i)} for i in range(6)]
+        with patch.object(
+            service, "get_showing_dates", side_effect=track(self.mock_dates)
+        ), patch.object(
+            service, "get_showing_times", side_effect=track(self.mock_times)
+        ):
+            showings = service.get_showings(titles)
+
+        self.assertEqual(len(showings), 6 * 2 * 3)
+        self.assertEqual(in_flight["peak"], 2)
+
+    def test_get_showings_keeps_order_with_uneven_latency(self):
+        titles = [{"title": f"Movie {i}", "grand_id": str(i)} for i in range(4)]
+
+        def get_showing_dates(title):
+            # Later titles answer first.
+            time.sleep(0.005 * (4 - int(title["grand_id"])))
+            return [f"2024-03-2{title['grand_id']}"]
+
+        def get_showing_times(title, date):
+            return [f"1{title['grand_id']}:00"]
+
+        with patch.object(
+            self.service, "get_showing_dates", side_effect=get_showing_dates
+        ), patch.object(
+            self.service, "get_showing_times", side_effect=get_showing_times
+        ):
+            showings = self.service.get_showings(titles)
+
+        self.assertEqual(
+            [(s["title"], s["date"], s["time"]) for s in showings],
+            [(f"Movie {i}", f"2024-03-2{i}", f"1{i}:00") for i in range(4)],
+        )
+
     def test_get_showings_error(self):
         with patch.object(
             self.service, "get_titles", side_effect=Exception("Test error")
@@ -486,13 +631,9 @@ class TestTajService(unittest.TestCase):
             return_value=self.mock_showings_page,
         ), patch.object(
             self.service.parser,
-            "parse_showing_dates_from_title_page",
-            return_value=["2024-03-20"],
-        ), patch.object(
-            self.service.parser,
-            "parse_showing_times_from_title_page",
-            return_value=self.mock_showings,
-        ):
+            "parse_showings_from_title_page",
+            return_value=(["2024-03-20"], self.mock_showings),
+        ) as mock_parse:
 
             showings = self.service.get_title_showings(title)
             expected_showings = [
@@ -510,6 +651,7 @@ class TestTajService(unittest.TestCase):
                 },
             ]
             self.assertEqual(showings, expected_showings)
+            mock_parse.assert_called_once_with(self.mock_showings_page)
 
     def test_get_title_showings_error(self):
         title = {"title": "The Matrix", "taj_id": "1abc"}
@@ -553,6 +695,20 @@ class TestPrimeService(unittest.TestCase):
             ]
             self.assertEqual(showings, expected_showings)
 
+    def test_get_showings_within_dates(self):
+        mock_showings = [
+            {"date": "2024-03-20", "time": "14:00", "location": "Prime Mall"},
+            {"date": "2024-03-21", "time": "14:00", "location": "Prime Mall"},
+            {"date": "2024-03-22", "time": "14:00", "location": "Prime Mall"},
+        ]
+        with patch.object(
+            PrimeService, "get_title_showings", return_value=mock_showings
+        ):
+            showings = self.service.get_showings(
+                self.mock_titles[:1], start=date(2024, 3, 21), end=date(2024, 3, 21)
+            )
+        self.assertEqual(showings, mock_showings[1:2])
+
     def test_get_showings_error(self):
         with patch.object(
             PrimeService, "get_titles", side_effect=Exception("Test error")
@@ -617,3 +773,713 @@ class TestPrimeService(unittest.TestCase):
         ):
             with self.assertRaises(ServiceError):
                 self.service.get_title_showings(title)
+
+
+class TestAsyncServices(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.grand_service = GrandService(max_concurrent_requests=2)
+        self.mock_titles = [
+            {"title": "The Matrix", "grand_id": "1abc"},
+            {"title": "Inception", "grand_id": "2def"},
+        ]
+
+    async def test_grand_aget_showings(self):
+        in_flight = {"current": 0, "peak": 0}
+
+        async def aget_showing_times(title, date):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return ["14:00"]
+
+        with patch.object(
+            self.grand_service,
+            "aget_showing_dates",
+            AsyncMock(return_value=["2024-03-20", "2024-03-21"]),
+        ), patch.object(
+            self.grand_service, "aget_showing_times", side_effect=aget_showing_times
+        ):
+            showings = await self.grand_service.aget_showings(self.mock_titles)
+
+        self.assertEqual(
+            [(s["title"], s["date"]) for s in showings],
+            [
+                ("The Matrix", "2024-03-20"),
+                ("The Matrix", "2024-03-21"),
+                ("Inception", "2024-03-20"),
+                ("Inception", "2024-03-21"),
+            ],
+        )
+        self.assertEqual(in_flight["peak"], 2)
+
+    async def test_grand_aget_titles_client_error(self):
+        with patch.object(
+            self.grand_service.async_client,
+            "get_titles_page",
+            AsyncMock(side_effect=NetworkError("Connection refused")),
+        ):
+            with self.assertRaises(ServiceError) as exc_info:
+                await self.grand_service.aget_titles()
+        self.assertIn("Network error", str(exc_info.exception))
+
+    async def test_prime_aget_title_showings(self):
+        service = PrimeService()
+        with patch.object(
+            service.async_client,
+            "get_title_showings_page",
+            AsyncMock(return_value=b"page"),
+        ), patch.object(
+            service.parser,
+            "parse_showings_from_title_page",
+            return_value=[
+                {"date": "2024-03-20", "time": "14:00", "location": "Prime Mall"}
+            ],
+        ):
+            showings = await service.aget_title_showings(
+                {"title": "The Matrix", "prime_id": "1abc"}
+            )
+        self.assertEqual(
+            showings,
+            [
+                {
+                    "title": "1abc",
+                    "date": "2024-03-20",
+                    "time": "14:00",
+                    "location": "Prime Mall",
+                }
+            ],
+        )
+
+    async def test_prime_aget_showings_bounds_requests(self):
+        service = PrimeService(max_concurrent_requests=2)
+        titles = [{"title": f"Movie {i}", "prime_id": str(i)} for i in range(5)]
+        in_flight = {"current": 0, "peak": 0}
+
+        async def get_title_showings_page(title):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            return title["prime_id"].encode()
+
+        with patch.object(
+            service.async_client,
+            "get_title_showings_page",
+            side_effect=get_title_showings_page,
+        ), patch.object(
+            service.parser,
+            "parse_showings_from_title_page",
+            side_effect=lambda page: [
+                {"date": "2024-03-20", "time": "14:00", "location": page.decode()}
+            ],
+        ):
+            showings = await service.aget_showings(titles)
+
+        self.assertEqual([s["location"] for s in showings], ["0", "1", "2", "3", "4"])
+        self.assertEqual(in_flight["peak"], 2)
+
+    async def test_taj_aget_showings_parses_off_the_event_loop(self):
+        service = TajService(max_concurrent_requests=2)
+        titles = [{"title": "The Matrix", "taj_id": "1abc"}]
+        parse_threads = []
+
+        def parse_showings_from_title_page(page):
+            parse_threads.append(threading.get_ident())
+            return [], [{"date": "2024-03-20", "time": "14:00", "date_id": "1"}]
+
+        with patch.object(
+            service.async_client, "get_titles_page", AsyncMock(return_value=b"titles")
+        ), patch.object(
+            service.async_client,
+            "get_title_showings_page",
+            AsyncMock(return_value=b"page"),
+        ), patch.object(
+            service.parser, "parse_titles_from_titles_page", return_value=titles
+        ), patch.object(
+            service.parser,
+            "parse_showings_from_title_page",
+            side_effect=parse_showings_from_title_page,
+        ):
+            showings = await service.aget_showings()
+
+        self.assertEqual(
+            showings,
+            [
+                {
+                    "date": "2024-03-20",
+                    "time": "14:00",
+                    "title": "The Matrix",
+                    "location": "Taj Mall",
+                }
+            ],
+        )
+        self.assertNotIn(threading.get_ident(), parse_threads)
+
+    async def test_showing_service_aget_all_showings_isolates_failures(self):
+        service = ShowingService()
+        grand_showings = [
+            {
+                "title": "The Matrix",
+                "date": "2024-03-20",
+                "time": "14:00",
+                "location": "Grand Cinema City Mall",
+            }
+        ]
+        with patch.object(
+            GrandService, "aget_showings", AsyncMock(return_value=grand_showings)
+        ), patch.object(
+            TajService, "aget_showings", AsyncMock(side_effect=ServiceError("down"))
+        ), patch.object(
+            PrimeService, "aget_showings", AsyncMock(return_value=[])
+        ):
+            showings = await service._aget_all_showings(
+                [{"title": "The Matrix", "grand_id": "1abc"}]
+            )
+        self.assertEqual(showings, grand_showings)
+
+
+class SaveShowingsTestCase(TestCase):
+    def setUp(self):
+        caches[FINGERPRINT_CACHE_ALIAS].clear()
+        self.service = ShowingService()
+        self.location = Location.objects.create(
+            name="Taj Mall", city="Amman", address="Default Address"
+        )
+        self.movie = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="1"
+        )
+        self.date = timezone.now().date() + timedelta(days=1)
+
+    def showing_data(self, time, location="Taj Mall", url=None):
+        return {
+            "title": "dune",
+            "date": self.date.isoformat(),
+            "time": time,
+            "location": location,
+            "url": url,
+        }
+
+
+class TestSaveShowings(SaveShowingsTestCase):
+    def test_creates_new_showings(self):
+        saved = self.service._save_showings(
+            [self.showing_data("14:00"), self.showing_data("18:00")], [self.movie]
+        )
+        self.assertEqual(sorted(str(s.time) for s in saved), ["14:00:00", "18:00:00"])
+        self.assertTrue(all(s.is_showing for s in saved))
+        self.assertEqual(Showing.objects.count(), 2)
+
+    def test_updates_existing_showing_in_place(self):
+        showing = Showing.objects.create(
+            movie=self.movie,
+            location=self.location,
+            date=self.date,
+            time="14:00",
+            is_showing=False,
+        )
+        saved = self.service._save_showings(
+            [self.showing_data("14:00", url="https://example.com/14")],
+            [self.movie],
+        )
+        self.assertEqual([s.id for s in saved], [showing.id])
+        showing.refresh_from_db()
+        self.assertTrue(showing.is_showing)
+        self.assertEqual(showing.url, "https://example.com/14")
+        self.assertEqual(Showing.objects.count(), 1)
+
+    def test_unchanged_rows_are_not_written(self):
+        showing = Showing.objects.create(
+            movie=self.movie,
+            location=self.location,
+            date=self.date,
+            time="14:00",
+            is_showing=True,
+        )
+        saved = self.service._save_showings([self.showing_data("14:00")], [self.movie])
+        self.assertEqual([s.id for s in saved], [showing.id])
+        self.assertEqual(
+            Showing.objects.get(id=showing.id).updated_at, showing.updated_at
+        )
+
+    def test_sweeps_showings_missing_from_refresh(self):
+        stale = Showing.objects.create(
+            movie=self.movie,
+            location=self.location,
+            date=self.date,
+            time="10:00",
+            is_showing=True,
+        )
+        self.service._save_showings([self.showing_data("14:00")], [self.movie])
+        stale.refresh_from_db()
+        self.assertFalse(stale.is_showing)
+
+    def test_creates_missing_locations_once(self):
+        self.service._save_showings(
+            [
+                self.showing_data("14:00", location="Prime Mall"),
+                self.showing_data("18:00", location="Prime Mall"),
+            ],
+            [self.movie],
+        )
+        self.assertEqual(Location.objects.filter(name="Prime Mall").count(), 1)
+        self.assertEqual(Showing.objects.filter(location__name="Prime Mall").count(), 2)
+
+    def test_query_count_does_not_grow_with_showings(self):
+        def count_queries(times):
+            caches[FINGERPRINT_CACHE_ALIAS].clear()
+            showings = [self.showing_data(t) for t in times]
+            with CaptureQueriesContext(connection) as queries:
+                list(self.service._save_showings(showings, [self.movie]))
+            return len(queries)
+
+        few = count_queries(["10:00", "11:00"])
+        many = count_queries(
+            [f"{h:02d}:{m:02d}" for h in range(12, 24) for m in (0, 30)]
+        )
+        self.assertEqual(few, many)
+
+
+class TestSaveMovies(TestCase):
+    def setUp(self):
+        self.service = ShowingService()
+        self.titles = [
+            {
+                "title": "Dune",
+                "normalized_title": "dune",
+                "taj_id": "1",
+                "title_taj": "DUNE",
+            },
+            {
+                "title": "Inception",
+                "normalized_title": "inception",
+                "grand_id": "2",
+                "title_grand": "Inception",
+            },
+        ]
+
+    def test_creates_movies_with_ids(self):
+        movies = self.service._save_movies(self.titles)
+        self.assertEqual([m.normalized_title for m in movies], ["dune", "inception"])
+        self.assertTrue(all(m.id for m in movies))
+        self.assertEqual(movies[0].taj_title, "DUNE")
+        self.assertEqual(Movie.objects.count(), 2)
+
+    def test_updates_existing_movie(self):
+        movie = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="old"
+        )
+        movies = self.service._save_movies(self.titles)
+        self.assertEqual(movies[0].id, movie.id)
+        self.assertEqual(movies[0].taj_id, "1")
+        self.assertEqual(Movie.objects.count(), 2)
+
+    def test_query_count_does_not_grow_with_movies(self):
+        titles = [
+            {"title": f"Movie {i}", "normalized_title": f"movie {i}", "taj_id": str(i)}
+            for i in range(20)
+        ]
+        with CaptureQueriesContext(connection) as few:
+            self.service._save_movies(titles[:2])
+        with CaptureQueriesContext(connection) as many:
+            self.service._save_movies(titles)
+        self.assertEqual(len(few), len(many))
+
+    def test_invalid_title_saves_nothing(self):
+        titles = self.titles + [{"title": "No ids", "normalized_title": "no ids"}]
+        with self.assertRaises(ValidationError):
+            self.service._save_movies(titles)
+        self.assertEqual(Movie.objects.count(), 0)
+
+
+class TestMatchTitlesIncrementally(TestCase):
+    def setUp(self):
+        self.service = ShowingService()
+        self.matrix = Movie.objects.create(
+            title="The Matrix",
+            normalized_title="the matrix",
+            grand_id="1abc",
+            grand_title="The Matrix",
+        )
+        self.dune = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="1", taj_title="Dune"
+        )
+        Showing.objects.create(
+            movie=self.dune,
+            location=Location.objects.create(
+                name="Taj Mall", city="Amman", address="Default Address"
+            ),
+            date=timezone.now().date(),
+            time="14:00",
+            is_showing=True,
+        )
+
+    def test_linked_titles_are_not_fuzzy_matched(self):
+        with patch.object(
+            self.service.title_matching_service, "match_titles"
+        ) as mock_match_titles:
+            titles = self.service._match_titles(
+                [{"title": "The Matrix", "grand_id": "1abc"}],
+                [{"title": "DUNE", "taj_id": "1"}],
+                [],
+            )
+        mock_match_titles.assert_not_called()
+        self.assertEqual(
+            [(t["normalized_title"], t["grand_id"], t["taj_id"]) for t in titles],
+            [("the matrix", "1abc", ""), ("dune", "", "1")],
+        )
+
+    def test_new_titles_are_matched_against_saved_movies(self):
+        titles = self.service._match_titles(
+            [{"title": "The Matrix", "grand_id": "1abc"}],
+            [{"title": "Wonka", "taj_id": "2"}],
+            [{"title": "Dune!", "prime_id": "x9"}],
+        )
+        self.assertEqual(
+            [
+                (t["normalized_title"], t["grand_id"], t["prime_id"], t["taj_id"])
+                for t in titles
+            ],
+            [
+                ("the matrix", "1abc", "", ""),
+                ("dune", "", "x9", ""),
+                ("wonka", "", "", "2"),
+            ],
+        )
+
+    def test_known_titles_query_count_does_not_grow_with_catalog(self):
+        source_titles = (
+            [{"title": "The Matrix", "grand_id": "1abc"}],
+            [{"title": "Wonka", "taj_id": "2"}],
+            [],
+        )
+        with CaptureQueriesContext(connection) as few:
+            self.service._known_titles(
+                dict(zip(("grand", "taj", "prime"), source_titles))
+            )
+        Movie.objects.bulk_create(
+            Movie(title=f"Movie {i}", normalized_title=f"movie {i}", prime_id=str(i))
+            for i in range(20)
+        )
+        with CaptureQueriesContext(connection) as many:
+            known_titles = self.service._known_titles(
+                dict(zip(("grand", "taj", "prime"), source_titles))
+            )
+        self.assertEqual(len(few), 2)
+        self.assertEqual(len(few), len(many))
+        # Dune already has a Taj id, so it cannot match the new Taj title,
+        # and movies without active showings are not candidates.
+        self.assertEqual(
+            [title["normalized_title"] for title in known_titles], ["the matrix"]
+        )
+
+    @patch("showings.services.TITLE_MATCH_INCREMENTAL", False)
+    def test_full_matching(self):
+        with patch.object(
+            self.service.title_matching_service, "match_titles", return_value=[]
+        ) as mock_match_titles:
+            self.service._match_titles([], [], [])
+        mock_match_titles.assert_called_once_with([], [], [])
+
+
+class TestShowingServiceProgress(unittest.TestCase):
+    @patch.object(GrandService, "get_titles")
+    @patch.object(TajService, "get_titles")
+    @patch.object(PrimeService, "get_titles")
+    @patch.object(GrandService, "get_showings")
+    @patch.object(TajService, "get_showings")
+    @patch.object(PrimeService, "get_showings")
+    def test_reports_counts_and_errors_per_source(
+        self,
+        mock_prime_showings,
+        mock_taj_showings,
+        mock_grand_showings,
+        mock_prime_titles,
+        mock_taj_titles,
+        mock_grand_titles,
+    ):
+        reports = []
+        service = ShowingService(
+            progress=lambda *report: reports.append(report), concurrent=False
+        )
+        mock_grand_titles.return_value = [{"title": "Dune", "grand_id": "1"}]
+        mock_taj_titles.return_value = [{"title": "Wonka", "taj_id": "2"}]
+        mock_prime_titles.return_value = []
+        mock_grand_showings.return_value = [
+            {
+                "title": "Dune",
+                "date": "2024-03-20",
+                "time": "14:00",
+                "location": "Grand Cinema City Mall",
+            }
+        ]
+        mock_taj_showings.side_effect = ServiceError("Taj is down")
+        mock_prime_showings.return_value = []
+
+        titles = service._get_and_validate_titles()
+        service._get_all_showings(titles)
+
+        self.assertEqual(
+            reports,
+            [
+                (
+                    "titles",
+                    {
+                        "grand": {"titles": 1},
+                        "taj": {"titles": 1},
+                        "prime": {"titles": 0},
+                        "matched_titles": 2,
+                    },
+                    {},
+                ),
+                (
+                    "showings",
+                    {"grand": {"showings": 1}, "prime": {"showings": 0}},
+                    {"taj": "service_error: Taj is down"},
+                ),
+            ],
+        )
+
+
+class TestRefreshSource(TestCase):
+    def setUp(self):
+        caches[FINGERPRINT_CACHE_ALIAS].clear()
+        self.service = ShowingService()
+        self.grand = Location.objects.create(
+            name="Grand Cinema City Mall", city="Amman", address="Default Address"
+        )
+        self.taj = Location.objects.create(
+            name="Taj Mall", city="Amman", address="Default Address"
+        )
+        self.dune = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="1", taj_title="Dune"
+        )
+        self.today = timezone.now().date()
+
+    def showing(self, location, days, time="14:00"):
+        return Showing.objects.create(
+            movie=self.dune,
+            location=location,
+            date=self.today + timedelta(days=days),
+            time=time,
+            is_showing=True,
+        )
+
+    def refresh_grand(self, showings, start=None, end=None):
+        with patch.object(
+            GrandService,
+            "get_titles",
+            return_value=[{"title": "Dune", "grand_id": "7"}],
+        ), patch.object(
+            GrandService, "get_showings", return_value=showings
+        ) as mock_get_showings, patch.object(
+            ShowingService, "_save_movies", return_value=[self.dune]
+        ) as mock_save_movies:
+            self.service.refresh_source("grand", start, end)
+        return mock_save_movies.call_args.args[0], mock_get_showings
+
+    def test_keeps_ids_of_other_sources(self):
+        titles, mock_get_showings = self.refresh_grand([])
+
+        self.assertEqual(
+            [(t["normalized_title"], t["grand_id"], t["taj_id"]) for t in titles],
+            [("dune", "7", "1")],
+        )
+        mock_get_showings.assert_called_once_with(titles, start=None, end=None)
+
+    def test_new_id_of_a_saved_movie_keeps_its_other_ids(self):
+        self.dune.grand_id = "g-old"
+        self.dune.save()
+
+        titles, _ = self.refresh_grand([])
+
+        self.assertEqual(
+            [(t["normalized_title"], t["grand_id"], t["taj_id"]) for t in titles],
+            [("dune", "7", "1")],
+        )
+
+    def test_sweeps_only_the_source_within_dates(self):
+        tomorrow = self.today + timedelta(days=1)
+        kept = self.showing(self.grand, 1)
+        stale = self.showing(self.grand, 1, time="18:00")
+        later = self.showing(self.grand, 5)
+        other_source = self.showing(self.taj, 1)
+
+        self.refresh_grand(
+            [
+                {
+                    "title": "dune",
+                    "date": tomorrow.isoformat(),
+                    "time": "14:00",
+                    "location": "Grand Cinema City Mall",
+                }
+            ],
+            start=tomorrow,
+            end=tomorrow,
+        )
+
+        self.assertEqual(
+            dict(Showing.objects.values_list("id", "is_showing")),
+            {kept.id: True, stale.id: False, later.id: True, other_source.id: True},
+        )
+
+    def test_prime_showings_are_those_of_no_other_location(self):
+        prime = Location.objects.create(
+            name="Prime Cinemas Abdali", city="Amman", address="Default Address"
+        )
+        showings = [self.showing(location, 1) for location in (self.grand, prime)]
+
+        self.assertEqual(
+            list(Showing.objects.filter(self.service._source_showings_filter("prime"))),
+            showings[1:],
+        )
+
+    def test_invalidates_fingerprints_of_changed_groups(self):
+        tomorrow = self.today + timedelta(days=1)
+        showing_data = {
+            "title": "dune",
+            "date": tomorrow.isoformat(),
+            "time": "14:00",
+            "location": "Grand Cinema City Mall",
+        }
+        self.service._save_showings([showing_data], [self.dune])
+        group_key = "Grand Cinema City Mall:dune"
+        self.assertTrue(saved_showing_fingerprints.get(group_key, [showing_data])[0])
+
+        # Unchanged showings keep the fingerprint of the full refresh.
+        self.refresh_grand([showing_data], start=tomorrow, end=tomorrow)
+        self.assertTrue(saved_showing_fingerprints.get(group_key, [showing_data])[0])
+
+        # A sweep does not, so the next full refresh writes the group again.
+        self.refresh_grand([], start=tomorrow, end=tomorrow)
+        self.assertFalse(saved_showing_fingerprints.get(group_key, [showing_data])[0])
+
+    def test_unknown_source(self):
+        with self.assertRaises(ServiceError):
+            self.service.refresh_source("vox")
+
+
+class TestActiveShowings(SaveShowingsTestCase):
+    def active_showings(self):
+        return list(
+            ActiveShowing.objects.values_list(
+                "title", "location_name", "date", "time", "url"
+            )
+        )
+
+    def assert_in_sync(self):
+        """Assert that the active showings match a rebuild from the showings."""
+        active_showings = list(ActiveShowing.objects.values())
+        self.service.rebuild_active_showings()
+        self.assertEqual(active_showings, list(ActiveShowing.objects.values()))
+
+    def test_save_adds_showings(self):
+        self.service._save_showings(
+            [self.showing_data("14:00", url="https://tajcinemas.com/dune")],
+            [self.movie],
+        )
+
+        showing = Showing.objects.get()
+        active_showing = ActiveShowing.objects.get()
+        self.assertEqual(active_showing.id, showing.id)
+        self.assertEqual(
+            self.active_showings(),
+            [
+                (
+                    "Dune",
+                    "Taj Mall",
+                    self.date,
+                    datetime.time(14),
+                    "https://tajcinemas.com/dune",
+                )
+            ],
+        )
+        self.assert_in_sync()
+
+    def test_save_patches_changed_showings(self):
+        self.service._save_showings(
+            [self.showing_data("14:00"), self.showing_data("18:00")], [self.movie]
+        )
+
+        self.service._save_showings(
+            [
+                self.showing_data("14:00", url="https://tajcinemas.com/dune"),
+                self.showing_data("21:00"),
+            ],
+            [self.movie],
+        )
+
+        self.assertEqual(
+            [(t, url) for _, _, _, t, url in self.active_showings()],
+            [
+                (datetime.time(14), "https://tajcinemas.com/dune"),
+                (datetime.time(21), None),
+            ],
+        )
+        self.assert_in_sync()
+
+    def test_scoped_save_only_patches_its_scope(self):
+        grand_data = self.showing_data("14:00", location="Grand Cinema City Mall")
+        self.service._save_showings(
+            [grand_data, self.showing_data("14:00")], [self.movie]
+        )
+
+        self.service._save_showings(
+            [], [self.movie], scope=Q(location__name="Grand Cinema City Mall")
+        )
+
+        self.assertEqual(
+            [location for _, location, _, _, _ in self.active_showings()],
+            ["Taj Mall"],
+        )
+        self.assert_in_sync()
+
+    def test_save_removes_past_showings(self):
+        ActiveShowing.objects.create(
+            id=1000,
+            movie=self.movie,
+            location=self.location,
+            title="Dune",
+            location_name="Taj Mall",
+            date=timezone.now().date() - timedelta(days=1),
+            time="14:00",
+        )
+
+        self.service._save_showings([self.showing_data("14:00")], [self.movie])
+
+        self.assertFalse(ActiveShowing.objects.filter(id=1000).exists())
+
+    def test_renamed_movies_are_renamed(self):
+        self.service._save_showings([self.showing_data("14:00")], [self.movie])
+
+        self.service._save_movies(
+            [{"title": "Dune: Part One", "normalized_title": "dune", "taj_id": "1"}]
+        )
+
+        self.assertEqual(ActiveShowing.objects.get().title, "Dune: Part One")
+
+    def test_rebuild(self):
+        Showing.objects.create(
+            movie=self.movie, location=self.location, date=self.date, time="14:00"
+        )
+        showing = Showing.objects.create(
+            movie=self.movie,
+            location=self.location,
+            date=self.date,
+            time="18:00",
+            is_showing=True,
+        )
+
+        self.assertEqual(self.service.rebuild_active_showings(), 1)
+        self.assertEqual(ActiveShowing.objects.get().id, showing.id)
+
+    def test_reads_do_not_join(self):
+        self.service._save_showings([self.showing_data("14:00")], [self.movie])
+
+        with CaptureQueriesContext(connection) as queries:
+            showings = list(
+                self.service.filter_active_showings(movie_id=self.movie.id).values()
+            )
+
+        self.assertEqual(len(showings), 1)
+        self.assertNotIn("JOIN", queries[0]["sql"])
@@ -0,0 +1,52 @@
+from datetime import date, time
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from showings.renderers import FastJSONRenderer
+from showings.streaming import IncrementalJSONEncoder
+
+
+class TestIncrementalJSONEncoder(SimpleTestCase):
+    rows = [
+        {
+            "movie__title": f"Movie {i} \u2028 caf\u00e9",
+            "location__name": "Taj Mall",
+            "date": date(2024, 3, 20),
+            "time": time(14, i),
+            "url": None,
+        }
+        for i in range(7)
+    ]
+
+    def render(self, rows):
+        return JSONRenderer().render(
+            {"status": "success", "showings": rows, "count": len(rows)}
+        )
+
+    def test_identical_to_renderer(self):
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            for chunk_size in (1, 3, 7, 100):
+                for rows in (self.rows, self.rows[:1], []):
+                    with self.subTest(
+                        renderer=renderer, chunk_size=chunk_size, rows=len(rows)
+                    ):
+                        chunks = IncrementalJSONEncoder(renderer).iter_object(
+                            {"status": "success"}, "showings", rows, chunk_size
+                        )
+                        self.assertEqual(b"".join(chunks), self.render(rows))
+
+    def test_yields_chunks_lazily(self):
+        consumed = []
+
+        def rows():
+            for row in self.rows:
+                consumed.append(row)
+                yield row
+
+        chunks = IncrementalJSONEncoder().iter_object(
+            {"status": "success"}, "showings", rows(), chunk_size=2
+        )
+        next(chunks)
+        self.assertEqual(consumed, [])
+        next(chunks)
+        self.assertEqual(len(consumed), 2)
@@ -1,7 +1,12 @@
+import subprocess
+import sys
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
 import pandas as pd
-from showings.title_matching import TitleMatchService
+from fuzzywuzzy import fuzz, process
+from showings.title_matching import DisjointSet, NGramIndex, TitleMatchService
 
 
 class TestTitleMatchService(unittest.TestCase):
@@ -382,6 +387,74 @@ class TestTitleMatchService(unittest.TestCase):
         )
         self.assertEqual(merged_titles, expected)
 
+    # find_fuzzy_matches tests
+    def test_similarity_matrix(self):
+        scores = TitleMatchService.similarity_matrix(
+            ["the matrix", "the matrix 3", "dune"]
+        )
+        self.assertEqual(scores.shape, (3, 3))
+        self.assertEqual(list(scores.diagonal()), [0, 0, 0])
+        self.assertEqual(scores[0, 1], scores[1, 0])
+        self.assertGreater(scores[0, 1], 70)
+        self.assertLess(scores[0, 2], 70)
+
+    def test_find_fuzzy_matches__ordered_best_first(self):
+        titles = ["the matrix", "dune", "the matrix 3", "the matrix!"]
+        self.assertEqual(
+            TitleMatchService.find_fuzzy_matches(titles),
+            [[3, 2], [], [0, 3], [0, 2]],
+        )
+
+    def test_find_fuzzy_matches__same_as_process_extract(self):
+        titles = [
+            "the matrix",
+            "the matrix reloaded",
+            "the matrix: reloaded (arabic)",
+            "dune part two",
+            "dune: part two imax",
+            "dune",
+            "inception",
+            "inception 3d",
+            "",
+            "!!",
+        ]
+        expected = []
+        for i, title in enumerate(titles):
+            others = {j: other for j, other in enumerate(titles) if j != i}
+            found = process.extract(title, others, scorer=fuzz.ratio, limit=None)
+            expected.append([j for _, score, j in found if score > 70])
+        self.assertEqual(TitleMatchService.find_fuzzy_matches(titles), expected)
+
+    def test_find_fuzzy_matches__blocking(self):
+        titles = [
+            "the matrix",
+            "the matrix reloaded",
+            "the matrix: reloaded (arabic)",
+            "dune part two",
+            "dune: part two imax",
+            "dune",
+            "inception",
+            "inception 3d",
+        ]
+        self.assertEqual(
+            TitleMatchService.find_fuzzy_matches(titles, blocking=True),
+            TitleMatchService.find_fuzzy_matches(titles, blocking=False),
+        )
+
+    def test_ngram_index_candidate_pairs(self):
+        titles = ["the matrix", "dune part two", "the matrix 3d", "dune part 2"]
+        pairs = NGramIndex(titles).candidate_pairs()
+        self.assertEqual(pairs.tolist(), [[0, 2], [1, 3]])
+
+    def test_find_fuzzy_matches__blocking_without_candidates(self):
+        self.assertEqual(
+            TitleMatchService.find_fuzzy_matches(["dune", "wonka"], blocking=True),
+            [[], []],
+        )
+
+    def test_ngram_index_no_titles(self):
+        self.assertEqual(NGramIndex([]).candidate_pairs().shape, (0, 2))
+
     # handle_fuzzy_match_titles tests
     def test_handle_fuzzy_match_titles__no_match_found(self):
         processed_titles = [
@@ -577,3 +650,331 @@ class TestTitleMatchService(unittest.TestCase):
             TitleMatchService.match_titles(grand_titles, prime_titles, taj_titles),
             expected,
         )
+
+    # match_titles_incrementally tests
+    def test_match_titles_incrementally__resolves_known_ids(self):
+        known_titles = [
+            {
+                "title_grand": "The Matrix",
+                "grand_id": "1abc",
+                "normalized_title": "the matrix",
+                "title_prime": "",
+                "prime_id": "",
+                "title_taj": "",
+                "taj_id": "",
+                "title": "The Matrix",
+            }
+        ]
+        with patch.object(TitleMatchService, "match_titles") as mock_match_titles:
+            matched = TitleMatchService.match_titles_incrementally(
+                [{"title": "THE MATRIX (1999)", "grand_id": "1abc"}],
+                [],
+                [],
+                known_titles,
+            )
+        mock_match_titles.assert_not_called()
+        self.assertEqual(
+            matched,
+            [
+                {
+                    "title_grand": "THE MATRIX (1999)",
+                    "grand_id": "1abc",
+                    "normalized_title": "the matrix",
+                    "title_prime": "",
+                    "prime_id": "",
+                    "title_taj": "",
+                    "taj_id": "",
+                    "title": "The Matrix",
+                }
+            ],
+        )
+
+    def test_match_titles_incrementally__new_titles_join_known_titles(self):
+        known_titles = [
+            {
+                "title_grand": "The Matrix",
+                "grand_id": "1abc",
+                "normalized_title": "the matrix",
+                "title_prime": "",
+                "prime_id": "",
+                "title_taj": "",
+                "taj_id": "",
+                "title": "The Matrix",
+            },
+            {
+                "title_grand": "",
+                "grand_id": "",
+                "normalized_title": "dune",
+                "title_prime": "",
+                "prime_id": "",
+                "title_taj": "Dune",
+                "taj_id": "old",
+                "title": "Dune",
+            },
+        ]
+        matched = TitleMatchService.match_titles_incrementally(
+            [{"title": "The Matrix", "grand_id": "1abc"}],
+            [{"title": "THE MATRIX!", "prime_id": "1yts"}],
+            [{"title": "Dune ", "taj_id": "new"}, {"title": "Wonka", "taj_id": "2"}],
+            known_titles,
+        )
+        self.assertEqual(
+            matched,
+            [
+                {
+                    "title_grand": "The Matrix",
+                    "grand_id": "1abc",
+                    "normalized_title": "the matrix",
+                    "title_prime": "THE MATRIX!",
+                    "prime_id": "1yts",
+                    "title_taj": "",
+                    "taj_id": "",
+                    "title": "The Matrix",
+                },
+                # A known title listed under a new id takes the new id.
+                {
+                    "title_grand": "",
+                    "grand_id": "",
+                    "normalized_title": "dune",
+                    "title_prime": "",
+                    "prime_id": "",
+                    "title_taj": "Dune ",
+                    "taj_id": "new",
+                    "title": "Dune",
+                },
+                {
+                    "title_grand": "",
+                    "grand_id": "",
+                    "normalized_title": "wonka",
+                    "title_prime": "",
+                    "prime_id": "",
+                    "title_taj": "Wonka",
+                    "taj_id": "2",
+                    "title": "",
+                },
+            ],
+        )
+
+    def test_match_titles_incrementally__new_id_of_a_known_title(self):
+        known_titles = [
+            {
+                "title_grand": "Dune",
+                "grand_id": "g-old",
+                "normalized_title": "dune",
+                "title_prime": "",
+                "prime_id": "",
+                "title_taj": "Dune",
+                "taj_id": "t1",
+                "title": "Dune",
+            }
+        ]
+        grand_titles = [{"title": "Dune", "grand_id": "g-new"}]
+        taj_titles = [{"title": "Dune", "taj_id": "t1"}]
+
+        matched = TitleMatchService.match_titles_incrementally(
+            grand_titles, [], taj_titles, known_titles
+        )
+
+        # The same merged title as full matching; known titles keep "title".
+        self.assertEqual(
+            [{**title, "title": ""} for title in matched],
+            TitleMatchService.match_titles(grand_titles, [], taj_titles),
+        )
+        # Refreshing Grand alone links the new id to the same title.
+        self.assertEqual(
+            [
+                (t["normalized_title"], t["grand_id"])
+                for t in TitleMatchService.match_titles_incrementally(
+                    grand_titles, [], [], known_titles
+                )
+            ],
+            [("dune", "g-new")],
+        )
+
+    def test_match_titles_incrementally__without_known_titles(self):
+        self.assertEqual(
+            TitleMatchService.match_titles_incrementally(
+                self.grand_titles, self.prime_titles, self.taj_titles, []
+            ),
+            TitleMatchService.match_titles(
+                self.grand_titles, self.prime_titles, self.taj_titles
+            ),
+        )
+
+    def test_find_fuzzy_matches_in(self):
+        self.assertEqual(
+            TitleMatchService.find_fuzzy_matches_in(
+                ["the matrix", "dune"], ["dune", "the matrix 3", "the matrix!"]
+            ),
+            [[2, 1], [0]],
+        )
+        self.assertEqual(TitleMatchService.find_fuzzy_matches_in(["dune"], []), [[]])
+
+
+class TestPandasFreeMatching(unittest.TestCase):
+    def setUp(self):
+        words = ["the", "matrix", "dune", "part", "two", "wonka", "alien", "king"]
+        self.sources = [
+            [
+                {"title": f"{words[i % 8]} {words[i * 3 % 8]}", "grand_id": f"g{i}"}
+                for i in range(20)
+            ],
+            [
+                {"title": f"{words[i * 5 % 8]} {words[i % 8]}!", "prime_id": f"p{i}"}
+                for i in range(12)
+            ],
+            [
+                {
+                    "title": f"{words[i * 7 % 8].upper()} {words[i % 8]}",
+                    "taj_id": f"t{i}",
+                }
+                for i in range(25)
+            ],
+        ]
+
+    def assertSameAsPandas(self, *sources):
+        perfect = TitleMatchService.handle_perfect_match_titles(
+            *sources, use_pandas=False
+        )
+        self.assertEqual(
+            perfect,
+            TitleMatchService.handle_perfect_match_titles(*sources, use_pandas=True),
+        )
+        self.assertEqual(
+            TitleMatchService.handle_fuzzy_match_titles(
+                perfect, use_pandas=False, clustering="greedy"
+            ),
+            TitleMatchService.handle_fuzzy_match_titles(
+                perfect, use_pandas=True, clustering="greedy"
+            ),
+        )
+
+    def test_same_as_pandas(self):
+        # Duplicate normalized titles, missing sources and more than 16
+        # titles with the same number of matches.
+        grand, prime, taj = self.sources
+        self.assertSameAsPandas(grand, prime, taj)
+        self.assertSameAsPandas(grand, taj, prime)
+        self.assertSameAsPandas([], prime, taj)
+        self.assertSameAsPandas(taj)
+
+    def test_same_as_pandas__missing_values(self):
+        self.assertSameAsPandas(
+            [{"title": "Dune", "grand_id": "1"}, {"title": "Wonka", "grand_id": None}],
+            [{"title": "dune ", "prime_id": "2", "url": "/dune"}],
+        )
+
+    def test_format_merged_titles__rows(self):
+        titles_df = pd.DataFrame([{"normalized_title": "dune", "title": "Dune"}])
+        titles_df["grand_id"] = "1"
+        self.assertEqual(
+            TitleMatchService.format_merged_titles(titles_df.to_dict("records")),
+            TitleMatchService.format_merged_titles(titles_df),
+        )
+
+    def test_import_does_not_load_pandas(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, showings.title_matching; "
+                "sys.exit('pandas' in sys.modules)",
+            ],
+            cwd=Path(__file__).resolve().parents[2],
+        )
+        self.assertEqual(result.returncode, 0)
+
+
+def merged_title(title, **ids):
+    """A title in the format returned by ``format_merged_titles``."""
+    merged = {"normalized_title": title.lower(), "title": ""}
+    for source in ("grand", "prime", "taj"):
+        merged[f"{source}_id"] = ids.get(f"{source}_id", "")
+        merged[f"title_{source}"] = title if merged[f"{source}_id"] else ""
+    return merged
+
+
+class TestClusterFuzzyMatchTitles(unittest.TestCase):
+    def test_disjoint_set(self):
+        clusters = DisjointSet(5)
+        clusters.union(0, 1)
+        clusters.union(3, 4)
+        clusters.union(1, 4)
+        self.assertEqual(len({clusters.find(i) for i in range(5)}), 2)
+        self.assertEqual(clusters.find(0), clusters.find(3))
+        self.assertNotEqual(clusters.find(0), clusters.find(2))
+
+    def test_fuzzy_match_edges(self):
+        self.assertEqual(
+            TitleMatchService.fuzzy_match_edges(["wonka", "dune", "wonka 3d", "dune!"]),
+            [(100, 1, 3), (77, 0, 2)],
+        )
+
+    def test_merges_transitive_matches(self):
+        # "wonka" and "wonka 3d vip" do not match, but both match "wonka 3d".
+        titles = [
+            merged_title("Wonka", grand_id="g1"),
+            merged_title("Wonka 3D VIP", taj_id="t1"),
+            merged_title("Wonka 3D", prime_id="p1"),
+        ]
+        self.assertEqual(
+            TitleMatchService.cluster_fuzzy_match_titles(titles),
+            [
+                {
+                    "title_grand": "Wonka",
+                    "grand_id": "g1",
+                    "normalized_title": "wonka 3d",
+                    "title_prime": "Wonka 3D",
+                    "prime_id": "p1",
+                    "title_taj": "Wonka 3D VIP",
+                    "taj_id": "t1",
+                    "title": "",
+                }
+            ],
+        )
+
+    def test_one_id_per_source(self):
+        # "dune part one" matches both, best, but the other is from Grand too.
+        titles = [
+            merged_title("Dune Part Two", grand_id="g1"),
+            merged_title("Dune Part One", grand_id="g2"),
+            merged_title("Dune Part 2", prime_id="p1"),
+        ]
+        clustered = TitleMatchService.cluster_fuzzy_match_titles(titles)
+        self.assertEqual(
+            [(t["grand_id"], t["prime_id"]) for t in clustered],
+            [("g1", "p1"), ("g2", "")],
+        )
+        self.assertEqual(clustered[0]["normalized_title"], "dune part 2")
+
+    def test_does_not_depend_on_title_order(self):
+        titles = [
+            merged_title("Dune Part Two", grand_id="g1"),
+            merged_title("Dune Part Two IMAX", grand_id="g2"),
+            merged_title("Dune: Part Two", taj_id="t1"),
+            merged_title("Dune Part 2", prime_id="p1"),
+            merged_title("Wonka", grand_id="g3"),
+            merged_title("Wonka 3D", prime_id="p2"),
+            merged_title("Wonka 3D VIP", taj_id="t2"),
+        ]
+
+        def clusters(titles):
+            return {
+                frozenset(t[key] for key in ("grand_id", "prime_id", "taj_id"))
+                for t in TitleMatchService.cluster_fuzzy_match_titles(titles)
+            }
+
+        expected = clusters(titles)
+        self.assertEqual(len(expected), 3)
+        for order in ([6, 5, 4, 3, 2, 1, 0], [3, 1, 5, 0, 6, 2, 4]):
+            self.assertEqual(clusters([titles[i] for i in order]), expected)
+
+    def test_handle_fuzzy_match_titles__clustering(self):
+        titles = [merged_title("Dune", grand_id="g1")]
+        with patch.object(
+            TitleMatchService, "cluster_fuzzy_match_titles", return_value=[]
+        ) as mock_cluster:
+            TitleMatchService.handle_fuzzy_match_titles(titles, clustering="greedy")
+            mock_cluster.assert_not_called()
+            TitleMatchService.handle_fuzzy_match_titles(titles, clustering="union_find")
+            mock_cluster.assert_called_once_with(titles)
@@ -35,7 +35,7 @@ def patch_cinema_service(service_name: str, fixture_name: str):
             fixture_content = load_fixture(service_name, fixture_name)
             mock_response_obj = mock_response(fixture_content)
 
-            with patch(f"requests.post", return_value=mock_response_obj):
+            with patch("requests.Session.post", return_value=mock_response_obj):
                 return func(*args, **kwargs)
 
         return wrapper
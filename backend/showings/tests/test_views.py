@@ -1,16 +1,23 @@
-from datetime import time
+import json
+import time as time_module
+from datetime import time, timedelta
 from unittest.mock import patch
 
+from django.core.cache import caches
 from django.test import TestCase, override_settings
 from django.utils import timezone
+from movie_showings.settings import API_CACHE_ALIAS
 from rest_framework.test import APITestCase
-from showings.models import Location, Movie, Showing
+from showings.models import Location, Movie, RefreshJob, Showing
+from showings.response_cache import bump_showings_version
+from showings.services import ShowingService
 from showings.views import ShowingView
 
 
 @override_settings(ALLOWED_HOSTS=["testserver"])
 class TestShowingView(APITestCase):
     def setUp(self):
+        caches[API_CACHE_ALIAS].clear()
         # Create test data with hardcoded locations
         self.grand_location = Location.objects.create(
             name="Grand Cinema City Mall", city="Amman", address="City Mall, Amman"
@@ -60,6 +67,7 @@ class TestShowingView(APITestCase):
             is_showing=True,
             url="http://prime.com",
         )
+        ShowingService().rebuild_active_showings()
 
     def test_get_active_showings(self):
         """Test getting active showings."""
@@ -101,24 +109,343 @@ class TestShowingView(APITestCase):
         self.assertEqual(str(prime_showing["time"]), str(self.prime_showing.time))
         self.assertEqual(prime_showing["url"], self.prime_showing.url)
 
-    @patch("showings.views.ShowingService")
-    def test_post_scrape(self, mock_service):
-        """Test scraping movies and showings."""
-        # Mock the service instance and its methods
-        mock_instance = mock_service.return_value
-        mock_instance.refresh_and_save.return_value = (
-            [self.movie],
-            [self.grand_showing, self.taj_showing, self.prime_showing],
+    @patch("showings.jobs.ShowingService")
+    def test_post_queues_refresh(self, mock_service):
+        """Test that POST queues a refresh job instead of scraping."""
+        response = self.client.post("/showings/active/")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], "success")
+        job = RefreshJob.objects.get()
+        self.assertEqual(response.data["job"]["id"], job.id)
+        self.assertEqual(response.data["job"]["status"], "queued")
+        self.assertEqual(response.data["job_url"], f"/showings/refresh/{job.id}/")
+        mock_service.assert_not_called()
+
+    def test_post_attaches_to_refresh_in_flight(self):
+        """Test that overlapping POSTs share one refresh job."""
+        first = self.client.post("/showings/active/")
+        second = self.client.post("/showings/active/")
+
+        self.assertEqual(second.status_code, 202)
+        self.assertEqual(second.data["job"]["id"], first.data["job"]["id"])
+        self.assertEqual(RefreshJob.objects.count(), 1)
+
+    def test_get_refresh_job(self):
+        """Test getting the status of a refresh job."""
+        job = RefreshJob.objects.create(
+            status=RefreshJob.Status.RUNNING,
+            stage="showings",
+            counts={"grand": {"titles": 3, "showings": 12}},
+            errors={"taj": "Taj is down"},
         )
 
-        response = self.client.post("/showings/active/")
+        response = self.client.get(f"/showings/refresh/{job.id}/")
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data["status"], "success")
-        self.assertIn("Successfully scraped", response.data["message"])
-        mock_instance.refresh_and_save.assert_called_once()
+        self.assertEqual(response.data["job"]["status"], "running")
+        self.assertEqual(response.data["job"]["stage"], "showings")
+        self.assertEqual(response.data["job"]["counts"]["grand"]["showings"], 12)
+        self.assertEqual(response.data["job"]["errors"], {"taj": "Taj is down"})
+
+    def test_get_refresh_job_not_found(self):
+        response = self.client.get("/showings/refresh/999/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["status"], "error")
 
     def test_invalid_method(self):
         """Test that invalid HTTP methods are rejected."""
         response = self.client.put("/showings/active/")
         self.assertEqual(response.status_code, 405)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class TestActiveShowingsCache(APITestCase):
+    def setUp(self):
+        caches[API_CACHE_ALIAS].clear()
+        self.location = Location.objects.create(
+            name="Taj Mall", city="Amman", address="Taj Mall, Amman"
+        )
+        self.movie = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="1"
+        )
+        self.date = timezone.now().date() + timedelta(days=1)
+        self.showing("14:00")
+
+    def showing(self, time):
+        showing = Showing.objects.create(
+            movie=self.movie,
+            location=self.location,
+            date=self.date,
+            time=time,
+            is_showing=True,
+        )
+        ShowingService().rebuild_active_showings()
+        return showing
+
+    def test_miss_runs_a_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/showings/active/")
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["showings"][0]["movie__title"], "Dune")
+
+    def test_hit_does_not_touch_the_database(self):
+        first = self.client.get("/showings/active/")
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/showings/active/")
+
+        self.assertEqual(second.data, first.data)
+
+    def test_invalidated_when_showings_change(self):
+        self.client.get("/showings/active/")
+        self.showing("18:00")
+
+        self.assertEqual(self.client.get("/showings/active/").data["count"], 1)
+        bump_showings_version()
+        self.assertEqual(self.client.get("/showings/active/").data["count"], 2)
+
+    def test_saving_showings_invalidates(self):
+        self.client.get("/showings/active/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ShowingService()._save_showings(
+                [
+                    {
+                        "title": "dune",
+                        "date": self.date.isoformat(),
+                        "time": "18:00",
+                        "location": "Taj Mall",
+                    }
+                ],
+                [self.movie],
+            )
+
+        # The 14:00 showing was not in the refresh, so it is no longer showing.
+        response = self.client.get("/showings/active/")
+        self.assertEqual(
+            [str(s["time"]) for s in response.data["showings"]], ["18:00:00"]
+        )
+
+    def test_validators(self):
+        response = self.client.get("/showings/active/")
+
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_if_none_match_current_version(self):
+        etag = self.client.get("/showings/active/")["ETag"]
+
+        with patch.object(ShowingView, "_active_showings_payload") as mock_payload:
+            with self.assertNumQueries(0):
+                response = self.client.get("/showings/active/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        mock_payload.assert_not_called()
+
+    def test_if_none_match_previous_version(self):
+        etag = self.client.get("/showings/active/")["ETag"]
+        bump_showings_version()
+
+        response = self.client.get("/showings/active/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get("/showings/active/")["Last-Modified"]
+
+        response = self.client.get(
+            "/showings/active/", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+
+        with patch(
+            "showings.response_cache.time.time_ns",
+            return_value=time_module.time_ns() + 5 * 10**9,
+        ):
+            bump_showings_version()
+        response = self.client.get(
+            "/showings/active/", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class TestShowingListView(APITestCase):
+    def setUp(self):
+        self.taj = Location.objects.create(
+            name="Taj Mall", city="Amman", address="Taj Mall, Amman"
+        )
+        self.grand = Location.objects.create(
+            name="Grand Cinema City Mall", city="Amman", address="City Mall, Amman"
+        )
+        self.dune = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="1"
+        )
+        self.wonka = Movie.objects.create(
+            title="Wonka", normalized_title="wonka", taj_id="2"
+        )
+        self.today = timezone.now().date()
+        for days in range(3):
+            for movie in (self.dune, self.wonka):
+                for location in (self.taj, self.grand):
+                    for showing_time in ("13:00", "21:00"):
+                        Showing.objects.create(
+                            movie=movie,
+                            location=location,
+                            date=self.today + timedelta(days=days),
+                            time=showing_time,
+                            is_showing=True,
+                        )
+        Showing.objects.create(
+            movie=self.dune,
+            location=self.taj,
+            date=self.today - timedelta(days=1),
+            time="13:00",
+            is_showing=True,
+        )
+        ShowingService().rebuild_active_showings()
+
+    def test_pages_through_active_showings(self):
+        ids, url = [], "/showings/?limit=5"
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [s["id"] for s in response.data["showings"]]
+            url = response.data["next"]
+
+        self.assertEqual(len(ids), 24)
+        self.assertEqual(
+            ids,
+            list(
+                Showing.objects.filter(date__gte=self.today)
+                .order_by("date", "time", "id")
+                .values_list("id", flat=True)
+            ),
+        )
+
+    def test_next_keeps_filters(self):
+        response = self.client.get(f"/showings/?limit=2&movie={self.dune.id}")
+
+        self.assertIn(f"movie={self.dune.id}", response.data["next"])
+        self.assertIn("cursor=", response.data["next"])
+
+    def test_filters(self):
+        tomorrow = self.today + timedelta(days=1)
+        response = self.client.get(
+            "/showings/",
+            {
+                "date_from": tomorrow.isoformat(),
+                "date_to": tomorrow.isoformat(),
+                "movie": self.wonka.id,
+                "location": self.grand.id,
+                "time_from": "18:00",
+            },
+        )
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertIsNone(response.data["next"])
+        showing = response.data["showings"][0]
+        self.assertEqual(
+            (
+                showing["movie__title"],
+                showing["location__name"],
+                showing["date"],
+                str(showing["time"]),
+            ),
+            ("Wonka", "Grand Cinema City Mall", tomorrow, "21:00:00"),
+        )
+
+    def test_past_dates_are_not_active(self):
+        response = self.client.get(
+            "/showings/", {"date_from": (self.today - timedelta(days=7)).isoformat()}
+        )
+        self.assertTrue(all(s["date"] >= self.today for s in response.data["showings"]))
+
+    def test_invalid_query(self):
+        for query in (
+            {"cursor": "nope"},
+            {"limit": 0},
+            {"limit": 100000},
+            {"date_from": "2024-03-21", "date_to": "2024-03-20"},
+            {"time_from": "lunch"},
+        ):
+            with self.subTest(query=query):
+                response = self.client.get("/showings/", query)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data["status"], "error")
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class TestShowingExportView(APITestCase):
+    def setUp(self):
+        caches[API_CACHE_ALIAS].clear()
+        location = Location.objects.create(
+            name="Taj Mall", city="Amman", address="Taj Mall, Amman"
+        )
+        self.dune = Movie.objects.create(
+            title="Dune", normalized_title="dune", taj_id="1"
+        )
+        self.wonka = Movie.objects.create(
+            title="Wonka", normalized_title="wonka", taj_id="2"
+        )
+        self.today = timezone.now().date()
+        for days in range(3):
+            for movie in (self.wonka, self.dune):
+                Showing.objects.create(
+                    movie=movie,
+                    location=location,
+                    date=self.today + timedelta(days=days),
+                    time="14:00",
+                    is_showing=True,
+                    url="https://tajcinemas.com/dune",
+                )
+        ShowingService().rebuild_active_showings()
+
+    @patch("showings.views.SHOWINGS_STREAM_CHUNK_SIZE", 4)
+    def test_streams_active_showings(self):
+        response = self.client.get("/showings/export/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        chunks = list(response.streaming_content)
+        data = json.loads(b"".join(chunks))
+        self.assertEqual(data["status"], "success")
+        self.assertEqual(data["count"], 6)
+        self.assertEqual(
+            [(s["date"], s["movie__title"]) for s in data["showings"]],
+            [
+                (str(self.today + timedelta(days=days)), title)
+                for days in range(3)
+                for title in ("Wonka", "Dune")
+            ],
+        )
+        # The opening, two chunks of rows and the closing.
+        self.assertEqual(len(chunks), 4)
+
+    def test_same_rows_as_active_showings(self):
+        exported = json.loads(
+            b"".join(self.client.get("/showings/export/").streaming_content)
+        )
+        active = json.loads(self.client.get("/showings/active/").content)
+
+        self.assertCountEqual(exported["showings"], active["showings"])
+
+    def test_filters(self):
+        response = self.client.get(f"/showings/export/?movie={self.dune.id}")
+
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["count"], 3)
+        self.assertEqual({s["movie__title"] for s in data["showings"]}, {"Dune"})
+
+    def test_invalid_query(self):
+        response = self.client.get("/showings/export/?date_from=tomorrow")
+        self.assertEqual(response.status_code, 400)
@@ -1,7 +1,123 @@
-import pandas as pd
-from fuzzywuzzy import fuzz, process
+import math
+from collections import Counter, defaultdict
+
+import numpy as np
+from fuzzywuzzy import fuzz as fuzzywuzzy_fuzz
+from fuzzywuzzy.utils import full_process
+from movie_showings.settings import TITLE_MATCH_CLUSTERING, TITLE_MATCH_PANDAS
+from rapidfuzz import fuzz
+from rapidfuzz.process import cdist
 from showings.util import get_first_non_empty
 
+# Titles whose similarity score (0-100) is above this are fuzzy matches.
+FUZZY_MATCH_THRESHOLD = 70
+
+# Catalogs at least this large are matched through an n-gram blocking index
+# instead of scoring all pairs.
+BLOCKING_MIN_TITLES = 2500
+BLOCKING_NGRAM_SIZE = 3
+# Fraction of the larger n-gram set two titles must share to be compared.
+BLOCKING_MIN_OVERLAP = 0.3
+
+SOURCES = ("grand", "prime", "taj")
+
+
+class NGramIndex:
+    """Inverted index of the character n-grams of a list of titles.
+
+    Used for blocking: only pairs of titles that share enough n-grams are
+    candidates for scoring. Candidates are found with prefix filtering: each
+    title's n-grams are ordered rarest first, and two titles sharing at
+    least ``min_overlap`` of their n-grams must share one of the first few.
+    Only those are indexed and probed, so common n-grams such as "the" never
+    produce candidates on their own.
+
+    Args:
+        titles: Preprocessed titles.
+        n: Length of the n-grams.
+        min_overlap: Fraction of the larger n-gram set of two titles they
+            must share to be candidates.
+    """
+
+    def __init__(
+        self,
+        titles,
+        n=BLOCKING_NGRAM_SIZE,
+        min_overlap=BLOCKING_MIN_OVERLAP,
+    ):
+        self.min_overlap = min_overlap
+        self.ngrams = [self.title_ngrams(title, n) for title in titles]
+        frequency = Counter(ngram for ngrams in self.ngrams for ngram in ngrams)
+        # Rarest first, ties broken by the n-gram itself.
+        self.ngram_ids = {
+            ngram: i
+            for i, ngram in enumerate(
+                sorted(frequency, key=lambda ngram: (frequency[ngram], ngram))
+            )
+        }
+
+    @staticmethod
+    def title_ngrams(title, n):
+        padded = f" {title} "
+        return {padded[i : i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+    def prefix(self, i):
+        """Ids of the rarest n-grams of title ``i``; any candidate shares one."""
+        ngram_ids = sorted(self.ngram_ids[ngram] for ngram in self.ngrams[i])
+        required = max(1, math.ceil(self.min_overlap * len(ngram_ids)))
+        return ngram_ids[: len(ngram_ids) - required + 1]
+
+    def candidate_pairs(self):
+        """Return the candidate ``(i, j)`` pairs, ``i < j``, as an ``m x 2`` array."""
+        count = len(self.ngrams)
+        prefixes = [self.prefix(i) for i in range(count)]
+        ngram_ids = np.fromiter(
+            (ngram_id for prefix in prefixes for ngram_id in prefix), dtype=np.int64
+        )
+        title_ids = np.repeat(
+            np.arange(count, dtype=np.int64), [len(prefix) for prefix in prefixes]
+        )
+        # Group the titles by n-gram; titles stay in ascending order.
+        order = np.argsort(ngram_ids, kind="stable")
+        ngram_ids, title_ids = ngram_ids[order], title_ids[order]
+        starts = np.flatnonzero(np.r_[True, ngram_ids[1:] != ngram_ids[:-1]])
+        sizes = np.diff(np.r_[starts, len(ngram_ids)])
+
+        pair_keys = []
+        for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+            titles = title_ids[start : start + size]
+            i, j = np.triu_indices(size, 1)
+            pair_keys.append(titles[i] * count + titles[j])
+        if not pair_keys:
+            return np.empty((0, 2), dtype=np.int64)
+        pair_keys = np.unique(np.concatenate(pair_keys))
+        return np.column_stack((pair_keys // count, pair_keys % count))
+
+
+class DisjointSet:
+    """Union-find over ``0..size - 1``, with union by size and path halving."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        """Merge the sets of ``i`` and ``j`` and return the root of the result."""
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return i
+        if self.size[i] < self.size[j]:
+            i, j = j, i
+        self.parent[j] = i
+        self.size[i] += self.size[j]
+        return i
+
 
 class TitleMatchService:
     @staticmethod
@@ -17,7 +133,245 @@ class TitleMatchService:
         return matched_titles
 
     @staticmethod
-    def handle_fuzzy_match_titles(titles):
+    def match_titles_incrementally(
+        grand_titles, prime_titles, taj_titles, known_titles
+    ):
+        """Match source titles against the titles matched by earlier refreshes.
+
+        Source titles whose id is in ``known_titles`` resolve to that title
+        through an id lookup. Only the others are matched: with each other,
+        as in ``match_titles``, then against the known titles. A title with
+        the ``normalized_title`` of a known title joins it, replacing the
+        known ids of its sources (e.g. a movie listed under a new id), as
+        ``match_titles`` would merge them. Otherwise it joins its best fuzzy
+        match that has no id from the same sources. Known titles are never
+        merged with each other and keep their ``normalized_title`` and
+        ``title``.
+
+        Args:
+            grand_titles: Titles from Grand.
+            prime_titles: Titles from Prime.
+            taj_titles: Titles from Taj.
+            known_titles: Previously matched titles (e.g. the saved movies),
+                in the format returned by ``match_titles``.
+
+        Returns:
+            The matched titles, in the format returned by ``match_titles``,
+            with only the source titles and ids given in this call: the
+            known titles, then the new ones.
+        """
+        index = {
+            (source, title[f"{source}_id"]): i
+            for i, title in enumerate(known_titles)
+            for source in SOURCES
+            if title.get(f"{source}_id")
+        }
+        matched = {}
+        new_titles = {source: [] for source in SOURCES}
+        for source, titles in zip(SOURCES, (grand_titles, prime_titles, taj_titles)):
+            for title in titles or []:
+                i = index.get((source, title.get(f"{source}_id")))
+                if i is None:
+                    new_titles[source].append(title)
+                    continue
+                if i not in matched:
+                    matched[i] = TitleMatchService.empty_match(known_titles[i])
+                matched[i][f"title_{source}"] = title["title"]
+                matched[i][f"{source}_id"] = title[f"{source}_id"]
+
+        if not any(new_titles.values()):
+            return list(matched.values())
+
+        unmatched = []
+        new_matched = []
+        known_names = {
+            title["normalized_title"]: i for i, title in enumerate(known_titles)
+        }
+        for new_title in TitleMatchService.match_titles(*new_titles.values()):
+            i = known_names.get(new_title["normalized_title"])
+            if i is None:
+                new_matched.append(new_title)
+                continue
+            current = matched.get(i) or TitleMatchService.empty_match(known_titles[i])
+            sources = [source for source in SOURCES if new_title[f"{source}_id"]]
+            if any(current[f"{source}_id"] for source in sources):
+                # The known title is also listed under its ids by a source.
+                new_matched.append(new_title)
+                continue
+            for source in sources:
+                for key in (f"title_{source}", f"{source}_id"):
+                    current[key] = new_title[key]
+            matched[i] = current
+
+        fuzzy_matches = TitleMatchService.find_fuzzy_matches_in(
+            [title["normalized_title"] for title in new_matched],
+            [title["normalized_title"] for title in known_titles],
+        )
+        for new_title, good_matches in zip(new_matched, fuzzy_matches):
+            for i in good_matches:
+                current = matched.get(i) or TitleMatchService.empty_match(
+                    known_titles[i]
+                )
+                linked = {
+                    f"{source}_id": get_first_non_empty(
+                        current[f"{source}_id"], known_titles[i].get(f"{source}_id")
+                    )
+                    for source in SOURCES
+                }
+                if TitleMatchService.should_merge_fuzzy_match_titles(linked, new_title):
+                    for source in SOURCES:
+                        for key in (f"title_{source}", f"{source}_id"):
+                            current[key] = get_first_non_empty(
+                                current[key], new_title[key]
+                            )
+                    matched[i] = current
+                    break
+            else:
+                unmatched.append(new_title)
+        return [*matched.values(), *unmatched]
+
+    @staticmethod
+    def empty_match(known_title):
+        """A matched title with the names of ``known_title`` and no source titles."""
+        return {
+            "title_grand": "",
+            "grand_id": "",
+            "normalized_title": known_title["normalized_title"],
+            "title_prime": "",
+            "prime_id": "",
+            "title_taj": "",
+            "taj_id": "",
+            "title": known_title["title"],
+        }
+
+    @staticmethod
+    def use_pandas(use_pandas=None):
+        return TITLE_MATCH_PANDAS if use_pandas is None else use_pandas
+
+    @staticmethod
+    def handle_fuzzy_match_titles(titles, use_pandas=None, clustering=None):
+        """Merge the titles that fuzzy match.
+
+        Args:
+            titles: Titles in the format returned by ``format_merged_titles``.
+            use_pandas: Go through a DataFrame, as
+                ``handle_fuzzy_match_titles_pandas``. Defaults to
+                ``TITLE_MATCH_PANDAS``. Both give the same result. Only
+                used by the greedy clustering.
+            clustering: "union_find" (see ``cluster_fuzzy_match_titles``) or
+                "greedy": starting from the most matched titles, merge each
+                with its matches in turn. Defaults to
+                ``TITLE_MATCH_CLUSTERING``.
+        """
+        if (clustering or TITLE_MATCH_CLUSTERING) == "union_find":
+            return TitleMatchService.cluster_fuzzy_match_titles(titles)
+        if TitleMatchService.use_pandas(use_pandas):
+            return TitleMatchService.handle_fuzzy_match_titles_pandas(titles)
+
+        matches = TitleMatchService.find_fuzzy_matches(
+            [title["normalized_title"] for title in titles]
+        )
+        # Most matches first, with ties in the order
+        # DataFrame.sort_values("match_count", ascending=False) leaves them.
+        match_counts = np.array([len(m) for m in matches], dtype=np.int64)
+        order = np.arange(len(titles))[::-1][
+            match_counts[::-1].argsort(kind="quicksort")
+        ][::-1]
+
+        handled_titles = []
+        processed_indices = set()
+        for idx in order.tolist():
+            if idx in processed_indices:
+                continue
+
+            processed_indices.add(idx)
+            current_merged = dict(titles[idx])
+            for match_idx in matches[idx]:
+                if match_idx not in processed_indices:
+                    if TitleMatchService.should_merge_fuzzy_match_titles(
+                        current_merged, titles[match_idx]
+                    ):
+                        current_merged = TitleMatchService.merge_fuzzy_match_titles(
+                            current_merged, titles[match_idx]
+                        )
+                        processed_indices.add(match_idx)
+
+            handled_titles.append(current_merged)
+        return handled_titles
+
+    @staticmethod
+    def cluster_fuzzy_match_titles(titles, blocking=None):
+        """Merge the titles that fuzzy match, by clustering the match graph.
+
+        Matching pairs are joined best first into disjoint sets, skipping
+        pairs that would give a cluster two ids from the same source, so the
+        result does not depend on the order of the titles beyond breaking
+        ties. Each pair is looked at once: the cost is near-linear in the
+        number of matching pairs.
+
+        Args:
+            titles: Titles in the format returned by ``format_merged_titles``.
+            blocking: See ``find_fuzzy_matches``.
+
+        Returns:
+            One merged title per cluster (see ``merge_cluster_titles``), in
+            the order of their first titles.
+        """
+        clusters = DisjointSet(len(titles))
+        # The source ids of each cluster, by root.
+        source_ids = [
+            {source for source in SOURCES if title.get(f"{source}_id")}
+            for title in titles
+        ]
+        for _, i, j in TitleMatchService.fuzzy_match_edges(
+            [title["normalized_title"] for title in titles], blocking
+        ):
+            root_i, root_j = clusters.find(i), clusters.find(j)
+            if root_i == root_j or source_ids[root_i] & source_ids[root_j]:
+                continue
+            source_ids[clusters.union(root_i, root_j)] = (
+                source_ids[root_i] | source_ids[root_j]
+            )
+
+        members = defaultdict(list)
+        for i, title in enumerate(titles):
+            members[clusters.find(i)].append(title)
+        return [
+            TitleMatchService.merge_cluster_titles(cluster)
+            for cluster in members.values()
+        ]
+
+    @staticmethod
+    def merge_cluster_titles(titles):
+        """Merge titles without conflicting source ids into one.
+
+        The result is named after the title with the most source ids,
+        preferring one listed by Prime, then the first one.
+        """
+        named = max(
+            titles,
+            key=lambda title: (
+                sum(1 for source in SOURCES if title.get(f"{source}_id")),
+                bool(title.get("title_prime")),
+            ),
+        )
+
+        def first(key):
+            return get_first_non_empty(*(title.get(key) for title in titles))
+
+        return {
+            "title_grand": first("title_grand"),
+            "grand_id": first("grand_id"),
+            "normalized_title": named["normalized_title"],
+            "title_prime": first("title_prime"),
+            "prime_id": first("prime_id"),
+            "title_taj": first("title_taj"),
+            "taj_id": first("taj_id"),
+            "title": named["title"],
+        }
+
+    @staticmethod
+    def handle_fuzzy_match_titles_pandas(titles):
         handled_titles = []
         processed_indices = set()
         titles_df = TitleMatchService.fuzzy_match_titles(titles)
@@ -60,31 +414,189 @@ class TitleMatchService:
 
     @staticmethod
     def fuzzy_match_titles(titles):
+        import pandas as pd
+
         titles_df = pd.DataFrame(titles)
         titles_df["fuzzy_matches"] = None
 
-        for i, row in titles_df.iterrows():
-            title = row["normalized_title"]
-            # Exclude the current row from the list of potential matches
-            other_rows = titles_df[titles_df.index != i]
-            # Get all matches above threshold (70)
-            matches = process.extract(
-                title,
-                other_rows["normalized_title"].tolist(),
-                scorer=fuzz.ratio,
-                limit=None,
+        matches = TitleMatchService.find_fuzzy_matches(
+            titles_df["normalized_title"].tolist()
+        )
+        for i, good_matches in enumerate(matches):
+            if good_matches:
+                titles_df.at[titles_df.index[i], "fuzzy_matches"] = [
+                    titles_df.index[j] for j in good_matches
+                ]
+
+        return titles_df
+
+    @staticmethod
+    def similarity_matrix(titles, score_cutoff=0):
+        """Score every pair of titles in one vectorized call.
+
+        Uses rapidfuzz's ratio (normalized Indel similarity), rounded to whole
+        numbers, with a zeroed diagonal. Scores below ``score_cutoff`` are 0.
+
+        Returns:
+            An ``n x n`` ``uint8`` array of scores.
+        """
+        scores = cdist(
+            titles,
+            titles,
+            scorer=fuzz.ratio,
+            dtype=np.uint8,
+            workers=-1,
+            score_cutoff=score_cutoff,
+        )
+        np.fill_diagonal(scores, 0)
+        return scores
+
+    @staticmethod
+    def find_fuzzy_matches(titles, blocking=None):
+        """Find the fuzzy matches of every title.
+
+        Candidate pairs are first found in bulk, with their Indel similarity
+        (see ``similarity_matrix``). It is never lower than fuzzywuzzy's
+        difflib-based ratio, so only the candidates need to be scored with
+        ``fuzzywuzzy.fuzz.ratio``, and the matches are exactly those
+        ``fuzzywuzzy.process.extract`` finds among the scored pairs.
+
+        Args:
+            titles: The titles to match.
+            blocking: Only score pairs of titles that share enough n-grams
+                (see ``NGramIndex``) instead of all pairs. This can miss a
+                few matches. Defaults to True for catalogs of at least
+                ``BLOCKING_MIN_TITLES`` titles.
+
+        Returns:
+            For each title, the indices of the other titles scoring above
+            ``FUZZY_MATCH_THRESHOLD``, best match first (ties in index order).
+        """
+        processed = [full_process(title) for title in titles]
+        candidates = TitleMatchService.fuzzy_match_candidates(processed, blocking)
+        return TitleMatchService.confirm_fuzzy_matches(processed, processed, candidates)
+
+    @staticmethod
+    def fuzzy_match_candidates(titles, blocking=None):
+        """Candidate matches of every preprocessed title, by Indel similarity.
+
+        See ``find_fuzzy_matches`` for ``blocking``.
+
+        Returns:
+            For each title, the sorted indices of its candidates.
+        """
+        if blocking is None:
+            blocking = len(titles) >= BLOCKING_MIN_TITLES
+        if blocking:
+            return TitleMatchService.blocked_candidates(titles)
+        # Inclusive, so no pair is lost to rounding.
+        candidates = (
+            TitleMatchService.similarity_matrix(
+                titles, score_cutoff=FUZZY_MATCH_THRESHOLD
             )
-            # Filter matches above threshold and get indices of matching rows
-            good_matches = [
-                other_rows.index[other_rows["normalized_title"] == match[0]].item()
-                for match in matches
-                if match[1] > 70
+            >= FUZZY_MATCH_THRESHOLD
+        )
+        return [np.flatnonzero(row) for row in candidates]
+
+    @staticmethod
+    def fuzzy_match_edges(titles, blocking=None):
+        """Find the pairs of titles that fuzzy match.
+
+        Pairs are found and scored as in ``find_fuzzy_matches``.
+
+        Returns:
+            A ``(score, i, j)`` tuple, ``i < j``, for every pair of titles
+            scoring above ``FUZZY_MATCH_THRESHOLD``, best first (ties in
+            index order).
+        """
+        processed = [full_process(title) for title in titles]
+        candidates = TitleMatchService.fuzzy_match_candidates(processed, blocking)
+        edges = defaultdict(list)
+        for i, row in enumerate(candidates):
+            for j in row:
+                if i < j:
+                    score = fuzzywuzzy_fuzz.ratio(processed[i], processed[j])
+                    if score > FUZZY_MATCH_THRESHOLD:
+                        edges[score].append((i, int(j)))
+        # Scores are whole numbers, so the edges are sorted by bucket.
+        return [
+            (score, i, j)
+            for score in sorted(edges, reverse=True)
+            for i, j in edges[score]
+        ]
+
+    @staticmethod
+    def find_fuzzy_matches_in(titles, choices):
+        """Find the fuzzy matches of every title among ``choices``.
+
+        Like ``find_fuzzy_matches``, but between two lists: the cost is
+        ``len(titles) x len(choices)``, with all pairs scored.
+
+        Returns:
+            For each title, the indices of the choices scoring above
+            ``FUZZY_MATCH_THRESHOLD``, best match first (ties in index order).
+        """
+        processed = [full_process(title) for title in titles]
+        processed_choices = [full_process(choice) for choice in choices]
+        if not processed or not processed_choices:
+            return [[] for _ in processed]
+        scores = cdist(
+            processed,
+            processed_choices,
+            scorer=fuzz.ratio,
+            dtype=np.uint8,
+            workers=-1,
+            score_cutoff=FUZZY_MATCH_THRESHOLD,
+        )
+        candidates = [np.flatnonzero(row >= FUZZY_MATCH_THRESHOLD) for row in scores]
+        return TitleMatchService.confirm_fuzzy_matches(
+            processed, processed_choices, candidates
+        )
+
+    @staticmethod
+    def confirm_fuzzy_matches(titles, choices, candidates):
+        """Score the candidate matches of every title with fuzzywuzzy.
+
+        Returns:
+            For each title, the indices of its candidate choices scoring
+            above ``FUZZY_MATCH_THRESHOLD``, best match first (ties in index
+            order).
+        """
+        matches = []
+        for i, row in enumerate(candidates):
+            scored = [
+                (fuzzywuzzy_fuzz.ratio(titles[i], choices[j]), int(j)) for j in row
             ]
+            good_matches = sorted(
+                (match for match in scored if match[0] > FUZZY_MATCH_THRESHOLD),
+                key=lambda match: -match[0],
+            )
+            matches.append([j for _, j in good_matches])
+        return matches
 
-            if good_matches:
-                titles_df.at[i, "fuzzy_matches"] = good_matches
+    @staticmethod
+    def blocked_candidates(titles):
+        """Candidate matches of every title, among the pairs of an ``NGramIndex``.
 
-        return titles_df
+        Returns:
+            For each title, the sorted indices of its candidates.
+        """
+        candidates = [[] for _ in titles]
+        pairs = NGramIndex(titles).candidate_pairs()
+        if not len(pairs):
+            return candidates
+        starts = np.flatnonzero(np.r_[True, pairs[1:, 0] != pairs[:-1, 0]])
+        for i, others in zip(pairs[starts, 0], np.split(pairs[:, 1], starts[1:])):
+            scores = cdist(
+                [titles[i]],
+                [titles[j] for j in others],
+                scorer=fuzz.ratio,
+                score_cutoff=FUZZY_MATCH_THRESHOLD,
+            )[0]
+            for j in others[scores >= FUZZY_MATCH_THRESHOLD]:
+                candidates[i].append(int(j))
+                candidates[j].append(int(i))
+        return [sorted(row) for row in candidates]
 
     @staticmethod
     def merge_fuzzy_match_titles(title_a, title_b):
@@ -129,6 +641,8 @@ class TitleMatchService:
 
     @staticmethod
     def handle_raw_titles(titles):
+        import pandas as pd
+
         titles_df = pd.DataFrame(titles)
         if not (titles_df.empty):
             if not (TitleMatchService.is_merged_df(titles_df)):
@@ -137,10 +651,77 @@ class TitleMatchService:
                 )
         return titles_df
 
+    @staticmethod
+    def raw_title_rows(titles):
+        """Dict counterpart of ``handle_raw_titles``.
+
+        Returns:
+            The columns (keys) of the titles, in order, and the titles, with
+            a ``normalized_title`` unless they are already merged.
+        """
+        columns = list(dict.fromkeys(key for title in titles for key in title))
+        if TitleMatchService.has_merged_columns(columns):
+            return columns, [dict(title) for title in titles]
+        rows = [
+            {
+                **title,
+                "normalized_title": TitleMatchService.normalize_title(
+                    title.get("title")
+                ),
+            }
+            for title in titles
+        ]
+        return list(dict.fromkeys([*columns, "normalized_title"])), rows
+
+    @staticmethod
+    def outer_join_titles(left, right, suffix):
+        """Dict counterpart of the ``pd.merge`` of the pandas perfect matching.
+
+        An outer join of two ``(columns, rows)`` tables on
+        ``normalized_title``, in the same order: by ``normalized_title``,
+        then left rows, then right rows. Right columns that are also on the
+        left get ``_{suffix}`` appended. Missing values are None.
+        """
+        left_columns, left_rows = left
+        right_columns, right_rows = right
+        renamed = {
+            column: f"{column}_{suffix}" if column in left_columns else column
+            for column in right_columns
+            if column != "normalized_title"
+        }
+        left_groups, right_groups = {}, {}
+        for row in left_rows:
+            left_groups.setdefault(row["normalized_title"], []).append(row)
+        for row in right_rows:
+            right_groups.setdefault(row["normalized_title"], []).append(row)
+
+        rows = []
+        for normalized_title in sorted(left_groups.keys() | right_groups.keys()):
+            for left_row in left_groups.get(normalized_title, [{}]):
+                for right_row in right_groups.get(normalized_title, [{}]):
+                    row = dict.fromkeys(left_columns)
+                    row.update(left_row)
+                    row.update(
+                        (renamed[column], right_row.get(column)) for column in renamed
+                    )
+                    row["normalized_title"] = normalized_title
+                    rows.append(row)
+        return [*left_columns, *renamed.values()], rows
+
     @staticmethod
     def format_merged_titles(titles_df):
+        """Format merged titles, given as a DataFrame or as a list of rows.
+
+        Every row must have every column of the merge, with "" for missing
+        values, as in a filled DataFrame.
+        """
         titles = []
-        for _, row in titles_df.iterrows():
+        rows = (
+            (row for _, row in titles_df.iterrows())
+            if hasattr(titles_df, "iterrows")
+            else titles_df
+        )
+        for row in rows:
             titles.append(
                 {
                     "title_grand": row.get(
@@ -165,22 +746,66 @@ class TitleMatchService:
     def get_suffix(titles_df):
         if titles_df.empty:
             raise ValueError("Empty dataframe")
-        if not TitleMatchService.is_merged_df(titles_df):
+        return TitleMatchService.columns_suffix(titles_df.columns)
+
+    @staticmethod
+    def columns_suffix(columns):
+        if not TitleMatchService.has_merged_columns(columns):
             return (
                 "taj"
-                if "taj_id" in titles_df.columns
-                else ("grand" if "grand_id" in titles_df.columns else "prime")
+                if "taj_id" in columns
+                else ("grand" if "grand_id" in columns else "prime")
             )
         return "merged"
 
     @staticmethod
     def is_merged_df(titles_df):
+        return TitleMatchService.has_merged_columns(titles_df.columns)
+
+    @staticmethod
+    def has_merged_columns(columns):
         source_columns = ["grand_id", "prime_id", "taj_id"]
-        source_count = sum(1 for col in source_columns if col in titles_df.columns)
+        source_count = sum(1 for col in source_columns if col in columns)
         return source_count > 1
 
     @staticmethod
-    def handle_perfect_match_titles(*args):
+    def handle_perfect_match_titles(*args, use_pandas=None):
+        """Merge the titles of several sources that have the same normalized title.
+
+        Args:
+            *args: Lists of titles, one per source; empty ones are skipped.
+            use_pandas: Merge DataFrames, as
+                ``handle_perfect_match_titles_pandas``. Defaults to
+                ``TITLE_MATCH_PANDAS``. Both give the same result.
+        """
+        if TitleMatchService.use_pandas(use_pandas):
+            return TitleMatchService.handle_perfect_match_titles_pandas(*args)
+
+        tables = [TitleMatchService.raw_title_rows(titles) for titles in args if titles]
+
+        if not tables:
+            raise ValueError("No titles to match")
+
+        merged = tables[0]
+        for table in tables[1:]:
+            suffix = TitleMatchService.columns_suffix(table[0])
+            merged = TitleMatchService.outer_join_titles(merged, table, suffix)
+
+        columns, rows = merged
+        return TitleMatchService.format_merged_titles(
+            [
+                {
+                    column: "" if row.get(column) is None else row[column]
+                    for column in columns
+                }
+                for row in rows
+            ]
+        )
+
+    @staticmethod
+    def handle_perfect_match_titles_pandas(*args):
+        import pandas as pd
+
         raw_dfs = [
             TitleMatchService.handle_raw_titles(titles) for titles in args if titles
         ]
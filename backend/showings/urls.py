@@ -1,7 +1,10 @@
 from django.urls import path
 
-from .views import ShowingView
+from .views import RefreshJobView, ShowingExportView, ShowingListView, ShowingView
 
 urlpatterns = [
+    path("", ShowingListView.as_view(), name="showings"),
     path("active/", ShowingView.as_view(), name="active"),
+    path("export/", ShowingExportView.as_view(), name="export"),
+    path("refresh/<int:job_id>/", RefreshJobView.as_view(), name="refresh-job"),
 ]
@@ -1,13 +1,62 @@
 import logging
 
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date
 from django.views.decorators.http import require_http_methods
+from movie_showings.settings import SHOWINGS_STREAM_CHUNK_SIZE
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
+from showings.jobs import enqueue_refresh
+from showings.models import RefreshJob
+from showings.pagination import encode_cursor, keyset_page
+from showings.response_cache import (
+    active_showings_validators,
+    cached_active_showings,
+    showings_version,
+)
+from showings.serializers import (
+    RefreshJobSerializer,
+    ShowingFilterQuerySerializer,
+    ShowingListQuerySerializer,
+)
 from showings.services import ShowingService
+from showings.streaming import IncrementalJSONEncoder
 
 logger = logging.getLogger(__name__)
 
+# The fields of an active showing in API responses; the movie title and
+# location name are named as the showing's relations would name them.
+SHOWING_FIELDS = ("date", "time", "url")
+SHOWING_ALIASES = {"movie__title": F("title"), "location__name": F("location_name")}
+
+
+def invalid_query_response(query) -> Response:
+    return Response(
+        {
+            "status": "error",
+            "message": "Invalid query parameters",
+            "errors": query.errors,
+        },
+        status=400,
+    )
+
+
+def filter_showings(service: ShowingService, params: dict):
+    """Get the active showings matching validated filter query parameters."""
+    return service.filter_active_showings(
+        start=params.get("date_from"),
+        end=params.get("date_to"),
+        movie_id=params.get("movie"),
+        location_id=params.get("location"),
+        time_from=params.get("time_from"),
+        time_to=params.get("time_to"),
+    )
+
 
 @method_decorator(require_http_methods(["GET", "POST"]), name="dispatch")
 class ShowingView(APIView):
@@ -23,32 +72,153 @@ class ShowingView(APIView):
         return Response({"status": "error", "message": message}, status=500)
 
     def get(self, request):
-        """Get all active showings."""
+        """Get all active showings.
+
+        The payload is cached until showings are next saved. Responses carry
+        an ETag and Last-Modified of that version, and conditional requests
+        for the current version get a 304 without building the payload.
+        """
         try:
-            showings = self.service.get_active_showings()
-            return Response(
-                {
-                    "status": "success",
-                    "count": len(showings),
-                    "showings": list(
-                        showings.values(
-                            "movie__title", "location__name", "date", "time", "url"
-                        )
-                    ),
-                }
+            version = showings_version()
+            etag, last_modified = active_showings_validators(version)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
             )
+            if response is None:
+                response = Response(
+                    cached_active_showings(self._active_showings_payload, version)
+                )
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified)
+            # Clients revalidate on every request rather than guess freshness.
+            patch_cache_control(response, no_cache=True)
+            return response
         except Exception as e:
             return self._handle_error(e, "Failed to fetch active showings")
 
+    def _active_showings_payload(self) -> dict:
+        showings = list(
+            self.service.filter_active_showings().values(
+                *SHOWING_FIELDS, **SHOWING_ALIASES
+            )
+        )
+        return {"status": "success", "count": len(showings), "showings": showings}
+
     def post(self, request):
-        """Scrape and save new movies and showings."""
+        """Queue a refresh of movies and showings.
+
+        The refresh is run by the refresh worker; its progress is reported
+        by the refresh job endpoint.
+        """
         try:
-            movies, showings = self.service.refresh_and_save()
+            job = enqueue_refresh()
             return Response(
                 {
                     "status": "success",
-                    "message": f"Successfully scraped {len(movies)} movies and {len(showings)} showings",
-                }
+                    "message": "Refresh queued",
+                    "job": RefreshJobSerializer(job).data,
+                    "job_url": reverse("refresh-job", args=[job.id]),
+                },
+                status=202,
+            )
+        except Exception as e:
+            return self._handle_error(e, "Failed to queue refresh")
+
+
+class ShowingListView(APIView):
+    """View for paginated, filtered listings of active showings."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.service = ShowingService()
+
+    def get(self, request):
+        """Get a page of active showings, sorted by date, time and id.
+
+        Showings can be filtered by date range (``date_from``, ``date_to``),
+        ``movie`` and ``location`` id, and time of day (``time_from``,
+        ``time_to``). Pages hold up to ``limit`` showings; ``next`` links to
+        the next page, or is null on the last one.
+        """
+        query = ShowingListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return invalid_query_response(query)
+        params = query.validated_data
+
+        try:
+            showings = filter_showings(self.service, params).values(
+                "id", *SHOWING_FIELDS, **SHOWING_ALIASES
+            )
+            rows, next_position = keyset_page(
+                showings, params.get("cursor"), params["limit"]
             )
         except Exception as e:
-            return self._handle_error(e, "Failed to scrape data")
+            logger.error(f"Failed to fetch showings: {str(e)}")
+            return Response(
+                {"status": "error", "message": "Failed to fetch showings"}, status=500
+            )
+
+        next_url = None
+        if next_position:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_cursor(next_position)
+            )
+        return Response(
+            {
+                "status": "success",
+                "count": len(rows),
+                "showings": rows,
+                "next": next_url,
+            }
+        )
+
+
+class ShowingExportView(APIView):
+    """View for exports of all active showings, streamed as they are read."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.service = ShowingService()
+
+    def get(self, request):
+        """Stream all active showings, sorted by date, time and id.
+
+        Takes the filters of the showings listing. Rows are read from the
+        database and sent ``SHOWINGS_STREAM_CHUNK_SIZE`` at a time, so memory
+        use and time to first byte do not grow with the number of showings.
+        The "count" comes after the showings. An error while streaming can
+        no longer change the status, and truncates the document instead.
+        """
+        query = ShowingFilterQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return invalid_query_response(query)
+
+        showings = (
+            filter_showings(self.service, query.validated_data)
+            .order_by("date", "time", "id")
+            .values(*SHOWING_FIELDS, **SHOWING_ALIASES)
+            .iterator(chunk_size=SHOWINGS_STREAM_CHUNK_SIZE)
+        )
+        return StreamingHttpResponse(
+            IncrementalJSONEncoder().iter_object(
+                {"status": "success"},
+                "showings",
+                showings,
+                chunk_size=SHOWINGS_STREAM_CHUNK_SIZE,
+            ),
+            content_type="application/json",
+        )
+
+
+class RefreshJobView(APIView):
+    """View for the status of a refresh job."""
+
+    def get(self, request, job_id):
+        """Get the status, progress, counts and errors of a refresh job."""
+        try:
+            job = RefreshJob.objects.get(id=job_id)
+        except RefreshJob.DoesNotExist:
+            return Response(
+                {"status": "error", "message": "Refresh job not found"}, status=404
+            )
+        return Response({"status": "success", "job": RefreshJobSerializer(job).data})